@@ -0,0 +1,17 @@
+import pytest
+
+from corpora import CORPORA, corpus_id
+from src.entities.completion_messages.completion_messages import Messages
+from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+
+
+@pytest.fixture(scope='module')
+def prompts():
+    return PromptRegistry({'example_prompt': 'ex1_genetics_of_cancer', 'additional_prompt': 'ad1_top_instr'}).get_prompts('PRACTICE', 'de')
+
+
+@pytest.mark.parametrize('corpus_path', CORPORA, ids=corpus_id)
+def bench_compute_total_tokens(benchmark, corpus_path, prompts, encoding, model_profile):
+    # Without precomputed token counts, all messages are encoded on every call
+    messages = Messages(prompts.system, prompts.example_user, prompts.example_assistant, corpus_path.read_text(encoding='utf-8'))
+    benchmark(messages.compute_total_tokens, encoding, model_profile)
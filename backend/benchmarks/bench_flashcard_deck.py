@@ -0,0 +1,60 @@
+import pickle
+import tracemalloc
+
+import pytest
+
+from corpora import DECK_SIZES, make_flashcards
+from src.entities.flashcard_deck.flashcard_deck import ColumnarFlashcardDeck, FlashcardDeck
+
+REPRESENTATIONS = {
+    'list': FlashcardDeck,
+    'columnar': ColumnarFlashcardDeck.from_flashcards,
+}
+
+
+@pytest.fixture(scope='module', params=DECK_SIZES)
+def size(request):
+    return request.param
+
+
+@pytest.fixture(scope='module', params=list(REPRESENTATIONS))
+def representation(request):
+    return request.param
+
+
+def create_deck(representation: str, size: int) -> FlashcardDeck:
+    # Unpickled like a task result, so the deck does not share its strings with other decks
+    return REPRESENTATIONS[representation](pickle.loads(pickle.dumps(make_flashcards(size))))
+
+
+def measure_memory(representation: str, size: int) -> int:
+    flashcards = pickle.loads(pickle.dumps(make_flashcards(size)))
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        deck = pickle.loads(pickle.dumps(REPRESENTATIONS[representation](flashcards)))
+        memory = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    assert len(deck) == size
+    return memory
+
+
+def bench_pickle_deck(benchmark, representation, size):
+    benchmark.group = f'pickle_deck[{size}]'
+    deck = create_deck(representation, size)
+    benchmark.extra_info['pickled_bytes'] = len(pickle.dumps(deck))
+    benchmark.extra_info['memory_bytes'] = measure_memory(representation, size)
+    benchmark(pickle.dumps, deck)
+
+
+def bench_unpickle_deck(benchmark, representation, size):
+    benchmark.group = f'unpickle_deck[{size}]'
+    data = pickle.dumps(create_deck(representation, size))
+    benchmark(pickle.loads, data)
+
+
+def bench_to_dict_list(benchmark, representation, size):
+    benchmark.group = f'to_dict_list[{size}]'
+    deck = create_deck(representation, size)
+    benchmark(deck.to_dict_list)
@@ -0,0 +1,14 @@
+import pytest
+
+from corpora import DECK_SIZES, make_flashcards
+from src.services.flashcard_service.flashcard_generator_service.flashcard_deduplication import deduplicate_flashcards
+
+# Number of flashcards per batch, as generated from one fragment
+BATCH_SIZE = 20
+
+
+@pytest.mark.parametrize('size', DECK_SIZES)
+def bench_deduplicate_flashcards(benchmark, size):
+    flashcards = make_flashcards(size)
+    batch_flashcards = [flashcards[start:start + BATCH_SIZE] for start in range(0, size, BATCH_SIZE)]
+    benchmark.pedantic(deduplicate_flashcards, args=(batch_flashcards, 0.8), rounds=3 if size >= 10_000 else 10)
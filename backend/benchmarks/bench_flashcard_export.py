@@ -0,0 +1,88 @@
+import csv
+import random
+import tracemalloc
+import zipfile
+from io import BytesIO, StringIO
+
+import genanki
+import pytest
+
+from corpora import DECK_SIZES, make_deck
+from src.services.flashcard_service.flashcard_export import export_as_apkg, iter_csv, iter_csv_zip, iter_ndjson
+
+
+@pytest.fixture(scope='module', params=DECK_SIZES)
+def deck(request):
+    return make_deck(request.param)
+
+
+def legacy_export_as_csv(flashcard_deck) -> bytes:
+    """
+    The zipped CSV export replaced by the streamed export (the CSV file in a StringIO, zipped into a BytesIO, copied out with
+    getvalue), kept as the baseline of the comparison.
+    """
+    csv_buffer = StringIO()
+    csv_writer = csv.writer(csv_buffer)
+    for flashcard in flashcard_deck:
+        csv_writer.writerow([flashcard.front_side, flashcard.back_side])
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr('flashcards.csv', csv_buffer.getvalue())
+    return zip_buffer.getvalue()
+
+
+def legacy_export_as_apkg(flashcard_deck) -> bytes:
+    """
+    The genanki export replaced by the native APKG writer (a new model with random IDs per export, one genanki.Note per
+    flashcard, the collection written row by row to a temporary file), kept as the baseline of the comparison.
+    """
+    model = genanki.Model(random.randrange(1 << 30, 1 << 31), 'Simple Model', fields=[{'name': 'Front'}, {'name': 'Back'}],
+                          templates=[{'name': 'Card 1', 'qfmt': '{{Front}}', 'afmt': '{{FrontSide}}<hr id="answer">{{Back}}'}])
+    anki_deck = genanki.Deck(random.randrange(1 << 30, 1 << 31), 'flashcards')
+    for flashcard in flashcard_deck:
+        anki_deck.add_note(genanki.Note(model=model, fields=[flashcard.front_side, flashcard.back_side]))
+    apkg_buffer = BytesIO()
+    genanki.Package(anki_deck).write_to_file(apkg_buffer)
+    return apkg_buffer.getvalue()
+
+
+def consume(chunks) -> int:
+    # Like a streamed response, each chunk is released once it is sent
+    return sum(len(chunk) for chunk in chunks)
+
+
+EXPORTS = {
+    'legacy_zip': lambda deck: len(legacy_export_as_csv(deck)),
+    'zip': lambda deck: consume(iter_csv_zip(deck)),
+    'zip_stored': lambda deck: consume(iter_csv_zip(deck, compress=False)),
+    'csv': lambda deck: consume(iter_csv(deck)),
+    'ndjson': lambda deck: consume(iter_ndjson(deck)),
+}
+
+
+def measure_peak_memory(export, deck) -> int:
+    tracemalloc.start()
+    try:
+        export(deck)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_to_json(benchmark, deck):
+    benchmark(deck.to_json)
+
+
+@pytest.mark.parametrize('export', list(EXPORTS))
+def bench_export(benchmark, deck, export):
+    benchmark.group = f'export[{len(deck)}]'
+    benchmark.extra_info['peak_memory_bytes'] = measure_peak_memory(EXPORTS[export], deck)
+    benchmark(EXPORTS[export], deck)
+
+
+@pytest.mark.parametrize('export', [export_as_apkg, legacy_export_as_apkg], ids=['native', 'genanki'])
+def bench_export_as_apkg(benchmark, deck, export):
+    benchmark.group = f'export_as_apkg[{len(deck)}]'
+    benchmark.extra_info['apkg_bytes'] = len(export(deck))
+    # Exporting large decks with genanki takes seconds, a few rounds suffice to detect regressions
+    benchmark.pedantic(export, args=(deck,), rounds=3 if len(deck) >= 10_000 else 10, warmup_rounds=1)
@@ -0,0 +1,100 @@
+import re
+from typing import List
+
+import pytest
+import structlog
+
+from corpora import DECK_SIZES, make_completion_content, make_structured_completion_content
+from src.custom_exceptions.internal_exceptions import FlashcardInvalidFormatError, FlashcardPrefixError
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import parse_flashcards
+from src.services.flashcard_service.flashcard_generator_service.structured_output import StructuredFlashcardStreamParser, \
+    parse_structured_flashcards
+
+logger = structlog.getLogger(__name__)
+
+
+def legacy_parse_flashcard(id: int, line: str) -> Flashcard:
+    split_line = line.split(';')
+    if len(split_line) < 2:
+        raise FlashcardInvalidFormatError("Invalid format")
+    prefix_match = re.match(r'\[(.*?)\]', split_line[0])
+    if not prefix_match:
+        raise FlashcardPrefixError("Missing prefix", Flashcard(id, FlashcardType.UNKNOWN, '', ''))
+    prefix = prefix_match.group(1).lower()
+    flashcard_type = FlashcardType.DEFINITION if "term" in prefix else FlashcardType.OPEN_ENDED
+    return Flashcard(id, flashcard_type, split_line[0][len(prefix) + 2:].strip(), split_line[1])
+
+
+def legacy_parse_flashcards(content: str) -> List[Flashcard]:
+    """
+    The line-by-line parser replaced by the single-pass parser (pattern looked up per line, split on every separator, exceptions
+    for malformed lines), kept as the baseline of the comparison.
+    """
+    flashcards = []
+    for id, line in enumerate((line for line in content.split('\n') if line.strip()), 1):
+        try:
+            flashcards.append(legacy_parse_flashcard(id, line))
+        except FlashcardPrefixError as e:
+            logger.warning("Flashcard prefix error", error=str(e), batch=None, flashcard_number=id)
+            flashcards.append(e.flashcard)
+        except FlashcardInvalidFormatError as e:
+            logger.error("Flashcard invalid format error", error=str(e), batch=None, flashcard_number=id)
+    return flashcards
+
+
+@pytest.mark.parametrize('size', DECK_SIZES)
+def bench_parse_flashcards(benchmark, size):
+    benchmark.group = f'parse_flashcards[{size}]'
+    content = make_completion_content(size)
+    flashcards = benchmark(parse_flashcards, content)
+    assert len(flashcards) == size
+
+
+@pytest.mark.parametrize('size', DECK_SIZES)
+def bench_legacy_parse_flashcards(benchmark, size):
+    benchmark.group = f'parse_flashcards[{size}]'
+    content = make_completion_content(size)
+    flashcards = benchmark(legacy_parse_flashcards, content)
+    assert len(flashcards) == size
+
+
+def make_malformed_completion_content(size: int) -> str:
+    """
+    Completion content where every fifth flashcard has no prefix and every seventh no separator.
+    """
+    lines = make_completion_content(size).split('\n')
+    for i in range(0, size, 5):
+        lines[i] = lines[i][lines[i].index(']') + 2:]
+    for i in range(0, size, 7):
+        lines[i] = lines[i].replace(';', ' -')
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('parse', [parse_flashcards, legacy_parse_flashcards], ids=['single_pass', 'legacy'])
+def bench_parse_malformed_flashcards(benchmark, parse):
+    benchmark.group = 'parse_malformed_flashcards'
+    content = make_malformed_completion_content(10_000)
+    benchmark(parse, content)
+
+
+@pytest.mark.parametrize('size', DECK_SIZES)
+def bench_parse_structured_flashcards(benchmark, size):
+    benchmark.group = f'parse_flashcards[{size}]'
+    content = make_structured_completion_content(size)
+    flashcards = benchmark(parse_structured_flashcards, content)
+    assert len(flashcards) == size
+
+
+@pytest.mark.parametrize('size', DECK_SIZES)
+def bench_stream_structured_flashcards(benchmark, size):
+    benchmark.group = f'parse_flashcards[{size}]'
+    content = make_structured_completion_content(size)
+
+    def stream():
+        # Chunks of roughly the size of the chunks of a streamed completion
+        parser = StructuredFlashcardStreamParser(log=False)
+        return [flashcard for i in range(0, len(content), 16) for flashcard in parser.feed(content[i:i + 16])] + parser.close()
+
+    flashcards = benchmark(stream)
+    assert len(flashcards) == size
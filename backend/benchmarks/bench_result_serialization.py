@@ -0,0 +1,47 @@
+import pickle
+
+import pytest
+
+from corpora import DECK_SIZES, make_flashcards
+from src.celery.serialization import MessageSerializer
+from src.entities.flashcard_deck.flashcard_deck import ColumnarFlashcardDeck
+
+# The pickled columnar deck was the result encoding before the msgpack serializer
+SERIALIZERS = {
+    'pickle': (pickle.dumps, pickle.loads),
+    'msgpack': (MessageSerializer('none').dumps, MessageSerializer('none').loads),
+    'msgpack_zlib': (MessageSerializer('zlib').dumps, MessageSerializer('zlib').loads),
+    'msgpack_zstd': (MessageSerializer('zstd').dumps, MessageSerializer('zstd').loads),
+}
+
+
+@pytest.fixture(scope='module', params=DECK_SIZES)
+def size(request):
+    return request.param
+
+
+@pytest.fixture(scope='module', params=list(SERIALIZERS))
+def serializer(request):
+    return request.param
+
+
+def create_result(size: int) -> dict:
+    # The task meta stored in the result backend
+    return {'status': 'SUCCESS', 'result': ColumnarFlashcardDeck.from_flashcards(make_flashcards(size)), 'traceback': None,
+            'children': [], 'date_done': '2024-01-01T00:00:00+00:00', 'task_id': 'a8098c1a-f86e-11da-bd1a-00112444be1e'}
+
+
+def bench_encode_result(benchmark, serializer, size):
+    benchmark.group = f'encode_result[{size}]'
+    dumps, _ = SERIALIZERS[serializer]
+    result = create_result(size)
+    benchmark.extra_info['encoded_bytes'] = len(dumps(result))
+    benchmark(dumps, result)
+
+
+def bench_decode_result(benchmark, serializer, size):
+    benchmark.group = f'decode_result[{size}]'
+    dumps, loads = SERIALIZERS[serializer]
+    data = dumps(create_result(size))
+    meta = benchmark(loads, data)
+    assert len(meta['result']) == size
@@ -0,0 +1,27 @@
+import pytest
+
+from corpora import CORPORA, corpus_id
+from src.services.flashcard_service.flashcard_generator_service.text_splitting import TokenizedText, split_text, \
+    split_text_by_structure
+
+# Fragment size of a typical request (see compute_fragment_size), small enough to split every corpus
+FRAGMENT_SIZE = 2000
+
+
+@pytest.fixture(scope='module', params=CORPORA, ids=corpus_id)
+def corpus(request):
+    return request.param.read_text(encoding='utf-8')
+
+
+def bench_tokenize(benchmark, corpus, encoding):
+    benchmark(TokenizedText, corpus, encoding)
+
+
+def bench_split_text(benchmark, corpus, encoding):
+    tokenized_text = TokenizedText(corpus, encoding)
+    benchmark(split_text, tokenized_text, FRAGMENT_SIZE, 'absolute', 100)
+
+
+def bench_split_text_by_structure(benchmark, corpus, encoding):
+    tokenized_text = TokenizedText(corpus, encoding)
+    benchmark(split_text_by_structure, tokenized_text, FRAGMENT_SIZE)
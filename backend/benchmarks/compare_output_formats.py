@@ -0,0 +1,110 @@
+# benchmarks/compare_output_formats.py
+"""
+Comparison of the output formats of the generation (generation.output_format).
+
+Generates the flashcards of the same input texts once per output format, with the line format and with JSON-schema structured
+output, and reports per format the flashcards per 1k completion tokens, the parse-failure rate (lines or items that did not
+yield a flashcard) and the flashcards of unknown type.
+
+Uses the fake OpenAI client by default, which only shows the token overhead of each format. Pass --client openai to compare the
+formats on real completions (requires OPENAI_API_KEY, the requests are billed).
+
+Run from the `backend` directory, e.g.:
+
+    python benchmarks/compare_output_formats.py --client openai --corpus 'text_summary/*.txt' --max-input-chars 8000
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+CORPUS_DIR = Path(__file__).parents[1] / 'local_dev' / 'input'
+
+
+def create_client(args):
+    if args.client == 'openai':
+        from openai import OpenAI
+        return OpenAI()
+
+    from src.services.fake_openai_service.fake_openai_client import FakeOpenAI
+    from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
+    return FakeOpenAI(**dict(QuizardConfig.get_fake_openai_config(), ttft_median_sec=0.0, tokens_per_sec=1e6, rate_limit_error_rate=0.0,
+                             server_error_rate=0.0, seed=0))
+
+
+def compare(args) -> dict:
+    os.environ.setdefault('QUIZARD_CONFIG', 'quizard_config.yaml')
+    from src.dtos.generator_task import FlashcardGeneratorTaskDto
+    from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import FlashcardGenerator
+    from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import MISSING_PREFIX, UNKNOWN_PREFIX, \
+        count_dropped_lines
+    from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+    from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
+    from src.services.flashcard_service.flashcard_generator_service.structured_output import LINES, JSON_SCHEMA
+
+    paths = sorted(CORPUS_DIR.glob(args.corpus))
+    if not paths:
+        raise SystemExit(f"No input texts match {args.corpus} in {CORPUS_DIR}")
+    tasks = [FlashcardGeneratorTaskDto(lang=args.lang, mode=args.mode, export_format='csv',
+                                       input_text=path.read_text(encoding='utf-8')[:args.max_input_chars]) for path in paths]
+    client = create_client(args)
+
+    report = {}
+    for output_format in [LINES, JSON_SCHEMA]:
+        generator = FlashcardGenerator(client=client, rate_limiter=None, completion_cache=None, checkpoint_store=None,
+                                       prompt_registry=PromptRegistry(QuizardConfig.get_prompt_config(), output_format))
+        generator.generation_config = dict(generator.generation_config, output_format=output_format, stream_completions=False)
+        max_tokens = generator.token_limits['completion_limit']
+
+        completions = completion_tokens = flashcards = dropped = unknown_type = truncated = 0
+        for task in tasks:
+            for messages in generator.prepare_fragment_messages(task):
+                completion = generator.make_gpt_completion_request(messages, max_tokens)
+                parser = generator.create_parser()
+                flashcards += len(parser.feed(completion.choices[0].message.content) + parser.close())
+                dropped += count_dropped_lines(parser.diagnostics)
+                unknown_type += sum(diagnostic.code in (MISSING_PREFIX, UNKNOWN_PREFIX) for diagnostic in parser.diagnostics)
+                truncated += completion.choices[0].finish_reason == 'length'
+                completions += 1
+                completion_tokens += completion.usage.completion_tokens
+
+        report[output_format] = {
+            'completions': completions,
+            'truncated_completions': truncated,
+            'completion_tokens': completion_tokens,
+            'flashcards': flashcards,
+            'flashcards_per_1k_tokens': round(1000 * flashcards / completion_tokens, 2) if completion_tokens else None,
+            'parse_failure_rate': round(dropped / (flashcards + dropped), 4) if flashcards + dropped else None,
+            'unknown_type': unknown_type,
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    columns = ['completions', 'truncated_completions', 'completion_tokens', 'flashcards', 'flashcards_per_1k_tokens',
+               'parse_failure_rate', 'unknown_type']
+    print(f"{'':26s}" + ''.join(f'{output_format:>14s}' for output_format in report))
+    for column in columns:
+        print(f'{column:26s}' + ''.join(f'{str(metrics[column]):>14s}' for metrics in report.values()))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1], formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--client', choices=['fake', 'openai'], default='fake', help='Client the completions are requested from')
+    parser.add_argument('--lang', default='de')
+    parser.add_argument('--mode', default='PRACTICE')
+    parser.add_argument('--corpus', default='*/*.txt', help=f'Glob of the input texts in {CORPUS_DIR}')
+    parser.add_argument('--max-input-chars', type=int, default=20_000, help='Length to which the input texts are truncated')
+    parser.add_argument('--output', default=None, help='Path of a JSON file the report is written to')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    comparison_report = compare(arguments)
+    print_report(comparison_report)
+    if arguments.output:
+        Path(arguments.output).write_text(json.dumps(comparison_report, indent=2))
@@ -0,0 +1,24 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+# QuizardConfig loads the config file specified in the environment on import
+os.environ.setdefault('QUIZARD_CONFIG', 'quizard_config.yaml')
+
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import get_model_profile
+
+# Model whose encoding and chat format the benchmarks use
+MODEL_NAME = 'gpt-4o-mini'
+
+
+@pytest.fixture(scope='session')
+def model_profile():
+    return get_model_profile(MODEL_NAME)
+
+
+@pytest.fixture(scope='session')
+def encoding(model_profile):
+    return model_profile.get_encoding()
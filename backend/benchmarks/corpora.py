@@ -0,0 +1,61 @@
+# Input corpora and synthetic flashcard decks of the benchmarks
+import json
+import random
+from pathlib import Path
+from typing import List
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
+
+CORPUS_DIR = Path(__file__).parents[1] / 'local_dev' / 'input'
+CORPORA = sorted(CORPUS_DIR.glob('*/*.txt'))
+DECK_SIZES = [100, 1_000, 10_000, 50_000]
+
+_WORDS = ("Zelle Mitose Meiose Chromosom Replikation Transkription Translation Mutation Onkogen Tumorsuppressor Apoptose Zellzyklus "
+          "Signalweg Rezeptor Enzym Protein DNA RNA Genexpression Methylierung Selektion Population Allel Phänotyp Genotyp "
+          "Angebot Nachfrage Markt Kosten Erlös Bilanz Rendite Investition Paradigma Funktion Objekt Klasse Typ Rekursion").split()
+
+
+def corpus_id(path: Path) -> str:
+    return f'{path.parent.name}/{path.stem}'
+
+
+def make_sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    return ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+
+def make_flashcards(size: int, seed: int = 0) -> List[Flashcard]:
+    """
+    Create `size` synthetic flashcards with front and back sides of realistic length. The same size and seed yield the same cards.
+    """
+    rng = random.Random(seed)
+    return [
+        Flashcard(card_id, rng.choice([FlashcardType.DEFINITION, FlashcardType.OPEN_ENDED]),
+                  make_sentence(rng, 4, 14) + '?', make_sentence(rng, 8, 40) + '.')
+        for card_id in range(1, size + 1)
+    ]
+
+
+def make_deck(size: int) -> FlashcardDeck:
+    return FlashcardDeck(make_flashcards(size))
+
+
+def make_completion_content(size: int) -> str:
+    """
+    Create the content of a completion with `size` flashcards, in the format the model is prompted to answer in.
+    """
+    return '\n'.join(
+        f"[{'Term' if flashcard.type == FlashcardType.DEFINITION else 'Concept'}] {flashcard.front_side}; {flashcard.back_side}"
+        for flashcard in make_flashcards(size)
+    )
+
+
+def make_structured_completion_content(size: int) -> str:
+    """
+    Create the content of a completion with `size` flashcards as structured output (generation.output_format json_schema).
+    """
+    return json.dumps({'flashcards': [
+        {'prefix': 'Term' if flashcard.type == FlashcardType.DEFINITION else 'Concept', 'front': flashcard.front_side,
+         'back': flashcard.back_side}
+        for flashcard in make_flashcards(size)
+    ]}, ensure_ascii=False)
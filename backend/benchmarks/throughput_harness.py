@@ -0,0 +1,320 @@
+# benchmarks/throughput_harness.py
+"""
+End-to-end throughput harness for the API and the Celery worker.
+
+Starts the Flask app from `create_app()` and a Celery worker in the same process, using the fake OpenAI client. Simulated
+users arrive at a configurable rate (Poisson arrivals) and each one requests a deck, polls its status until it is complete and
+downloads the exports. The harness reports tasks/sec, end-to-end and per-endpoint latency percentiles, the queue wait time of
+the tasks and the number of Redis commands.
+
+By default the broker is in memory, the result backend is Celery's in-memory cache and the services use fakeredis (a dev
+dependency), so no RabbitMQ or Redis is needed. Pass --broker-url and --redis-url to run against real ones.
+
+Run from the `backend` directory, e.g.:
+
+    python benchmarks/throughput_harness.py --rate 2 --duration 60 --concurrency 8 --output throughput.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+CORPUS_DIR = Path(__file__).parents[1] / 'local_dev' / 'input'
+GENERATOR_URL = '/api/flashcards/generator'
+EXPORTER_URL = '/api/flashcards/exporter'
+
+
+class RedisCommandCounter:
+    """
+    Counts the commands sent by all Redis clients of the process (including Celery's result backend), by command name.
+    Commands of a pipeline are counted individually, the pipeline itself counts as one round trip.
+    """
+
+    def __init__(self):
+        self.commands = Counter()
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        import redis
+        from redis.client import Pipeline
+
+        counter = self
+        execute_command = redis.Redis.execute_command
+        execute_pipeline = Pipeline.execute
+
+        def counting_execute_command(client, *args, **options):
+            counter.add([args[0]])
+            return execute_command(client, *args, **options)
+
+        def counting_execute_pipeline(pipeline, *args, **kwargs):
+            counter.add([command_args[0] for command_args, _ in pipeline.command_stack])
+            return execute_pipeline(pipeline, *args, **kwargs)
+
+        redis.Redis.execute_command = counting_execute_command
+        Pipeline.execute = counting_execute_pipeline
+
+    def add(self, command_names: List) -> None:
+        with self._lock:
+            self.round_trips += 1
+            self.commands.update(str(name).upper() for name in command_names)
+
+
+class SessionResult:
+    """
+    The timings of one simulated user: request a deck, poll its status and download the exports.
+    """
+
+    def __init__(self):
+        self.task_id: Optional[str] = None
+        self.submit_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.error: Optional[str] = None
+        self.flashcards: Optional[int] = None
+        # Latencies in seconds of the API requests by endpoint
+        self.request_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.request_errors: Counter = Counter()
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of the values, or None if there are none.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, round(q / 100 * len(values) + 0.5) - 1))]
+
+
+def summarize(values: List[float]) -> dict:
+    return {
+        'count': len(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values) if values else None,
+    }
+
+
+def timed_request(session: SessionResult, endpoint: str, fn_request):
+    start = time.monotonic()
+    response = fn_request()
+    session.request_latencies[endpoint].append(time.monotonic() - start)
+    if response.status_code >= 400:
+        session.request_errors[endpoint] += 1
+    return response
+
+
+def run_session(client, input_text: str, args) -> SessionResult:
+    session = SessionResult()
+    session.submit_time = time.monotonic()
+    response = timed_request(session, 'POST generator', lambda: client.post(GENERATOR_URL, json={
+        'lang': args.lang, 'mode': args.mode, 'exportFormat': args.export_formats[0], 'inputText': input_text
+    }))
+    if response.status_code != 202:
+        session.error = f'POST generator returned {response.status_code}'
+        return session
+    session.task_id = response.get_json()['taskId']
+
+    deadline = session.submit_time + args.task_timeout_sec
+    while True:
+        response = timed_request(session, 'GET generator status', lambda: client.get(f'{GENERATOR_URL}/{session.task_id}'))
+        status = response.get_json(silent=True) or {}
+        if response.status_code == 200 and status.get('taskState') == 'SUCCESS':
+            break
+        if response.status_code >= 500:
+            # The status endpoint raises the error of a failed task, polling on would only run into the timeout
+            session.error = f"GET generator status returned {response.status_code}: " \
+                            f"{status.get('description') or response.get_data(as_text=True).strip()}"
+            return session
+        if status.get('taskState') in ['FAILURE', 'REVOKED']:
+            session.error = f"Task {status['taskState']}"
+            return session
+        if time.monotonic() > deadline:
+            session.error = 'Timed out'
+            return session
+        time.sleep(args.poll_interval_sec)
+
+    for export_format in args.export_formats:
+        response = timed_request(session, f'GET exporter {export_format}',
+                                 lambda: client.get(f"{EXPORTER_URL}/{status['retrievalToken']}?format={export_format}"))
+        if response.status_code != 200:
+            session.error = f'Export {export_format} returned {response.status_code}'
+            return session
+    session.end_time = time.monotonic()
+    return session
+
+
+def configure_environment(args) -> None:
+    os.environ.setdefault('QUIZARD_CONFIG', 'quizard_config.yaml')
+    os.environ.setdefault('SECRET_KEY', 'throughput-harness')
+    os.environ.setdefault('OPENAI_API_KEY', 'throughput-harness')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ['OPENAI_CLIENT'] = 'fake'
+    os.environ['CELERY_BROKER_URL'] = args.broker_url
+    os.environ['CELERY_RESULT_BACKEND_URL'] = args.redis_url or 'cache+memory://'
+
+
+def start_app(args):
+    """
+    Start the container and the Flask app, with in-memory stand-ins for Redis unless a Redis URL is given.
+    """
+    from dependency_injector import providers
+
+    from src.container import get_container
+    from src.rest.flask_app import create_app
+    from src.services.fake_openai_service.fake_openai_client import FakeOpenAI
+    from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
+    from src.services.rate_limit_service.in_memory_rate_limiter import InMemoryRateLimiter
+
+    # A copy, the config cached by QuizardConfig stays unchanged
+    fake_openai_config = dict(QuizardConfig.get_fake_openai_config())
+    for option in ['ttft_median_sec', 'tokens_per_sec', 'rate_limit_error_rate', 'server_error_rate', 'seed']:
+        if getattr(args, option) is not None:
+            fake_openai_config[option] = getattr(args, option)
+
+    container = get_container()
+    container.openai_client.override(providers.Singleton(FakeOpenAI, **fake_openai_config))
+    # The container wires the __main__ module, which is the harness here and not the module of create_app
+    container.wire(modules=['src.rest.flask_app'])
+    if args.redis_url is None:
+        import fakeredis
+        container.redis_client.override(providers.Singleton(fakeredis.FakeRedis))
+        # The Redis rate limiter is a Lua script, which fakeredis only runs with the optional lupa package
+        container.rate_limiter.override(providers.Singleton(InMemoryRateLimiter, **QuizardConfig.get_rate_limit_config()))
+    if not args.completion_cache:
+        # The corpora are requested over and over, cached completions would hide the generation
+        container.completion_cache.override(providers.Object(None))
+    return container, create_app()
+
+
+def run(args) -> dict:
+    configure_environment(args)
+    redis_counter = RedisCommandCounter()
+    redis_counter.install()
+    container, flask_app = start_app(args)
+
+    from celery.contrib.testing.worker import start_worker
+    from celery.signals import task_prerun
+
+    task_start_times = {}
+
+    def record_task_start(task_id=None, **kwargs):
+        task_start_times[task_id] = time.monotonic()
+
+    task_prerun.connect(record_task_start, weak=False)
+
+    corpora = [path.read_text(encoding='utf-8')[:args.max_input_chars] for path in sorted(CORPUS_DIR.glob(args.corpus))]
+    if not corpora:
+        raise SystemExit(f'No corpus matches {args.corpus} in {CORPUS_DIR}')
+    rng = random.Random(args.seed)
+    client = flask_app.test_client()
+
+    with start_worker(container.celery_app(), pool='threads', concurrency=args.concurrency, perform_ping_check=False,
+                      shutdown_timeout=args.task_timeout_sec):
+        with ThreadPoolExecutor(max_workers=args.max_users, thread_name_prefix='user') as executor:
+            futures = []
+            start_time = time.monotonic()
+            next_arrival = start_time
+            # Open-loop load: users arrive independently of how fast earlier users are served
+            while next_arrival < start_time + args.duration_sec:
+                time.sleep(max(0.0, next_arrival - time.monotonic()))
+                futures.append(executor.submit(run_session, client, rng.choice(corpora), args))
+                next_arrival += rng.expovariate(args.rate)
+            wait(futures)
+    sessions = [future.result() for future in futures]
+
+    completed = [session for session in sessions if session.error is None]
+    queue_waits = [task_start_times[session.task_id] - session.submit_time for session in sessions if session.task_id in task_start_times]
+    request_latencies = defaultdict(list)
+    request_errors = Counter()
+    for session in sessions:
+        for endpoint, latencies in session.request_latencies.items():
+            request_latencies[endpoint] += latencies
+        request_errors.update(session.request_errors)
+    elapsed_sec = max(session.end_time for session in completed) - start_time if completed else None
+
+    return {
+        'config': vars(args),
+        'users': len(sessions),
+        'completed': len(completed),
+        'errors': dict(Counter(session.error for session in sessions if session.error is not None)),
+        'tasks_per_sec': len(completed) / elapsed_sec if elapsed_sec else None,
+        'end_to_end_latency_sec': summarize([session.end_time - session.submit_time for session in completed]),
+        'queue_wait_sec': summarize(queue_waits),
+        'request_latency_sec': {endpoint: summarize(latencies) for endpoint, latencies in sorted(request_latencies.items())},
+        'request_errors': dict(request_errors),
+        'redis': {
+            'commands': sum(redis_counter.commands.values()),
+            'round_trips': redis_counter.round_trips,
+            'commands_per_task': sum(redis_counter.commands.values()) / len(sessions) if sessions else None,
+            'by_command': dict(redis_counter.commands.most_common()),
+        },
+    }
+
+
+def format_summary(summary: dict) -> str:
+    def ms(value):
+        return f'{value * 1000:9.1f}' if value is not None else '        -'
+
+    return f"{summary['count']:6d} {ms(summary['p50'])} {ms(summary['p95'])} {ms(summary['p99'])} {ms(summary['max'])}"
+
+
+def print_report(report: dict) -> None:
+    print(f"Users: {report['users']}, completed: {report['completed']}, errors: {report['errors'] or 'none'}")
+    tasks_per_sec = report['tasks_per_sec']
+    print(f"Throughput: {tasks_per_sec:.3f} tasks/sec" if tasks_per_sec is not None else "Throughput: -")
+    print(f"\n{'Latency (ms)':32s}  count       p50       p95       p99       max")
+    print(f"{'end to end':32s} {format_summary(report['end_to_end_latency_sec'])}")
+    print(f"{'queue wait':32s} {format_summary(report['queue_wait_sec'])}")
+    for endpoint, summary in report['request_latency_sec'].items():
+        print(f"{endpoint:32s} {format_summary(summary)}")
+    if report['request_errors']:
+        print(f"\nRequest errors: {report['request_errors']}")
+    redis_report = report['redis']
+    print(f"\nRedis: {redis_report['commands']} commands in {redis_report['round_trips']} round trips "
+          f"({redis_report['commands_per_task'] or 0:.1f} commands per task)")
+    for command, count in list(redis_report['by_command'].items())[:10]:
+        print(f"  {command:12s} {count}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1], formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--rate', type=float, default=1.0, help='Arrival rate of users per second')
+    parser.add_argument('--duration-sec', type=float, default=30.0, help='Duration of the arrivals')
+    parser.add_argument('--concurrency', type=int, default=4, help='Number of worker threads of the Celery worker')
+    parser.add_argument('--max-users', type=int, default=256, help='Maximum number of concurrently active users')
+    parser.add_argument('--poll-interval-sec', type=float, default=0.5, help='Interval in which users poll the task status')
+    parser.add_argument('--task-timeout-sec', type=float, default=300.0, help='Time after which a user gives up on a task')
+    parser.add_argument('--export-formats', nargs='+', default=['csv', 'apkg'], help='Formats each user downloads')
+    parser.add_argument('--lang', default='de')
+    parser.add_argument('--mode', default='PRACTICE')
+    parser.add_argument('--corpus', default='*/*.txt', help=f'Glob of the input texts in {CORPUS_DIR}')
+    parser.add_argument('--max-input-chars', type=int, default=20_000, help='Length to which the input texts are truncated')
+    parser.add_argument('--broker-url', default='memory://', help='Celery broker URL')
+    parser.add_argument('--redis-url', default=None, help='Redis URL of the result backend and the services (default: in memory)')
+    parser.add_argument('--completion-cache', action='store_true', help='Keep the configured completion cache enabled')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the arrivals, input texts and fake completions')
+    parser.add_argument('--ttft-median-sec', type=float, default=None, help='Overrides fake_openai.ttft_median_sec')
+    parser.add_argument('--tokens-per-sec', type=float, default=None, help='Overrides fake_openai.tokens_per_sec')
+    parser.add_argument('--rate-limit-error-rate', type=float, default=None, help='Overrides fake_openai.rate_limit_error_rate')
+    parser.add_argument('--server-error-rate', type=float, default=None, help='Overrides fake_openai.server_error_rate')
+    parser.add_argument('--output', default=None, help='Path of a JSON file the report is written to')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    throughput_report = run(arguments)
+    print_report(throughput_report)
+    if arguments.output:
+        Path(arguments.output).write_text(json.dumps(throughput_report, indent=2))
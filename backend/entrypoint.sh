@@ -7,7 +7,8 @@ if [ "$APP_SERVICE" = "api" ]; then
         python -m src.rest.flask_app
     else
         echo "Running in production mode with Gunicorn..."
-        gunicorn -b 0.0.0.0:8080 "src.rest.flask_app:create_app()"
+        # Threads serve the long-lived progress event streams without blocking a worker process each
+        gunicorn -b 0.0.0.0:8080 --worker-class gthread --threads "${GUNICORN_THREADS:-100}" "src.rest.flask_app:create_app()"
     fi
 elif [ "$APP_SERVICE" = "worker" ]; then
     echo "Starting Celery Worker..."
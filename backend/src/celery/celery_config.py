@@ -3,7 +3,9 @@ from celery import Celery, Task
 from dependency_injector.wiring import inject, Provide
 from flask import Flask
 
+from src.celery.serialization import SERIALIZER_NAME, register_serializer
 from src.container import Container
+from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
 
 
 @inject
@@ -57,10 +59,15 @@ def create_celery_app(flask_app=Provide[Container.flask_app]) -> Celery:
         celery_app.conf.task_track_started = True
         celery_app.conf.task_ignore_result = False
         celery_app.set_default()
+        # Versioned msgpack instead of pickle, the decks in the result backend are compressed
+        register_serializer(QuizardConfig.get_serialization_config())
         celery_app.conf.update(
-            task_serializer='pickle',
-            result_serializer='pickle',
-            accept_content=['pickle', 'json'],
+            task_serializer=SERIALIZER_NAME,
+            result_serializer=SERIALIZER_NAME,
+            # pickle is still accepted for the task messages queued and the results stored (kept for one day) before the
+            # switch to msgpack. Remove it from both lists in the next release.
+            accept_content=[SERIALIZER_NAME, 'json', 'pickle'],
+            result_accept_content=[SERIALIZER_NAME, 'json', 'pickle'],
         )
         flask_app.extensions["celery"] = celery_app
     except KeyError as e:
@@ -1,8 +1,9 @@
 # src.celery.celery_worker.py
-from celery.signals import task_failure
+from celery.signals import task_failure, task_revoked, task_success
 import structlog
 
 from src.container import get_container
+from src.enums.task_states import TaskState
 
 logger = structlog.get_logger(__name__)
 
@@ -15,12 +16,46 @@ def handle_task_failure(sender=None, task_id=None, exception=None, args=None, kw
     logger.error(f"Celery task failed: {task_id}", exc_info=exception, args=args, kwargs=kwargs, traceback=traceback)
 
 
+def publish_task_success(sender=None, result=None, **other_kwargs):
+    """
+    Publish the success of a task as progress event
+    The signal is sent after the result was stored, so subscribers can fetch the result right away
+    """
+    publish_task_event(sender.request.id, {'task_state': TaskState.success.value})
+
+
+def publish_task_failure(sender=None, task_id=None, exception=None, **other_kwargs):
+    """
+    Publish the failure of a task as progress event
+    """
+    publish_task_event(task_id, {'task_state': TaskState.failure.value, 'error': str(exception), 'exc_type': type(exception).__name__})
+
+
+def publish_task_revocation(sender=None, request=None, **other_kwargs):
+    """
+    Publish the revocation of a task as progress event
+    """
+    publish_task_event(request.id, {'task_state': TaskState.revoked.value})
+
+
+def publish_task_event(task_id: str, event: dict) -> None:
+    progress_broker = container.progress_broker()
+    if progress_broker is not None:
+        progress_broker.publish(task_id, event)
+
+
 # Handle Celery task failures
 task_failure.connect(handle_task_failure)
+# Push the outcome of tasks to the subscribers of their progress events
+task_success.connect(publish_task_success)
+task_failure.connect(publish_task_failure)
+task_revoked.connect(publish_task_revocation)
 
 # Get the container
 container = get_container()
 celery_app = container.celery_app()
+# Load all prompts before the worker processes are forked, so tasks do not read or encode the prompt files
+container.prompt_registry()
 
 if __name__ == '__main__':
     celery_app.start()
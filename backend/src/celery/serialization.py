@@ -0,0 +1,153 @@
+# src/celery/serialization.py
+import sys
+import zlib
+from array import array
+from enum import Enum
+
+import msgpack
+from kombu.serialization import register
+
+from src.custom_exceptions.internal_exceptions import SerializationError
+from src.dtos.generator_task import FlashcardGeneratorTaskDto
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.entities.flashcard_deck.flashcard_deck import ColumnarFlashcardDeck, FlashcardDeck
+
+try:
+    # zstd compresses decks faster and smaller than zlib, but is not required
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SERIALIZER_NAME = 'quizard-msgpack'
+CONTENT_TYPE = 'application/x-quizard-msgpack'
+
+# Every payload starts with the version of the encoding and the compression of the rest of the payload
+FORMAT_VERSION = 1
+NO_COMPRESSION = 0
+ZLIB = 1
+ZSTD = 2
+_COMPRESSIONS = {'none': NO_COMPRESSION, 'zlib': ZLIB, 'zstd': ZSTD}
+
+# msgpack extension types of the objects passed to and returned by the tasks
+_EXT_TASK_DTO = 1
+_EXT_DECK = 2
+_EXT_FLASHCARD = 3
+
+_FLASHCARD_TYPES = list(FlashcardType)
+_TASK_DTO_FIELDS = list(FlashcardGeneratorTaskDto.model_fields)
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode, data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _default(obj):
+    if isinstance(obj, FlashcardDeck):
+        deck = obj.to_columnar()
+        data = [_to_little_endian(deck.ids), deck.types, deck.text, _to_little_endian(deck.offsets), deck.dropped_duplicates]
+        return msgpack.ExtType(_EXT_DECK, msgpack.packb(data))
+    if isinstance(obj, Flashcard):
+        data = [obj.id, _FLASHCARD_TYPES.index(obj.type), obj.front_side, obj.back_side]
+        return msgpack.ExtType(_EXT_FLASHCARD, msgpack.packb(data))
+    if isinstance(obj, FlashcardGeneratorTaskDto):
+        # The fields in the order of their declaration, the enums by value
+        data = [getattr(obj, field) for field in _TASK_DTO_FIELDS]
+        data = [value.value if isinstance(value, Enum) else value for value in data]
+        return msgpack.ExtType(_EXT_TASK_DTO, msgpack.packb(data))
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == _EXT_DECK:
+        ids, types, text, offsets, dropped_duplicates = msgpack.unpackb(data)
+        return ColumnarFlashcardDeck(_from_little_endian('q', ids), types, text, _from_little_endian('I', offsets),
+                                     dropped_duplicates)
+    if code == _EXT_FLASHCARD:
+        flashcard_id, type_index, front_side, back_side = msgpack.unpackb(data)
+        return Flashcard(flashcard_id, _FLASHCARD_TYPES[type_index], front_side, back_side)
+    if code == _EXT_TASK_DTO:
+        return FlashcardGeneratorTaskDto(**dict(zip(_TASK_DTO_FIELDS, msgpack.unpackb(data))))
+    return msgpack.ExtType(code, data)
+
+
+class MessageSerializer:
+    """
+    Versioned msgpack encoding of the Celery task messages and results, replacing pickle.
+
+    Task parameters (FlashcardGeneratorTaskDto) and results (FlashcardDeck, Flashcard) are encoded as msgpack extension types
+    with a fixed schema; decks column by column, so a deck is decoded as ColumnarFlashcardDeck. Enums (e.g. TaskState) are
+    encoded by value. Payloads larger than the compression threshold are compressed with zstd (zlib if zstandard is not
+    installed), which shrinks the results kept in the result backend.
+
+    Parameters
+    ----------
+    compression : str
+        "zstd", "zlib" or "none".
+    compression_threshold_bytes : int
+        The size of the encoded payload from which it is compressed.
+    compression_level : int
+        The compression level of zstd or zlib.
+    """
+
+    def __init__(self, compression: str = 'zstd', compression_threshold_bytes: int = 1024, compression_level: int = 3):
+        if compression == 'zstd' and zstandard is None:
+            compression = 'zlib'
+        self.compression = _COMPRESSIONS[compression]
+        self.compression_threshold_bytes = compression_threshold_bytes
+        self.compression_level = compression_level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level) if self.compression == ZSTD else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def dumps(self, obj) -> bytes:
+        payload = msgpack.packb(obj, default=_default)
+        compression = self.compression if len(payload) >= self.compression_threshold_bytes else NO_COMPRESSION
+        if compression == ZSTD:
+            payload = self._zstd_compressor.compress(payload)
+        elif compression == ZLIB:
+            payload = zlib.compress(payload, self.compression_level)
+        return bytes((FORMAT_VERSION, compression)) + payload
+
+    def loads(self, data: bytes):
+        if len(data) < 2 or data[0] != FORMAT_VERSION:
+            raise SerializationError(f"Unsupported payload version: {data[0] if data else None}")
+        compression, payload = data[1], memoryview(data)[2:]
+        if compression == ZSTD:
+            if self._zstd_decompressor is None:
+                raise SerializationError("Cannot decompress a zstd payload, zstandard is not installed.")
+            payload = self._zstd_decompressor.decompress(payload)
+        elif compression == ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression != NO_COMPRESSION:
+            raise SerializationError(f"Unsupported payload compression: {compression}")
+        return msgpack.unpackb(payload, ext_hook=_ext_hook, strict_map_key=False)
+
+
+def register_serializer(config: dict) -> MessageSerializer:
+    """
+    Register the message serializer with kombu under SERIALIZER_NAME.
+
+    Parameters
+    ----------
+    config : dict
+        The serialization config (QuizardConfig.get_serialization_config).
+
+    Returns
+    -------
+    MessageSerializer
+        The registered serializer.
+    """
+    serializer = MessageSerializer(config['compression'], config['compression_threshold_bytes'], config['compression_level'])
+    register(SERIALIZER_NAME, serializer.dumps, serializer.loads, content_type=CONTENT_TYPE, content_encoding='binary')
+    return serializer
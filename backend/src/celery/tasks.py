@@ -1,26 +1,40 @@
 # src/celery/tasks.py
+from collections import Counter
+from typing import Dict, List, Optional
+
 from dependency_injector.wiring import inject, Provide
 from openai import OpenAIError
 from src.custom_exceptions.internal_exceptions import QuizardError
 from src.dtos.generator_task import FlashcardGeneratorTaskDto
 from src.container import Container
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
 from src.enums.task_states import TaskState
+from src.services.flashcard_service.flashcard_generator_service.bulk_flashcard_generator import BulkFlashcardGenerator
 from src.services.flashcard_service.flashcard_service import FlashcardService
+from src.services.partial_result_service.partial_result_store_interface import IPartialResultStore
+from src.services.progress_service.progress_broker_interface import IProgressBroker
 from celery import shared_task
+from celery.exceptions import Retry
 from celery.utils.log import get_task_logger
 
 logger = get_task_logger(__name__)
 
 
-@shared_task(bind=True, ignore_result=False, track_started=True)
+# Late acknowledgement redelivers the task if the worker is killed, the redelivered task resumes from the fragment checkpoints
+@shared_task(bind=True, ignore_result=False, track_started=True, acks_late=True, reject_on_worker_lost=True)
 @inject
-def flashcard_generator_task(self, params: FlashcardGeneratorTaskDto, flashcard_service=Provide[Container.flashcard_service]):
+def flashcard_generator_task(self, params: FlashcardGeneratorTaskDto, flashcard_service=Provide[Container.flashcard_service],
+                             progress_broker=Provide[Container.progress_broker],
+                             partial_result_store=Provide[Container.partial_result_store]):
     """
     Flashcard generator task.
     This task generates flashcards based on the provided parameters and stores the result in the backend used by Celery.
 
     Includes a custom state 'IN_PROGRESS' to indicate that information about the tasks progress. For the flashcard_generator_task progress
-    information is represented by the fields 'currentBatch' and 'totalBatches' in task.info.
+    information is represented by the fields 'currentBatch' and 'totalBatches' in task.info, the number of flashcards generated so
+    far by the field 'partialFlashcardsCount' (the flashcards themselves are kept in the partial result store). Every progress
+    update is also published as progress event (see IProgressBroker), the outcome of the task is published by the signal
+    handlers of the worker once the result is stored.
 
     Parameters
     ----------
@@ -29,6 +43,10 @@ def flashcard_generator_task(self, params: FlashcardGeneratorTaskDto, flashcard_
 
     flashcard_service: FlashcardService
         The service used to generate flashcards, injected by the dependency injector.
+    progress_broker: Optional[IProgressBroker]
+        The broker the progress events are published to, injected by the dependency injector (None if disabled).
+    partial_result_store: Optional[IPartialResultStore]
+        The store of the partial flashcards, injected by the dependency injector (None if disabled).
     Returns
     -------
     FlashcardDeck
@@ -44,10 +62,71 @@ def flashcard_generator_task(self, params: FlashcardGeneratorTaskDto, flashcard_
 
     try:
         logger.info(f"Flashcard generation task started with task id: {self.request.id}")
-        flashcard_deck = flashcard_service.generate_flashcard_deck(params, lambda cb, tbs: update_progress(self, cb, tbs))
-        self.update_state(state=TaskState.success)
-        return flashcard_deck
+        progress = TaskProgress(self, progress_broker, partial_result_store)
+        flashcard_deck = flashcard_service.generate_flashcard_deck(params, progress.update_progress, progress.update_partial_result,
+                                                                   checkpoint_id=self.request.id)
+        # Celery stores the SUCCESS state together with the result on return, an earlier SUCCESS would announce a missing result
+        # The columnar deck is encoded for the result backend as a few arrays instead of one object per flashcard
+        return flashcard_deck.to_columnar()
+
+    except OpenAIError as e:
+        update_state_with_exception(self, e)
+        raise
+    except QuizardError as e:
+        update_state_with_exception(self, e)
+        raise
+    except Exception as e:
+        update_state_with_exception(self, e)
+        raise RuntimeError(f"Unexpected error in task: {e}")
+
+
+
+# The task polls the batch by retrying itself, so no worker is blocked while the batch is processed
+@shared_task(bind=True, ignore_result=False, track_started=True, max_retries=None)
+@inject
+def bulk_flashcard_generator_task(self, params: Dict[str, FlashcardGeneratorTaskDto], batch_id: Optional[str] = None,
+                                  bulk_flashcard_generator: BulkFlashcardGenerator = Provide[Container.bulk_flashcard_generator]):
+    """
+    Bulk flashcard generator task.
+    This task generates the flashcard decks of many generator tasks with a single batch of completion requests and stores the
+    result in the backend used by Celery.
+
+    The first run submits the batch, following runs poll its status. While the batch is processed the task is in state
+    'IN_PROGRESS' with the batch ID in the field 'batchId' of task.info.
+
+    Parameters
+    ----------
+    params: Dict[str, FlashcardGeneratorTaskDto]
+        The DTOs of the generator tasks by task ID.
+    batch_id: Optional[str]
+        The ID of the submitted batch, None on the first run.
+    bulk_flashcard_generator: BulkFlashcardGenerator
+        The generator of the decks, injected by the dependency injector.
+    Returns
+    -------
+    Dict[str, FlashcardDeck]
+        The generated flashcard deck of each generator task by task ID.
 
+    Raises
+    ------
+    OpenAIError
+        If an error occurs while interacting with the OpenAI API.
+    QuizardError
+        If a Quizard-specific error occurs during flashcard generation (e.g. the batch failed).
+    """
+    try:
+        if batch_id is None:
+            logger.info(f"Bulk flashcard generation task started with task id: {self.request.id}")
+            batch_id = bulk_flashcard_generator.submit(params)
+        if not bulk_flashcard_generator.is_complete(batch_id):
+            self.update_state(state=TaskState.in_progress, meta={'batch_id': batch_id})
+            raise self.retry(args=(params, batch_id), kwargs={},
+                             countdown=bulk_flashcard_generator.bulk_generation_config['poll_interval_sec'])
+        flashcard_decks = bulk_flashcard_generator.collect(batch_id, params)
+        return {task_id: flashcard_deck.to_columnar() for task_id, flashcard_deck in flashcard_decks.items()}
+
+    except Retry:
+        raise
     except OpenAIError as e:
         update_state_with_exception(self, e)
         raise
@@ -59,8 +138,78 @@ def flashcard_generator_task(self, params: FlashcardGeneratorTaskDto, flashcard_
         raise RuntimeError(f"Unexpected error in task: {e}")
 
 
-def update_progress(task, current_batch: int, total_batches: int):
-    task.update_state(state=TaskState.in_progress, meta={'current_batch': current_batch, 'total_batches': total_batches})
+class TaskProgress:
+    """
+    Progress of a running flashcard generator task.
+    Every update stores the batch progress and the number of partial flashcards in the task meta, since each state update
+    replaces the previous meta, and publishes it as progress event.
+
+    The partial flashcards only grow: a flashcard is added the first time it is parsed and kept even if a retried batch drops
+    it, the final deck replaces them when the task succeeds. They are appended to the partial result store and progress events
+    only carry the flashcards added since the previous event, so neither the task meta nor the events grow with the deck. The
+    partial flashcards are numbered in the order they were added.
+
+    Parameters
+    ----------
+    task
+        The bound Celery task.
+    progress_broker : Optional[IProgressBroker]
+        The broker the progress events are published to, None to only update the task meta.
+    partial_result_store : Optional[IPartialResultStore]
+        The store of the partial flashcards, None to not keep them.
+    """
+
+    def __init__(self, task, progress_broker: Optional[IProgressBroker] = None,
+                 partial_result_store: Optional[IPartialResultStore] = None):
+        self.task = task
+        self.progress_broker = progress_broker
+        self.partial_result_store = partial_result_store
+        self.current_batch = None
+        self.total_batches = None
+        self.partial_flashcards_count = 0
+        self._added_flashcards = None
+
+    def update_progress(self, current_batch: int, total_batches: int):
+        self.current_batch, self.total_batches = current_batch, total_batches
+        self._update_state()
+
+    def update_partial_result(self, flashcards: List[Flashcard]):
+        if self._added_flashcards is None:
+            self._load_added_flashcards()
+        new_flashcards = []
+        parsed_flashcards = Counter()
+        for flashcard in flashcards:
+            key = (flashcard.type, flashcard.front_side, flashcard.back_side)
+            parsed_flashcards[key] += 1
+            if parsed_flashcards[key] > self._added_flashcards[key]:
+                self._added_flashcards[key] += 1
+                new_flashcards.append({**flashcard.to_dict(), 'id': self.partial_flashcards_count + len(new_flashcards) + 1})
+        if new_flashcards:
+            if self.partial_result_store is not None:
+                self.partial_result_store.append(self.task.request.id, new_flashcards)
+            self.partial_flashcards_count += len(new_flashcards)
+            self._update_state(new_flashcards)
+
+    def _load_added_flashcards(self):
+        # A redelivered task continues the partial flashcards stored by its previous run
+        stored_flashcards = self.partial_result_store.load(self.task.request.id) if self.partial_result_store else []
+        self._added_flashcards = Counter((FlashcardType(flashcard['type']), flashcard['front_side'], flashcard['back_side'])
+                                         for flashcard in stored_flashcards)
+        self.partial_flashcards_count = len(stored_flashcards)
+
+    def _update_state(self, new_flashcards: List[dict] = ()):
+        meta = {
+            'current_batch': self.current_batch,
+            'total_batches': self.total_batches,
+            'partial_flashcards_count': self.partial_flashcards_count
+        }
+        self.task.update_state(state=TaskState.in_progress, meta=meta)
+        if self.progress_broker is not None:
+            self.progress_broker.publish(self.task.request.id, {
+                'task_state': TaskState.in_progress.value,
+                **meta,
+                'new_flashcards': list(new_flashcards)
+            })
 
 
 def update_state_with_exception(task, e: Exception):
@@ -3,6 +3,7 @@ import sys
 
 from dependency_injector import containers, providers
 from openai import OpenAI
+from redis import Redis
 
 from src.rest.flask_factory import create_flask_app
 from src.utils.env_util import load_environment_variables, get_env_variable, create_celery_broker_url, create_celery_result_backend_url
@@ -18,16 +19,32 @@ class Container(containers.DeclarativeContainer):
         import_name=__name__,
     )
 
+    # Retries are handled per error class by the flashcard generator (see the retries config), not by the client
     openai_client = providers.Factory(
         OpenAI,
         api_key=config.openai_api_key,
+        max_retries=0,
+    )
+
+    redis_client = providers.Singleton(
+        Redis.from_url,
+        url=config.celery_result_backend_url,
     )
 
     # Define of dummy services, to be replaced with actual services when calling configure_services (this is to avoid circular imports)
     celery_app = providers.Factory(object)
+    rate_limiter = providers.Factory(object)
+    completion_cache = providers.Factory(object)
+    prompt_registry = providers.Factory(object)
+    checkpoint_store = providers.Factory(object)
+    partial_result_store = providers.Factory(object)
     flashcard_generator = providers.Factory(object)
+    batch_client = providers.Factory(object)
+    bulk_flashcard_generator = providers.Factory(object)
     flashcard_service = providers.Factory(object)
     flashcard_generator_task_service = providers.Factory(object)
+    export_cache = providers.Factory(object)
+    progress_broker = providers.Factory(object)
 
 
 # Global container instance to ensure singleton behavior
@@ -47,16 +64,136 @@ def configure_services(container: Container) -> None:
     from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import FlashcardGenerator
     from src.services.flashcard_service.flashcard_service import FlashcardService
     from src.services.task_service.flashcard_generator_task_service import FlashcardGeneratorTaskService
+    from src.services.task_service.task_status_cache import TaskStatusCache
+    from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
+    from src.services.rate_limit_service.redis_rate_limiter import RedisRateLimiter
+    from src.services.completion_cache_service.local_completion_cache import LocalCompletionCache
+    from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+    from src.services.completion_cache_service.redis_completion_cache import RedisCompletionCache
+    from src.services.checkpoint_service.local_checkpoint_store import LocalCheckpointStore
+    from src.services.checkpoint_service.redis_checkpoint_store import RedisCheckpointStore
+    from src.services.partial_result_service.local_partial_result_store import LocalPartialResultStore
+    from src.services.partial_result_service.redis_partial_result_store import RedisPartialResultStore
+    from src.services.batch_service.openai_batch_client import OpenAIBatchClient
+    from src.services.batch_service.local_batch_client import LocalBatchClient
+    from src.services.flashcard_service.flashcard_generator_service.bulk_flashcard_generator import BulkFlashcardGenerator
+    from src.services.fake_openai_service.fake_openai_client import FakeOpenAI
+    from src.services.export_cache_service.disk_export_cache import DiskExportCache
+    from src.services.export_cache_service.local_export_cache import LocalExportCache
+    from src.services.progress_service.redis_progress_broker import RedisProgressBroker
+    from src.services.progress_service.local_progress_broker import LocalProgressBroker
 
     container.celery_app = providers.Singleton(
         create_celery_app,
         flask_app=container.flask_app,
     )
 
+    if get_env_variable('OPENAI_CLIENT', optional=True) == 'fake':
+        # One instance for all services, so a seeded run draws a single reproducible sequence of latencies and errors
+        container.openai_client.override(
+            providers.Singleton(
+                FakeOpenAI,
+                **QuizardConfig.get_fake_openai_config(),
+            )
+        )
+
+    container.rate_limiter.override(
+        providers.Singleton(
+            RedisRateLimiter,
+            redis_client=container.redis_client,
+            **QuizardConfig.get_rate_limit_config(),
+        )
+    )
+
+    container.prompt_registry.override(
+        providers.Singleton(
+            PromptRegistry,
+            prompt_config=QuizardConfig.get_prompt_config(),
+            output_format=QuizardConfig.get_generation_config()['output_format'],
+        )
+    )
+
+    completion_cache_config = QuizardConfig.get_completion_cache_config()
+    if completion_cache_config['backend'] == 'redis':
+        completion_cache = providers.Singleton(
+            RedisCompletionCache,
+            redis_client=container.redis_client,
+            ttl_sec=completion_cache_config['ttl_sec'],
+            max_entries=completion_cache_config['max_entries'],
+        )
+    elif completion_cache_config['backend'] == 'local':
+        completion_cache = providers.Singleton(
+            LocalCompletionCache,
+            ttl_sec=completion_cache_config['ttl_sec'],
+            max_entries=completion_cache_config['max_entries'],
+        )
+    else:
+        completion_cache = providers.Object(None)
+    container.completion_cache.override(completion_cache)
+
+    checkpoint_config = QuizardConfig.get_checkpoint_config()
+    if checkpoint_config['backend'] == 'redis':
+        checkpoint_store = providers.Singleton(
+            RedisCheckpointStore,
+            redis_client=container.redis_client,
+            ttl_sec=checkpoint_config['ttl_sec'],
+        )
+    elif checkpoint_config['backend'] == 'local':
+        checkpoint_store = providers.Singleton(
+            LocalCheckpointStore,
+            ttl_sec=checkpoint_config['ttl_sec'],
+        )
+    else:
+        checkpoint_store = providers.Object(None)
+    container.checkpoint_store.override(checkpoint_store)
+
+    partial_result_config = QuizardConfig.get_partial_result_config()
+    if partial_result_config['backend'] == 'redis':
+        partial_result_store = providers.Singleton(
+            RedisPartialResultStore,
+            redis_client=container.redis_client,
+            ttl_sec=partial_result_config['ttl_sec'],
+        )
+    elif partial_result_config['backend'] == 'local':
+        partial_result_store = providers.Singleton(
+            LocalPartialResultStore,
+            ttl_sec=partial_result_config['ttl_sec'],
+        )
+    else:
+        partial_result_store = providers.Object(None)
+    container.partial_result_store.override(partial_result_store)
+
     container.flashcard_generator.override(
         providers.Factory(
             FlashcardGenerator,
             client=container.openai_client,
+            rate_limiter=container.rate_limiter,
+            completion_cache=container.completion_cache,
+            prompt_registry=container.prompt_registry,
+            checkpoint_store=container.checkpoint_store,
+        )
+    )
+
+    bulk_generation_config = QuizardConfig.get_bulk_generation_config()
+    if bulk_generation_config['backend'] == 'openai':
+        batch_client = providers.Singleton(
+            OpenAIBatchClient,
+            client=container.openai_client,
+            completion_window=bulk_generation_config['completion_window'],
+        )
+    else:
+        batch_client = providers.Singleton(
+            LocalBatchClient,
+            batch_dir=bulk_generation_config['local_batch_dir'],
+            client=container.openai_client,
+        )
+    container.batch_client.override(batch_client)
+
+    container.bulk_flashcard_generator.override(
+        providers.Factory(
+            BulkFlashcardGenerator,
+            flashcard_generator=container.flashcard_generator,
+            batch_client=container.batch_client,
         )
     )
 
@@ -67,13 +204,56 @@ def configure_services(container: Container) -> None:
         )
     )
 
+    task_status_cache_config = QuizardConfig.get_task_status_cache_config()
+    if task_status_cache_config['enabled']:
+        task_status_cache = providers.Singleton(
+            TaskStatusCache,
+            ttl_sec=task_status_cache_config['ttl_sec'],
+            max_entries=task_status_cache_config['max_entries'],
+        )
+    else:
+        task_status_cache = providers.Object(None)
+
     container.flashcard_generator_task_service.override(
         providers.Factory(
             FlashcardGeneratorTaskService,
             celery_app=container.celery_app,
+            status_cache=task_status_cache,
         )
     )
 
+    export_cache_config = QuizardConfig.get_export_cache_config()
+    if export_cache_config['backend'] == 'disk':
+        export_cache = providers.Singleton(
+            DiskExportCache,
+            cache_dir=export_cache_config['cache_dir'],
+            ttl_sec=export_cache_config['ttl_sec'],
+            max_bytes=export_cache_config['max_bytes'],
+        )
+    elif export_cache_config['backend'] == 'local':
+        export_cache = providers.Singleton(
+            LocalExportCache,
+            ttl_sec=export_cache_config['ttl_sec'],
+            max_bytes=export_cache_config['max_bytes'],
+        )
+    else:
+        export_cache = providers.Object(None)
+    container.export_cache.override(export_cache)
+
+    progress_events_config = QuizardConfig.get_progress_events_config()
+    if progress_events_config['backend'] == 'redis':
+        progress_broker = providers.Singleton(
+            RedisProgressBroker,
+            redis_client=container.redis_client,
+            channel_prefix=progress_events_config['channel_prefix'],
+            max_queued_events=progress_events_config['max_queued_events'],
+        )
+    elif progress_events_config['backend'] == 'local':
+        progress_broker = providers.Singleton(LocalProgressBroker, max_queued_events=progress_events_config['max_queued_events'])
+    else:
+        progress_broker = providers.Object(None)
+    container.progress_broker.override(progress_broker)
+
 
 def get_container() -> Container:
     """
@@ -53,6 +53,22 @@ class FlashcardPrefixError(FlashcardInvalidFormatError):
         self.flashcard = flashcard
 
 
+# Exceptions related to the OpenAI API
+class RateLimitTimeoutError(QuizardError):
+    """Exception raised when the rate limit budget does not become available in time."""
+    pass
+
+
+class BatchJobError(QuizardError):
+    """Exception raised when a batch of completion requests fails or is cancelled as a whole."""
+    pass
+
+
+class SerializationError(QuizardError):
+    """Exception raised when a Celery message or result cannot be encoded or decoded."""
+    pass
+
+
 class EnvironmentLoadingError(EnvironmentError):
     """Custom exception for errors relating loading the .env file."""
     pass
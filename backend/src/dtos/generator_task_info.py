@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 
 from pydantic import BaseModel
 
@@ -18,8 +18,14 @@ class GeneratorTaskInfoDto(BaseModel):
         The total number of flashcard batches.
     retrieval_token : str
         The token to retrieve the generated flashcards.
+    partial_flashcards_count : int
+        The number of flashcards generated so far while the task is in progress.
+    partial_flashcards : List[dict]
+        The flashcards generated so far while the task is in progress.
     """
     task_state: TaskState
     current_batch: Optional[int] = None
     total_batches: Optional[int] = None
     retrieval_token: Optional[str] = None
+    partial_flashcards_count: Optional[int] = None
+    partial_flashcards: Optional[List[dict]] = None
@@ -1,4 +1,7 @@
 # src/flashcard_service/completion_messages/completion_messages.py
+from typing import Optional
+
+
 class Messages:
     """
     A class representing a structured message sequence for the flashcard generation system.
@@ -13,6 +16,12 @@ class Messages:
         The example assistant response.
     input_text : str
         The input text provided by the user.
+    prompt_tokens : Optional[int]
+        Precomputed number of tokens of the prompt messages (see `compute_prompt_tokens`) for the model used by the caller.
+        If None, the tokens are counted on demand.
+    input_tokens : Optional[int]
+        Precomputed number of tokens of the input message (see `compute_input_tokens`) for the model used by the caller.
+        If None, the tokens are counted on demand.
 
     Attributes
     ----------
@@ -22,7 +31,8 @@ class Messages:
         An index for iterating over the messages.
     """
 
-    def __init__(self, system: str, example_user: str, example_assistant: str, input_text: str):
+    def __init__(self, system: str, example_user: str, example_assistant: str, input_text: str, prompt_tokens: Optional[int] = None,
+                 input_tokens: Optional[int] = None):
         self.system = system
         self.example_user = example_user
         self.example_assistant = example_assistant
@@ -34,6 +44,8 @@ class Messages:
             {"role": "user", "content": self.input_text},
         ]
         self._index = 0
+        self._prompt_tokens = prompt_tokens
+        self._input_tokens = input_tokens
 
     def __iter__(self):
         return self
@@ -58,43 +70,48 @@ class Messages:
         """
         return self._messages
 
-    def compute_prompt_tokens(self, encoding) -> int:
+    def compute_prompt_tokens(self, encoding, model_profile) -> int:
         """
-        Computes the total number of tokens in the prompts messages (excluding the actual input text).
+        Computes the total number of tokens in the prompts messages (excluding the actual input text), including the chat
+        format overhead of the messages and the reply priming.
 
         Parameters
         ----------
         encoding : tiktoken.Encoding
             Encoding object for the desired model.
+        model_profile : ModelProfile
+            Profile of the desired model, defining the chat format overhead.
 
         Returns
         -------
         int
             Total number of tokens in the prompts messages (excluding the actual input text).
         """
-        base_count = 18 + sum(
-            [len(encoding.encode(message['content'])) + len(encoding.encode(message['role']))
-             for message in self._messages[:-1]]
-        )
-        return base_count
+        if self._prompt_tokens is not None:
+            return self._prompt_tokens
+        return model_profile.count_message_tokens(encoding, self._messages[:-1]) + model_profile.reply_priming_tokens
 
-    def compute_input_tokens(self, encoding) -> int:
+    def compute_input_tokens(self, encoding, model_profile) -> int:
         """
-        Computes the total number of tokens in the input text.
+        Computes the total number of tokens in the input message, including its chat format overhead.
 
         Parameters
         ----------
         encoding : tiktoken.Encoding
             Encoding object for the desired model.
+        model_profile : ModelProfile
+            Profile of the desired model, defining the chat format overhead.
 
         Returns
         -------
         int
             Total number of tokens in the input text.
         """
-        return len(encoding.encode(self._messages[-1]['content'])) + len(encoding.encode(self._messages[-1]['role']))
+        if self._input_tokens is not None:
+            return self._input_tokens
+        return model_profile.count_message_tokens(encoding, self._messages[-1:])
 
-    def compute_total_tokens(self, encoding) -> int:
+    def compute_total_tokens(self, encoding, model_profile) -> int:
         """
         Computes the total number of tokens including the input text.
 
@@ -102,11 +119,13 @@ class Messages:
         ----------
         encoding : tiktoken.Encoding
             Encoding object for the desired model.
+        model_profile : ModelProfile
+            Profile of the desired model, defining the chat format overhead.
 
         Returns
         -------
         int
             Total number of tokens including the input text.
         """
-        total_count = self.compute_prompt_tokens(encoding) + self.compute_input_tokens(encoding)
+        total_count = self.compute_prompt_tokens(encoding, model_profile) + self.compute_input_tokens(encoding, model_profile)
         return total_count
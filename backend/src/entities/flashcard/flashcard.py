@@ -52,6 +52,8 @@ class Flashcard:
     back_side : str
         The content on the back side of the flashcard.
     """
+    # No instance __dict__, decks of tens of thousands of flashcards are kept in memory and encoded as task results
+    __slots__ = ('id', 'type', 'front_side', 'back_side')
 
     def __init__(self, id: int, type: FlashcardType, front_side: str, back_side: str):
         self.id = id
@@ -59,6 +61,23 @@ class Flashcard:
         self.front_side = front_side
         self.back_side = back_side
 
+    def __eq__(self, other):
+        if not isinstance(other, Flashcard):
+            return NotImplemented
+        return (self.id, self.type, self.front_side, self.back_side) == (other.id, other.type, other.front_side, other.back_side)
+
+    def __repr__(self):
+        return f'Flashcard({self.id!r}, {self.type!r}, {self.front_side!r}, {self.back_side!r})'
+
+    def __reduce__(self):
+        # Pickled as constructor arguments, which is smaller than the default state of slotted objects
+        return Flashcard, (self.id, self.type, self.front_side, self.back_side)
+
+    def __setstate__(self, state: dict):
+        # Flashcards pickled before they were slotted are restored from their instance __dict__
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __str__(self):
         """
         Create a string representation of the flashcard.
@@ -83,3 +102,14 @@ class Flashcard:
         """
         return self.front_side + ';' + self.back_side
 
+    def to_dict(self) -> dict:
+        """
+        Convert the flashcard to a dictionary of its attributes.
+
+        Returns
+        -------
+        dict
+            The ID, type, front side and back side of the flashcard.
+        """
+        return {'id': self.id, 'type': self.type, 'front_side': self.front_side, 'back_side': self.back_side}
+
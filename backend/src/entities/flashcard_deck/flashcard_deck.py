@@ -2,8 +2,13 @@
 import json
 import os
 import zipfile
-from typing import List
-from src.entities.flashcard.flashcard import Flashcard
+from array import array
+from typing import Iterator, List
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+
+# The type of a flashcard of a columnar deck is stored as the index of the type in this list
+_FLASHCARD_TYPES = list(FlashcardType)
+_FLASHCARD_TYPE_INDICES = {flashcard_type: index for index, flashcard_type in enumerate(_FLASHCARD_TYPES)}
 
 
 class FlashcardDeck:
@@ -16,6 +21,8 @@ class FlashcardDeck:
     ----------
     flashcards : List[Flashcard]
         a list of Flashcard objects
+    dropped_duplicates : int
+        the number of generated flashcards dropped as near-duplicates of other flashcards of the deck
 
     Methods
     -------
@@ -27,27 +34,43 @@ class FlashcardDeck:
         (Still n development, not tested)
     """
 
-    def __init__(self, flashcards: List[Flashcard]):
+    def __init__(self, flashcards: List[Flashcard], dropped_duplicates: int = 0):
         """
         Parameters
         ----------
         flashcards : List[Flashcard]
             a list of Flashcard objects to be included in the deck
+        dropped_duplicates : int
+            the number of generated flashcards dropped as near-duplicates
         """
         self.flashcards = flashcards
+        self.dropped_duplicates = dropped_duplicates
 
     def __str__(self):
         return self.to_json()
 
+    def __iter__(self) -> Iterator[Flashcard]:
+        return iter(self.flashcards)
+
+    def __len__(self) -> int:
+        return len(self.flashcards)
+
     def to_json(self) -> str:
-        return json.dumps(self, indent=4, default=vars)
+        return json.dumps({'flashcards': [card.to_dict() for card in self], 'dropped_duplicates': self.dropped_duplicates},
+                          indent=4)
 
     def to_dict_list(self):
         flashcard_dict_list = [{'id': card.id, 'type': card.type,
                                 'frontSide': card.front_side, 'backSide': card.back_side}
-                               for card in self.flashcards]
+                               for card in self]
         return flashcard_dict_list
 
+    def to_columnar(self) -> 'ColumnarFlashcardDeck':
+        """
+        Convert the deck to the columnar representation, e.g. before it is stored as a task result.
+        """
+        return ColumnarFlashcardDeck.from_flashcards(self.flashcards, self.dropped_duplicates)
+
     def save_as_csv(self, filename: str):
         """
         DEPRECATED
@@ -65,8 +88,83 @@ class FlashcardDeck:
         """
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                for flashcard in self.flashcards:
+                for flashcard in self:
                     f.write(flashcard.as_csv())
                     f.write('\n')
         except IOError as e:
             raise IOError(f"Failed to write to file {filename}: {e}")
+
+
+class ColumnarFlashcardDeck(FlashcardDeck):
+    """
+    A flashcard deck stored column by column instead of as a list of Flashcard objects.
+
+    The IDs and types are stored in arrays and the text of all front and back sides in a single string with an array of offsets,
+    so a deck takes a fraction of the memory of the list of flashcards and is encoded (e.g. as a Celery result) several times
+    faster. Flashcard objects are created on access; `flashcards` returns a new list on every access.
+
+    Attributes
+    ----------
+    ids : array
+        The IDs of the flashcards.
+    types : bytes
+        The index of the type of each flashcard in FlashcardType.
+    text : str
+        The front and back sides of all flashcards, concatenated.
+    offsets : array
+        The start of the front side and back side of each flashcard in `text`, followed by the end of the text.
+    dropped_duplicates : int
+        the number of generated flashcards dropped as near-duplicates of other flashcards of the deck
+    """
+
+    def __init__(self, ids: array, types: bytes, text: str, offsets: array, dropped_duplicates: int = 0):
+        self.ids = ids
+        self.types = types
+        self.text = text
+        self.offsets = offsets
+        self.dropped_duplicates = dropped_duplicates
+
+    @classmethod
+    def from_flashcards(cls, flashcards: List[Flashcard], dropped_duplicates: int = 0) -> 'ColumnarFlashcardDeck':
+        """
+        Create a columnar deck from a list of flashcards.
+        """
+        sides = [side for flashcard in flashcards for side in (flashcard.front_side, flashcard.back_side)]
+        offsets = array('I', [0])
+        end = 0
+        for side in sides:
+            end += len(side)
+            offsets.append(end)
+        return cls(array('q', [flashcard.id for flashcard in flashcards]),
+                   bytes(_FLASHCARD_TYPE_INDICES[flashcard.type] for flashcard in flashcards), ''.join(sides), offsets,
+                   dropped_duplicates)
+
+    @property
+    def flashcards(self) -> List[Flashcard]:
+        return list(self)
+
+    def _rows(self) -> Iterator[tuple]:
+        text, offsets = self.text, self.offsets
+        types = [_FLASHCARD_TYPES[type_index] for type_index in self.types]
+        # Offsets of the front side start, back side start and back side end of each flashcard
+        starts, ends = iter(offsets), iter(offsets)
+        next(ends)
+        for flashcard_id, flashcard_type, front_start, back_start, _, back_end in zip(self.ids, types, starts, ends, starts, ends):
+            yield flashcard_id, flashcard_type, text[front_start:back_start], text[back_start:back_end]
+
+    def __iter__(self) -> Iterator[Flashcard]:
+        for row in self._rows():
+            yield Flashcard(*row)
+
+    def to_dict_list(self):
+        return [{'id': flashcard_id, 'type': flashcard_type, 'frontSide': front_side, 'backSide': back_side}
+                for flashcard_id, flashcard_type, front_side, back_side in self._rows()]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_columnar(self) -> 'ColumnarFlashcardDeck':
+        return self
+
+    def __reduce__(self):
+        return ColumnarFlashcardDeck, (self.ids, self.types, self.text, self.offsets, self.dropped_duplicates)
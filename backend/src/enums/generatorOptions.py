@@ -16,6 +16,8 @@ class GeneratorMode(str, Enum):
 class ExportFormat(str, Enum):
     anki = "apkg"
     csv = "csv"
+    csv_zip = "zip"
+    ndjson = "ndjson"
 
     @classmethod
     def values(cls):
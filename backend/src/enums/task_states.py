@@ -15,3 +15,7 @@ class TaskState(Enum):
     failure = 'FAILURE'
     retry = 'RETRY'
     revoked = 'REVOKED'
+
+
+# States a task never leaves, so their status and outcome never change
+TERMINAL_STATES = frozenset({TaskState.success, TaskState.failure, TaskState.revoked})
@@ -10,8 +10,11 @@ from src.config.logging_config import setup_logging
 from src.container import Container, get_container
 from src.custom_exceptions.internal_exceptions import InvalidEnvironmentVariableError
 from src.rest.resources.flashcard_exporter_resource import FlashcardExporterResource
+from src.rest.resources.flashcard_generator_events_resource import FlashcardGeneratorEventsResource
 from src.rest.resources.flashcard_generator_resource import FlashcardGeneratorResource
+from src.rest.resources.flashcard_generator_status_resource import FlashcardGeneratorStatusResource
 from src.rest.resources.health_check_resource import HealthCheckResource
+from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
 from src.utils.env_util import get_env_variable
 
 # Configure logging
@@ -25,18 +28,32 @@ flashcard_exporter_url = f'{flashcards_base_url}/exporter'
 
 @inject
 def setup_api(flask_app: Flask, task_service=Provide[Container.flashcard_generator_task_service],
-              flashcard_service=Provide[Container.flashcard_service]) -> None:
+              flashcard_service=Provide[Container.flashcard_service], export_cache=Provide[Container.export_cache],
+              progress_broker=Provide[Container.progress_broker],
+              partial_result_store=Provide[Container.partial_result_store]) -> None:
     """
     Set up the Flask API endpoints. Must be called after the container is started, because the services are injected
     """
     CORS(flask_app)
+    export_cache_config = QuizardConfig.get_export_cache_config()
+    # send_file leaves the transfer of files to the web server
+    flask_app.config['USE_X_SENDFILE'] = export_cache_config['offload'] == 'x-sendfile'
     api = Api(flask_app)
     api.add_resource(FlashcardGeneratorResource,
                      flashcard_generator_url, f'{flashcard_generator_url}/<task_id>',
+                     resource_class_kwargs={'task_service': task_service, 'partial_result_store': partial_result_store})
+    api.add_resource(FlashcardGeneratorStatusResource, f'{flashcard_generator_url}/status',
                      resource_class_kwargs={'task_service': task_service})
+    if progress_broker is not None:
+        api.add_resource(FlashcardGeneratorEventsResource, f'{flashcard_generator_url}/<task_id>/events',
+                         resource_class_kwargs={'task_service': task_service, 'progress_broker': progress_broker,
+                                                'heartbeat_sec': QuizardConfig.get_progress_events_config()['heartbeat_sec'],
+                                                'partial_result_store': partial_result_store})
     api.add_resource(FlashcardExporterResource,
                      flashcard_exporter_url, f'{flashcard_exporter_url}/<token>',
-                     resource_class_kwargs={'task_service': task_service, 'flashcard_service': flashcard_service})
+                     resource_class_kwargs={'task_service': task_service, 'flashcard_service': flashcard_service,
+                                            'export_cache': export_cache, 'offload': export_cache_config['offload'],
+                                            'x_accel_redirect_location': export_cache_config.get('x_accel_redirect_location')})
     api.add_resource(HealthCheckResource, '/health')
 
 
@@ -1,36 +1,60 @@
-from flask import make_response, request
+import os
+from io import BytesIO
+from typing import Optional
+
+from flask import Response, request, send_file
 from flask_restful import Resource
 
 from src.custom_exceptions.external_exceptions import ValidationError
 from src.enums.generatorOptions import ExportFormat
+from src.services.export_cache_service.export_cache_interface import ExportArtifact, IExportCache
 from src.services.flashcard_service.flashcard_service import FlashcardService
 from src.services.task_service.flashcard_generator_task_service import ITaskService
 
+EXPORT_FILES = {
+    ExportFormat.csv: ("flashcards.csv", "text/csv"),
+    ExportFormat.csv_zip: ("flashcards.zip", "application/zip"),
+    ExportFormat.ndjson: ("flashcards.ndjson", "application/x-ndjson"),
+    ExportFormat.anki: ("flashcards.apkg", "application/x-sqlite3"),
+}
+
 
 class FlashcardExporterResource(Resource):
     """
     API resource for exporting flashcards in the backend to a file.
+
+    Exported decks are kept in the export cache, so repeated downloads neither fetch the task result nor export the deck
+    again. Responses carry an ETag and Content-Length, support conditional and range requests, and cached files are sent with
+    sendfile or by the reverse proxy (X-Accel-Redirect, X-Sendfile). Without an export cache, the export is streamed to the
+    client chunk by chunk.
     """
 
-    def __init__(self, task_service: ITaskService, flashcard_service: FlashcardService):
+    def __init__(self, task_service: ITaskService, flashcard_service: FlashcardService, export_cache: Optional[IExportCache] = None,
+                 offload: str = 'none', x_accel_redirect_location: Optional[str] = None):
         self.task_service = task_service
         self.flashcard_service = flashcard_service
+        self.export_cache = export_cache
+        self.offload = offload
+        self.x_accel_redirect_location = x_accel_redirect_location
 
-    # flashcards/exporter/<token>?format=<file_format>
+    # flashcards/exporter/<token>?format=<file_format>&compress=<compress>
     def get(self, token):
         """
-        flashcards/exporter/<token>?format=<file_format>
+        flashcards/exporter/<token>?format=<file_format>&compress=<compress>
         Get the generated flashcards in the requested file format.
         Parameters
         ----------
         token: str
             The retrieval token for the flashcards.
         file_format: str
-            The requested file type for the flashcards. Must be either 'csv' or 'apkg'.
+            The requested file type for the flashcards. Must be 'csv', 'zip' (the zipped CSV file), 'ndjson' or 'apkg'.
+        compress: str
+            Whether to compress the zip file with deflate ('true', the default) or to store the CSV file uncompressed ('false').
         Returns
         -------
         Response
-            The generated flashcards in the requested file format.
+            The generated flashcards in the requested file format, 304 if the client has the current file (If-None-Match) and
+            206 for range requests.
 
         Raises
         ------
@@ -42,17 +66,43 @@ class FlashcardExporterResource(Resource):
             raise ValidationError("File format not specified")
         if file_format not in ExportFormat.values():
             raise ValidationError(f"Unsupported file type: {file_format}")
+        compress = request.args.get('compress', default='true', type=str).lower()
+        if compress not in ['true', 'false']:
+            raise ValidationError(f"Invalid value for compress: {compress}")
+        export_format, compress = ExportFormat(file_format), compress == 'true'
         task_id = self.task_service.verify_retrival_token(token)
-        flashcard_deck = self.task_service.get_task_result(task_id)
-        file = self.flashcard_service.export_flashcard_deck(flashcard_deck, file_format)
-        if file_format == ExportFormat.csv:
-            filename = "flashcards.csv"
-            mimetype = "text/csv"
-        elif file_format == ExportFormat.anki:
-            filename = "flashcards.apkg"
-            mimetype = "application/x-sqlite3"
-
-        response = make_response(file)
-        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
-        response.headers['Content-Type'] = mimetype
-        return response
+        filename, mimetype = EXPORT_FILES[export_format]
+
+        if self.export_cache is None:
+            flashcard_deck = self.task_service.get_task_result(task_id)
+            chunks = self.flashcard_service.stream_flashcard_deck(flashcard_deck, export_format, compress)
+            return Response(chunks, mimetype=mimetype, headers={'Content-Disposition': f'attachment; filename={filename}'})
+        return self.send_artifact(self.get_artifact(task_id, export_format, compress), filename, mimetype)
+
+    def get_artifact(self, task_id: str, export_format: ExportFormat, compress: bool) -> ExportArtifact:
+        """
+        Get the exported deck of a task from the export cache, export the deck into the cache on a miss.
+        """
+        # The uncompressed zip file is a different artifact
+        cache_format = f'stored.{export_format.value}' if export_format == ExportFormat.csv_zip and not compress else export_format.value
+        artifact = self.export_cache.get(task_id, cache_format)
+        if artifact is None:
+            flashcard_deck = self.task_service.get_task_result(task_id)
+            artifact = self.export_cache.set(task_id, cache_format,
+                                             self.flashcard_service.stream_flashcard_deck(flashcard_deck, export_format, compress))
+        return artifact
+
+    def send_artifact(self, artifact: ExportArtifact, filename: str, mimetype: str) -> Response:
+        if artifact.path is not None and self.offload == 'x-accel-redirect':
+            # nginx sends the file from an internal location and answers conditional and range requests itself
+            response = Response(mimetype=mimetype, headers={
+                'X-Accel-Redirect': self.x_accel_redirect_location.rstrip('/') + '/' + os.path.basename(artifact.path),
+                'Content-Disposition': f'attachment; filename={filename}',
+            })
+            response.set_etag(artifact.etag)
+            response.last_modified = artifact.last_modified
+            return response.make_conditional(request)
+        # Without max_age the response is revalidated on every download, which the ETag answers with 304
+        return send_file(artifact.path if artifact.path is not None else BytesIO(artifact.data), mimetype=mimetype,
+                         as_attachment=True, download_name=filename, conditional=True, etag=artifact.etag,
+                         last_modified=artifact.last_modified)
@@ -0,0 +1,110 @@
+# src/rest/resources/flashcard_generator_events_resource.py
+import json
+from typing import Iterator, Optional
+
+import structlog
+from flask import Response, stream_with_context
+from flask_restful import Resource
+from humps import camelize
+
+from src.dtos.generator_task_info import GeneratorTaskInfoDto
+from src.enums.task_states import TERMINAL_STATES, TaskState
+from src.rest.resources.flashcard_generator_resource import create_task_info_dto
+from src.services.partial_result_service.partial_result_store_interface import IPartialResultStore
+from src.services.progress_service.progress_broker_interface import IProgressBroker, ProgressSubscription
+from src.services.task_service.task_service_interface import ITaskService
+
+# Configure logging
+logger = structlog.get_logger(__name__)
+
+
+class FlashcardGeneratorEventsResource(Resource):
+    """
+    API resource streaming the progress of a flashcard generation task as server-sent events, instead of the client polling
+    the task status.
+
+    The stream starts with the current task info, including all partial flashcards, and then pushes every progress event of
+    the task as it is published by the worker, so the task backend is only read once per connection. Progress events only
+    carry the flashcards added since the previous event ('newFlashcards') and the total count ('partialFlashcardsCount'). If
+    a client reads slower than the events are published and events are dropped, the current task info is sent again instead.
+    Each event has the type 'progress', 'success', 'failure' or 'revoked' and carries the camelized task info as JSON, the
+    'success' event includes the retrieval token. The stream ends after the outcome of the task, while the task runs comment
+    lines are sent every `heartbeat_sec` seconds.
+    """
+
+    def __init__(self, task_service: ITaskService, progress_broker: IProgressBroker, heartbeat_sec: float = 15,
+                 partial_result_store: Optional[IPartialResultStore] = None):
+        self.task_service = task_service
+        self.progress_broker = progress_broker
+        self.heartbeat_sec = heartbeat_sec
+        self.partial_result_store = partial_result_store
+
+    # flashcards/generator/<task_id>/events
+    def get(self, task_id):
+        """
+        Stream the progress of the flashcard generation task.
+        Parameters
+        ----------
+        task_id
+            The ID of the task.
+        Returns
+        -------
+        Response
+            The event stream (text/event-stream).
+
+        Raises
+        ------
+        TaskNotFoundError
+            If the task was revoked.
+        Exception
+            The error of the task, if it failed before the client connected.
+        """
+        logger.info("Received task events request", task_id=task_id)
+        # Subscribe before reading the task info, so no event is missed in between
+        subscription = self.progress_broker.subscribe(task_id)
+        try:
+            task_info_dto = create_task_info_dto(self.task_service, task_id, self.partial_result_store)
+        except BaseException:
+            subscription.close()
+            raise
+        return Response(stream_with_context(self.stream_events(subscription, task_info_dto)), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    def stream_events(self, subscription: ProgressSubscription, task_info_dto: GeneratorTaskInfoDto) -> Iterator[str]:
+        try:
+            while True:
+                # The current task info is sent on connect and again after events were dropped by the subscription
+                yield format_event(task_info_dto.task_state, camelize(task_info_dto.model_dump(mode='json')))
+                if task_info_dto.task_state in TERMINAL_STATES:
+                    return
+                known_flashcards = len(task_info_dto.partial_flashcards or [])
+                while True:
+                    event = subscription.get(self.heartbeat_sec)
+                    if event is None:
+                        # Writing to a disconnected client fails, which closes the subscription
+                        yield ': heartbeat\n\n'
+                        continue
+                    task_state = TaskState(event['task_state'])
+                    # The outcome of the task needs no earlier event, the flashcards are retrieved with the result
+                    if subscription.take_missed() and task_state not in TERMINAL_STATES:
+                        logger.info("Task events were dropped, resending the task info", task_id=subscription.task_id)
+                        task_info_dto = create_task_info_dto(self.task_service, subscription.task_id, self.partial_result_store)
+                        break
+                    if task_state == TaskState.success:
+                        event['retrieval_token'] = self.task_service.generate_retrieval_token(subscription.task_id)
+                    elif 'new_flashcards' in event:
+                        # Skip the flashcards already sent, the task info read on connect may include some of them
+                        first_flashcard = event['partial_flashcards_count'] - len(event['new_flashcards'])
+                        event['new_flashcards'] = event['new_flashcards'][max(0, known_flashcards - first_flashcard):]
+                        known_flashcards = max(known_flashcards, event['partial_flashcards_count'])
+                    yield format_event(task_state, camelize(event))
+                    if task_state in TERMINAL_STATES:
+                        logger.info("Task events stream completed", task_id=subscription.task_id, task_state=task_state.value)
+                        return
+        finally:
+            subscription.close()
+
+
+def format_event(task_state: TaskState, data: dict) -> str:
+    event_type = 'progress' if task_state not in TERMINAL_STATES else task_state.value.lower()
+    return f'event: {event_type}\ndata: {json.dumps(data)}\n\n'
@@ -1,4 +1,5 @@
 # src/rest/resources/flashcard_generator_resource.py
+from typing import Optional
 
 import structlog
 from flask import request, jsonify
@@ -9,6 +10,7 @@ from src.custom_exceptions.external_exceptions import TaskNotFoundError
 from src.dtos.generator_task import FlashcardGeneratorTaskDto
 from src.dtos.generator_task_info import GeneratorTaskInfoDto
 from src.enums.task_states import TaskState
+from src.services.partial_result_service.partial_result_store_interface import IPartialResultStore
 from src.services.task_service.task_service_interface import ITaskService
 from src.utils.formatting_util import truncate_text
 
@@ -23,8 +25,9 @@ class FlashcardGeneratorResource(Resource):
     This resource handles POST requests to initiate flashcard generation tasks.
     """
 
-    def __init__(self, task_service: ITaskService):
+    def __init__(self, task_service: ITaskService, partial_result_store: Optional[IPartialResultStore] = None):
         self.task_service = task_service
+        self.partial_result_store = partial_result_store
 
     # flashcards/generator
     def post(self):
@@ -68,17 +71,23 @@ class FlashcardGeneratorResource(Resource):
     def get(self, task_id):
         """
         Get the current progress or result of the flashcard generation task.
+        The response carries an ETag of the task info, so a poll with the ETag of the previous response is answered with 304
+        and without a body while the progress is unchanged.
         """
         logger.info("Received task status request", task_id=task_id)
-        task_response_dto = create_task_info_dto(self.task_service, task_id)
+        task_response_dto = create_task_info_dto(self.task_service, task_id, self.partial_result_store)
         response = jsonify(camelize(task_response_dto.dict()))
         if task_response_dto.task_state == TaskState.success:
             response.status_code = 200
         else:
             # Task did not complete yet, errors are handle by flask_error_handlers.py
             response.status_code = 202
-        logger.info("Returning task status", task_id=task_id, task_response_dto=task_response_dto)
-        return response
+        response.add_etag()
+        # Clients and proxies must revalidate the status on every poll
+        response.cache_control.no_cache = True
+        logger.info("Returning task status", task_id=task_id, task_state=task_response_dto.task_state.value,
+                    current_batch=task_response_dto.current_batch, total_batches=task_response_dto.total_batches)
+        return response.make_conditional(request)
 
     # flashcards/generator/<task_id>
     def delete(self, task_id):
@@ -95,19 +104,25 @@ class FlashcardGeneratorResource(Resource):
         return {"message": "Cancellation successful"}, 200
 
 
-def create_task_info_dto(task_service: ITaskService, task_id: str) -> GeneratorTaskInfoDto:
-    task_state = task_service.get_task_state(task_id)
-    task_info = task_service.get_task_info(task_id)
+def create_task_info_dto(task_service: ITaskService, task_id: str,
+                         partial_result_store: Optional[IPartialResultStore] = None) -> GeneratorTaskInfoDto:
+    task_state, task_info, _ = task_service.get_task_status(task_id)
     current_batch = task_info.get('current_batch', None)
     total_batches = task_info.get('total_batches', None)
+    partial_flashcards_count = task_info.get('partial_flashcards_count', None)
+    partial_flashcards = None
+    if partial_result_store is not None and partial_flashcards_count is not None:
+        partial_flashcards = partial_result_store.load(task_id)
 
     task_info_dto = GeneratorTaskInfoDto(
         task_state=task_state,
         current_batch=current_batch,
-        total_batches=total_batches)
+        total_batches=total_batches,
+        partial_flashcards_count=partial_flashcards_count,
+        partial_flashcards=partial_flashcards)
     if task_state == TaskState.success:
         retrieval_token = task_service.generate_retrieval_token(task_id)
         task_info_dto.retrieval_token = retrieval_token
-    elif task_state == 'REVOKED':
+    elif task_state == TaskState.revoked:
         raise TaskNotFoundError(f"Task with ID {task_id} was revoked")
     return task_info_dto
@@ -0,0 +1,64 @@
+# src/rest/resources/flashcard_generator_status_resource.py
+
+import structlog
+from flask import request, jsonify
+from flask_restful import Resource
+from humps import decamelize, camelize
+
+from src.custom_exceptions.external_exceptions import ValidationError
+from src.services.task_service.task_service_interface import ITaskService, TaskStatus
+
+# Configure logging
+logger = structlog.get_logger(__name__)
+
+MAX_TASK_IDS = 1000
+
+
+class FlashcardGeneratorStatusResource(Resource):
+    """
+    API resource for the status of many flashcard generation tasks at once, e.g. for dashboards tracking a batch of tasks.
+
+    The statuses of all tasks are read from the task backend in a single round trip, instead of one request per task.
+    """
+
+    def __init__(self, task_service: ITaskService):
+        self.task_service = task_service
+
+    # flashcards/generator/status
+    def post(self):
+        """
+        Get the state and progress of the requested flashcard generation tasks.
+        The request body contains the list of task IDs in the field 'taskIds', at most MAX_TASK_IDS.
+        Returns
+        -------
+        Response
+            JSON response with the field 'tasks', a list with the ID, state and progress (or error) of each task in the
+            order of the request. The partial flashcards are not included.
+
+        Raises
+        ------
+        ValidationError
+            If the task IDs are missing, not a list of strings, or too many.
+        """
+        json_data = decamelize(request.get_json(force=True))
+        task_ids = json_data.get('task_ids') if isinstance(json_data, dict) else None
+        if not isinstance(task_ids, list) or not all(isinstance(task_id, str) for task_id in task_ids):
+            raise ValidationError("The task IDs must be a list of strings")
+        if len(task_ids) > MAX_TASK_IDS:
+            raise ValidationError(f"At most {MAX_TASK_IDS} task IDs can be requested at once")
+        logger.info("Received bulk task status request", number_tasks=len(task_ids))
+        task_statuses = self.task_service.get_task_statuses(task_ids)
+        # Task IDs are values, not keys, so camelize does not alter them
+        response = jsonify(camelize({'tasks': [create_compact_status(task_id, task_statuses[task_id]) for task_id in task_ids]}))
+        response.status_code = 200
+        return response
+
+
+def create_compact_status(task_id: str, task_status: TaskStatus) -> dict:
+    compact_status = {'task_id': task_id, 'task_state': task_status.state.value}
+    if task_status.error is not None:
+        compact_status['error'] = str(task_status.error)
+    for field in ['current_batch', 'total_batches']:
+        if task_status.info.get(field) is not None:
+            compact_status[field] = task_status.info[field]
+    return compact_status
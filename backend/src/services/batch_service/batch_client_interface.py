@@ -0,0 +1,97 @@
+# src/services/batch_service/batch_client_interface.py
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import structlog
+from openai.types.chat import ChatCompletion
+
+logger = structlog.get_logger(__name__)
+
+# Status of a batch once it will not change anymore (the remaining states are in progress)
+TERMINAL_BATCH_STATES = ['completed', 'failed', 'expired', 'cancelled']
+
+
+class IBatchClient(ABC):
+    """
+    Interface for clients of an asynchronous batch endpoint for chat completion requests, such as the OpenAI Batch API.
+    """
+
+    @abstractmethod
+    def submit(self, requests: List[dict]) -> str:
+        """
+        Submit a batch of chat completion requests.
+
+        Parameters
+        ----------
+        requests : List[dict]
+            The requests of the batch, created with `create_batch_request`.
+
+        Returns
+        -------
+        str
+            The ID of the batch.
+        """
+        pass
+
+    @abstractmethod
+    def get_status(self, batch_id: str) -> str:
+        """
+        Get the status of a batch, one of the statuses of the OpenAI Batch API (e.g. 'in_progress', 'completed', 'expired').
+        """
+        pass
+
+    @abstractmethod
+    def get_results(self, batch_id: str) -> Dict[str, Optional[ChatCompletion]]:
+        """
+        Get the results of a batch that reached a terminal status.
+
+        Returns
+        -------
+        Dict[str, Optional[ChatCompletion]]
+            The completion of each request by custom ID, None for failed requests. Requests that were not processed (e.g. because
+            the batch expired) are missing.
+        """
+        pass
+
+
+def create_batch_request(custom_id: str, body: dict) -> dict:
+    """
+    Create a line of the JSONL input file of a batch of chat completion requests.
+
+    Parameters
+    ----------
+    custom_id : str
+        The ID of the request, used to match the result to the request.
+    body : dict
+        The body of the chat completion request.
+    """
+    return {'custom_id': custom_id, 'method': 'POST', 'url': '/v1/chat/completions', 'body': body}
+
+
+def parse_batch_output(output: str) -> Dict[str, Optional[ChatCompletion]]:
+    """
+    Parse the JSONL output file of a batch of chat completion requests.
+
+    Parameters
+    ----------
+    output : str
+        The content of the output file.
+
+    Returns
+    -------
+    Dict[str, Optional[ChatCompletion]]
+        The completion of each request by custom ID, None for failed requests.
+    """
+    results = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get('response') or {}
+        if result.get('error') or response.get('status_code') != 200:
+            logger.warning("Batch request failed", custom_id=result['custom_id'], error=result.get('error') or response.get('body'))
+            results[result['custom_id']] = None
+        else:
+            results[result['custom_id']] = ChatCompletion.model_validate(response['body'])
+    return results
@@ -0,0 +1,69 @@
+# src/services/batch_service/local_batch_client.py
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import openai
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+
+from src.services.batch_service.batch_client_interface import IBatchClient, parse_batch_output
+
+
+class LocalBatchClient(IBatchClient):
+    """
+    File-based stand-in for the OpenAI Batch API, for development and tests.
+
+    Batches are written to `batch_dir` in the JSONL format of the Batch API. A batch is processed synchronously with regular
+    chat completion requests the first time its status is polled, and its results are written to an output file in the
+    format of the Batch API.
+
+    Parameters
+    ----------
+    batch_dir : str
+        The directory the input and output files of the batches are written to.
+    client : OpenAI
+        The (possibly fake) OpenAI client answering the requests.
+    """
+
+    def __init__(self, batch_dir: str, client: OpenAI):
+        self.batch_dir = Path(batch_dir)
+        self.client = client
+
+    def _input_path(self, batch_id: str) -> Path:
+        return self.batch_dir / f'{batch_id}_input.jsonl'
+
+    def _output_path(self, batch_id: str) -> Path:
+        return self.batch_dir / f'{batch_id}_output.jsonl'
+
+    def submit(self, requests: List[dict]) -> str:
+        batch_id = f'batch_{uuid.uuid4().hex}'
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        self._input_path(batch_id).write_text('\n'.join(json.dumps(request, ensure_ascii=False) for request in requests), encoding='utf-8')
+        return batch_id
+
+    def get_status(self, batch_id: str) -> str:
+        if not self._output_path(batch_id).exists():
+            self._process(batch_id)
+        return 'completed'
+
+    def get_results(self, batch_id: str) -> Dict[str, Optional[ChatCompletion]]:
+        return parse_batch_output(self._output_path(batch_id).read_text(encoding='utf-8'))
+
+    def _process(self, batch_id: str) -> None:
+        output_lines = []
+        for line in self._input_path(batch_id).read_text(encoding='utf-8').splitlines():
+            request = json.loads(line)
+            result = {'id': f'batch_req_{uuid.uuid4().hex}', 'custom_id': request['custom_id'], 'response': None, 'error': None}
+            try:
+                completion = self.client.chat.completions.create(**request['body'])
+                result['response'] = {'status_code': 200, 'body': completion.model_dump(mode='json')}
+            except openai.APIStatusError as e:
+                result['response'] = {'status_code': e.status_code, 'body': {'error': {'message': str(e)}}}
+            output_lines.append(json.dumps(result, ensure_ascii=False))
+        # The output file is written at once, so a batch is either processed completely or not at all
+        temp_path = self._output_path(batch_id).with_suffix('.tmp')
+        temp_path.write_text('\n'.join(output_lines), encoding='utf-8')
+        os.replace(temp_path, self._output_path(batch_id))
@@ -0,0 +1,45 @@
+# src/services/batch_service/openai_batch_client.py
+import json
+from typing import Dict, List, Optional
+
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+
+from src.services.batch_service.batch_client_interface import IBatchClient, parse_batch_output
+
+
+class OpenAIBatchClient(IBatchClient):
+    """
+    Client of the OpenAI Batch API. Requests are uploaded as JSONL file and processed within the completion window at a
+    reduced price.
+
+    Parameters
+    ----------
+    client : OpenAI
+        The OpenAI client.
+    completion_window : str
+        The time frame within which the batch is processed.
+    """
+
+    def __init__(self, client: OpenAI, completion_window: str = '24h'):
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, requests: List[dict]) -> str:
+        input_jsonl = '\n'.join(json.dumps(request, ensure_ascii=False) for request in requests).encode('utf-8')
+        input_file = self.client.files.create(file=('quizard_batch.jsonl', input_jsonl), purpose='batch')
+        batch = self.client.batches.create(input_file_id=input_file.id, endpoint='/v1/chat/completions',
+                                           completion_window=self.completion_window)
+        return batch.id
+
+    def get_status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def get_results(self, batch_id: str) -> Dict[str, Optional[ChatCompletion]]:
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        # Failed requests are written to the error file, expired batches may have completed a part of the requests
+        for file_id in [batch.output_file_id, batch.error_file_id]:
+            if file_id is not None:
+                results.update(parse_batch_output(self.client.files.content(file_id).text))
+        return results
@@ -0,0 +1,76 @@
+# src/services/checkpoint_service/checkpoint_store_interface.py
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+
+
+class ICheckpointStore(ABC):
+    """
+    Interface for stores of the flashcards of finished fragments, so a restarted or retried task can skip them.
+
+    Checkpoints are grouped by task ID and address each fragment by the content of its request (see `create_cache_key`),
+    so a checkpoint is never applied to a different fragment, even if the text is split differently after a config change.
+    """
+
+    @abstractmethod
+    def load(self, task_id: str) -> Dict[str, List[Flashcard]]:
+        """
+        Load the checkpoints of a task.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+
+        Returns
+        -------
+        Dict[str, List[Flashcard]]
+            The flashcards of each finished fragment by fragment key, empty if the task has no (unexpired) checkpoints.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, task_id: str, fragment_key: str, flashcards: List[Flashcard]) -> None:
+        """
+        Save the flashcards of a finished fragment and renew the expiry of the checkpoints of the task.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+        fragment_key : str
+            The key of the fragment.
+        flashcards : List[Flashcard]
+            The flashcards parsed from the completion of the fragment.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, task_id: str) -> None:
+        """
+        Delete the checkpoints of a task, e.g. once its result was stored.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+        """
+        pass
+
+
+def serialize_flashcards(flashcards: List[Flashcard]) -> str:
+    """
+    Serialize flashcards to JSON.
+    """
+    return json.dumps([[flashcard.id, flashcard.type.value, flashcard.front_side, flashcard.back_side] for flashcard in flashcards],
+                      ensure_ascii=False)
+
+
+def deserialize_flashcards(value: str) -> List[Flashcard]:
+    """
+    Deserialize flashcards serialized with `serialize_flashcards`.
+    """
+    return [Flashcard(flashcard_id, FlashcardType(flashcard_type), front_side, back_side)
+            for flashcard_id, flashcard_type, front_side, back_side in json.loads(value)]
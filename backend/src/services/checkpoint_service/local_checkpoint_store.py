@@ -0,0 +1,46 @@
+# src/services/checkpoint_service/local_checkpoint_store.py
+import threading
+import time
+from typing import Dict, List
+
+from src.entities.flashcard.flashcard import Flashcard
+from src.services.checkpoint_service.checkpoint_store_interface import ICheckpointStore
+
+
+class LocalCheckpointStore(ICheckpointStore):
+    """
+    In-process checkpoint store. Checkpoints survive retries of a task within the same worker process, but not a restart of
+    the worker.
+
+    Parameters
+    ----------
+    ttl_sec : int
+        Time in seconds after the last save after which the checkpoints of a task expire.
+    """
+
+    def __init__(self, ttl_sec: int):
+        self.ttl_sec = ttl_sec
+        self._checkpoints: Dict[str, tuple[float, Dict[str, List[Flashcard]]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, task_id: str) -> Dict[str, List[Flashcard]]:
+        with self._lock:
+            self._collect_garbage()
+            entry = self._checkpoints.get(task_id)
+            return dict(entry[1]) if entry is not None else {}
+
+    def save(self, task_id: str, fragment_key: str, flashcards: List[Flashcard]) -> None:
+        with self._lock:
+            entry = self._checkpoints.get(task_id)
+            fragments = entry[1] if entry is not None else {}
+            fragments[fragment_key] = list(flashcards)
+            self._checkpoints[task_id] = (time.monotonic() + self.ttl_sec, fragments)
+
+    def delete(self, task_id: str) -> None:
+        with self._lock:
+            self._checkpoints.pop(task_id, None)
+
+    def _collect_garbage(self) -> None:
+        now = time.monotonic()
+        for task_id in [task_id for task_id, (expires_at, _) in self._checkpoints.items() if expires_at <= now]:
+            del self._checkpoints[task_id]
@@ -0,0 +1,56 @@
+# src/services/checkpoint_service/redis_checkpoint_store.py
+from typing import Dict, List
+
+import structlog
+from redis import Redis
+
+from src.entities.flashcard.flashcard import Flashcard
+from src.services.checkpoint_service.checkpoint_store_interface import ICheckpointStore, serialize_flashcards, \
+    deserialize_flashcards
+
+logger = structlog.get_logger(__name__)
+
+
+class RedisCheckpointStore(ICheckpointStore):
+    """
+    Checkpoint store shared by all workers, backed by Redis.
+
+    The checkpoints of a task are stored in one hash with a field per fragment. The hash expires `ttl_sec` after the last
+    save, so checkpoints of tasks that are never resumed are garbage-collected by Redis.
+
+    Parameters
+    ----------
+    redis_client : Redis
+        The Redis client.
+    ttl_sec : int
+        Time in seconds after the last save after which the checkpoints of a task expire.
+    key_prefix : str
+        Prefix of all Redis keys used by the store.
+    """
+
+    def __init__(self, redis_client: Redis, ttl_sec: int, key_prefix: str = 'quizard:checkpoint'):
+        self.redis_client = redis_client
+        self.ttl_sec = ttl_sec
+        self._key_prefix = key_prefix
+
+    def _task_key(self, task_id: str) -> str:
+        return f'{self._key_prefix}:{task_id}'
+
+    def load(self, task_id: str) -> Dict[str, List[Flashcard]]:
+        checkpoints = {}
+        for fragment_key, value in self.redis_client.hgetall(self._task_key(task_id)).items():
+            try:
+                checkpoints[fragment_key.decode()] = deserialize_flashcards(value)
+            except (ValueError, TypeError) as e:
+                # Invalid checkpoints are ignored, the fragment is generated again
+                logger.warning("Invalid checkpoint", task_id=task_id, error=str(e))
+        return checkpoints
+
+    def save(self, task_id: str, fragment_key: str, flashcards: List[Flashcard]) -> None:
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.hset(self._task_key(task_id), fragment_key, serialize_flashcards(flashcards))
+        pipeline.expire(self._task_key(task_id), self.ttl_sec)
+        pipeline.execute()
+
+    def delete(self, task_id: str) -> None:
+        self.redis_client.delete(self._task_key(task_id))
@@ -0,0 +1,79 @@
+# src/services/completion_cache_service/completion_cache_interface.py
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from openai.types.chat import ChatCompletion
+
+
+class ICompletionCache(ABC):
+    """
+    Interface for caches of completion responses, addressed by the content of the request (see `create_cache_key`).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        """
+        Get a cached completion and count the lookup as hit or miss.
+
+        Parameters
+        ----------
+        key : str
+            The cache key of the request.
+
+        Returns
+        -------
+        Optional[ChatCompletion]
+            The cached completion, or None if the request is not cached or the entry expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, completion: ChatCompletion) -> None:
+        """
+        Cache a completion, evicting the least recently used entries if the cache is full.
+
+        Parameters
+        ----------
+        key : str
+            The cache key of the request.
+        completion : ChatCompletion
+            The completion response to cache.
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns
+        -------
+        dict
+            A dictionary with the number of 'hits' and 'misses'.
+        """
+        pass
+
+
+def create_cache_key(model_config: dict, max_tokens: int, message_list: list) -> str:
+    """
+    Create the content-addressed cache key of a completion request.
+
+    Parameters
+    ----------
+    model_config : dict
+        The model configuration used for the request (model name, temperature, ...).
+    max_tokens : int
+        The maximum number of tokens to generate.
+    message_list : list
+        The messages of the request, each message being a dictionary with 'role' and 'content'.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the canonical JSON representation of the request.
+    """
+    request = {'model_config': model_config, 'max_tokens': max_tokens, 'messages': message_list}
+    canonical_request = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
@@ -0,0 +1,55 @@
+# src/services/completion_cache_service/local_completion_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from openai.types.chat import ChatCompletion
+
+from src.services.completion_cache_service.completion_cache_interface import ICompletionCache
+
+
+class LocalCompletionCache(ICompletionCache):
+    """
+    In-process LRU cache of completions with a time to live.
+    Completions are kept as objects, so hits are answered without any I/O or deserialization.
+
+    Parameters
+    ----------
+    ttl_sec : int
+        Time in seconds after which an entry expires.
+    max_entries : int
+        Maximum number of cached completions, the least recently used entry is evicted beyond that.
+    """
+
+    def __init__(self, ttl_sec: int, max_entries: int):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, ChatCompletion]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: str, completion: ChatCompletion) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_sec, completion)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses}
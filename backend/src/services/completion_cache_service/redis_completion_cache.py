@@ -0,0 +1,76 @@
+# src/services/completion_cache_service/redis_completion_cache.py
+import time
+from typing import Optional
+
+import structlog
+from openai.types.chat import ChatCompletion
+from redis import Redis
+
+from src.services.completion_cache_service.completion_cache_interface import ICompletionCache
+
+logger = structlog.get_logger(__name__)
+
+
+class RedisCompletionCache(ICompletionCache):
+    """
+    Completion cache shared by all workers, backed by Redis.
+
+    Every entry expires after `ttl_sec`. In addition, a sorted set indexes the entries by their last use, so the least
+    recently used entries are evicted once more than `max_entries` completions are cached.
+
+    Parameters
+    ----------
+    redis_client : Redis
+        The Redis client.
+    ttl_sec : int
+        Time in seconds after which an entry expires.
+    max_entries : int
+        Maximum number of cached completions.
+    key_prefix : str
+        Prefix of all Redis keys used by the cache.
+    """
+
+    def __init__(self, redis_client: Redis, ttl_sec: int, max_entries: int, key_prefix: str = 'quizard:completion_cache'):
+        self.redis_client = redis_client
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._key_prefix = key_prefix
+        self._index_key = f'{key_prefix}:index'
+        self._stats_key = f'{key_prefix}:stats'
+
+    def _entry_key(self, key: str) -> str:
+        return f'{self._key_prefix}:{key}'
+
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.get(self._entry_key(key))
+        # Refreshes the position in the LRU index, a stale index entry is removed with the next eviction
+        pipeline.zadd(self._index_key, {key: time.time()}, xx=True)
+        value, _ = pipeline.execute()
+        self.redis_client.hincrby(self._stats_key, 'hits' if value is not None else 'misses', 1)
+        if value is None:
+            return None
+        try:
+            return ChatCompletion.model_validate_json(value)
+        except ValueError as e:
+            # Entries written by an incompatible version of the OpenAI library are treated as misses
+            logger.warning("Invalid completion cache entry", key=key, error=str(e))
+            return None
+
+    def set(self, key: str, completion: ChatCompletion) -> None:
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.set(self._entry_key(key), completion.model_dump_json(), ex=self.ttl_sec)
+        pipeline.zadd(self._index_key, {key: time.time()})
+        pipeline.zcard(self._index_key)
+        entry_count = pipeline.execute()[-1]
+        if entry_count > self.max_entries:
+            self._evict(entry_count - self.max_entries)
+
+    def _evict(self, count: int) -> None:
+        evicted = self.redis_client.zpopmin(self._index_key, count)
+        if evicted:
+            self.redis_client.delete(*[self._entry_key(key.decode()) for key, _ in evicted])
+
+    def get_stats(self) -> dict:
+        stats = self.redis_client.hgetall(self._stats_key)
+        return {'hits': int(stats.get(b'hits', 0)), 'misses': int(stats.get(b'misses', 0))}
@@ -0,0 +1,107 @@
+# src/services/export_cache_service/disk_export_cache.py
+import os
+import tempfile
+import threading
+import time
+from typing import Iterable, Optional
+
+from src.services.export_cache_service.export_cache_interface import ExportArtifact, IExportCache
+
+
+class DiskExportCache(IExportCache):
+    """
+    Cache of exported decks in a local directory, shared by all worker processes of the host.
+
+    Artifacts are written to their files chunk by chunk and served from them (with sendfile or by the reverse proxy), so an
+    export never holds the artifact in memory. Files are written atomically; the access time of a file is its last use, the least recently
+    used files are evicted if the directory grows beyond the maximum size. The counters are per process.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory of the artifacts, created if it does not exist.
+    ttl_sec : int
+        Time in seconds after which an artifact expires.
+    max_bytes : int
+        Maximum total size of the cached artifacts.
+    """
+
+    def __init__(self, cache_dir: str, ttl_sec: int, max_bytes: int):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, task_id: str, export_format: str) -> Optional[ExportArtifact]:
+        path = self._get_path(task_id, export_format)
+        try:
+            stat = os.stat(path)
+            if stat.st_mtime + self.ttl_sec <= time.time():
+                os.remove(path)
+                stat = None
+            else:
+                # The access time is set explicitly, it is not updated on reads on filesystems mounted with noatime
+                os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except FileNotFoundError:
+            stat = None
+        with self._lock:
+            if stat is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return self._create_artifact(path, stat)
+
+    def set(self, task_id: str, export_format: str, chunks: Iterable[bytes]) -> ExportArtifact:
+        path = self._get_path(task_id, export_format)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                for chunk in chunks:
+                    file.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        artifact = self._create_artifact(path, os.stat(path))
+        self._evict(keep=path)
+        return artifact
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses}
+
+    def _get_path(self, task_id: str, export_format: str) -> str:
+        # Task IDs are UUIDs taken from signed retrieval tokens, the formats are ExportFormat values
+        return os.path.join(self.cache_dir, f'{task_id}.{export_format}')
+
+    @staticmethod
+    def _create_artifact(path: str, stat: os.stat_result) -> ExportArtifact:
+        return ExportArtifact(f'{stat.st_mtime_ns:x}-{stat.st_size:x}', stat.st_size, stat.st_mtime, path=path)
+
+    def _evict(self, keep: str) -> None:
+        files = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('.tmp-'):
+                    # Being written by another process
+                    continue
+                try:
+                    stat = entry.stat()
+                    files.append((stat.st_atime, stat.st_size, entry.path))
+                except FileNotFoundError:
+                    # Removed by another process
+                    pass
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
@@ -0,0 +1,95 @@
+# src/services/export_cache_service/export_cache_interface.py
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, NamedTuple, Optional
+
+
+class ExportArtifact(NamedTuple):
+    """
+    An exported flashcard deck, kept either in memory or in a file.
+
+    Attributes
+    ----------
+    etag : str
+        The entity tag of the artifact, changes whenever the artifact is rebuilt.
+    size : int
+        The size of the artifact in bytes.
+    last_modified : float
+        The time the artifact was built, as UNIX timestamp.
+    data : Optional[bytes]
+        The content of an artifact kept in memory.
+    path : Optional[str]
+        The path of an artifact kept in a file.
+    """
+    etag: str
+    size: int
+    last_modified: float
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+
+def create_artifact(data: bytes) -> ExportArtifact:
+    """
+    Create an in-memory artifact, with an entity tag derived from its content.
+    """
+    return ExportArtifact(hashlib.blake2b(data, digest_size=16).hexdigest(), len(data), time.time(), data=data)
+
+
+class IExportCache(ABC):
+    """
+    Interface for caches of exported flashcard decks, addressed by task ID and export format. The result of a task never
+    changes, so an artifact is only built on the first export of a deck in a format.
+    """
+
+    @abstractmethod
+    def get(self, task_id: str, export_format: str) -> Optional[ExportArtifact]:
+        """
+        Get a cached artifact and count the lookup as hit or miss.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task that generated the deck.
+        export_format : str
+            The export format of the artifact.
+
+        Returns
+        -------
+        Optional[ExportArtifact]
+            The cached artifact, or None if it is not cached or expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, task_id: str, export_format: str, chunks: Iterable[bytes]) -> ExportArtifact:
+        """
+        Cache an artifact written in chunks, evicting the least recently used artifacts if the cache is full.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task that generated the deck.
+        export_format : str
+            The export format of the artifact.
+        chunks : Iterable[bytes]
+            The chunks of the exported deck.
+
+        Returns
+        -------
+        ExportArtifact
+            The cached artifact.
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns
+        -------
+        dict
+            A dictionary with the number of 'hits' and 'misses'.
+        """
+        pass
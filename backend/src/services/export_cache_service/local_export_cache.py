@@ -0,0 +1,64 @@
+# src/services/export_cache_service/local_export_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from src.services.export_cache_service.export_cache_interface import ExportArtifact, IExportCache, create_artifact
+
+
+class LocalExportCache(IExportCache):
+    """
+    In-process LRU cache of exported decks with a time to live, bounded by the total size of the artifacts.
+
+    Parameters
+    ----------
+    ttl_sec : int
+        Time in seconds after which an artifact expires.
+    max_bytes : int
+        Maximum total size of the cached artifacts, the least recently used artifacts are evicted beyond that.
+    """
+
+    def __init__(self, ttl_sec: int, max_bytes: int):
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[float, ExportArtifact]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, task_id: str, export_format: str) -> Optional[ExportArtifact]:
+        key = (task_id, export_format)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, task_id: str, export_format: str, chunks: Iterable[bytes]) -> ExportArtifact:
+        key = (task_id, export_format)
+        artifact = create_artifact(b''.join(chunks))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_sec, artifact)
+            self._size += artifact.size
+            # An artifact larger than the cache is still returned, but not kept
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return artifact
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses}
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        _, artifact = self._entries.pop(key)
+        self._size -= artifact.size
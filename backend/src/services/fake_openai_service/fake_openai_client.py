@@ -0,0 +1,201 @@
+# src/services/fake_openai_service/fake_openai_client.py
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Iterator, List, Optional, Union
+
+import openai
+import structlog
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from src.custom_exceptions.internal_exceptions import ConfigInvalidValueError
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import ModelProfile, get_model_profile
+
+logger = structlog.get_logger(__name__)
+
+# Profile used for models without a registered profile
+_FALLBACK_PROFILE = ModelProfile('fake', context_window=128_000, max_output_tokens=16_384, encoding_name='cl100k_base')
+# Number of tokens per streamed chunk (the API sends roughly one token per chunk, a few keep the overhead of the fake low)
+_TOKENS_PER_CHUNK = 4
+_WORD_PATTERN = re.compile(r'[^\W\d_]{5,}')
+
+
+class FakeOpenAI:
+    """
+    Stand-in for the OpenAI client that answers chat completion requests locally, for load and latency tests without API costs.
+
+    Completions consist of well-formed flashcards about words of the input text, as lines or, if a JSON schema response format
+    is requested, as structured output. Their usage is counted with the encoding of the
+    requested model, so token budgets, rate limits and metrics behave as with the real API. The latency is the time to the first
+    token, drawn from a log-normal distribution, plus the generation time of the completion tokens. Requests fail with
+    configurable probabilities with 429 or 5xx errors, and with a timeout if they would take longer than the request timeout.
+
+    Only `chat.completions.create` is implemented (streamed and non-streamed).
+
+    Parameters
+    ----------
+    ttft_median_sec : float
+        The median time to the first token in seconds.
+    ttft_sigma : float
+        The standard deviation of the logarithm of the time to the first token (0 = constant latency).
+    tokens_per_sec : float
+        The generation speed after the first token.
+    flashcards_per_completion : int
+        The number of flashcards per completion (fewer if the input text has fewer distinct words).
+    rate_limit_error_rate : float
+        The probability of a request failing with a 429 error.
+    server_error_rate : float
+        The probability of a request failing with a 500 error.
+    retry_after_sec : float
+        The delay sent in the Retry-After header of 429 errors.
+    seed : Optional[int]
+        The seed of the random number generator, for reproducible runs.
+    """
+
+    def __init__(self, ttft_median_sec: float = 0.5, ttft_sigma: float = 0.5, tokens_per_sec: float = 60.0,
+                 flashcards_per_completion: int = 8, rate_limit_error_rate: float = 0.0, server_error_rate: float = 0.0,
+                 retry_after_sec: float = 1.0, seed: Optional[int] = None):
+        if rate_limit_error_rate + server_error_rate > 1:
+            raise ConfigInvalidValueError("The error rates of the fake OpenAI client must not exceed 1 in total.")
+        self.ttft_median_sec = ttft_median_sec
+        self.ttft_sigma = ttft_sigma
+        self.tokens_per_sec = tokens_per_sec
+        self.flashcards_per_completion = flashcards_per_completion
+        self.rate_limit_error_rate = rate_limit_error_rate
+        self.server_error_rate = server_error_rate
+        self.retry_after_sec = retry_after_sec
+        self._random = random.Random(seed)
+        # Random numbers are drawn under a lock, so concurrent requests of a seeded run draw the same sequence
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create_chat_completion))
+        logger.warning("Using the fake OpenAI client, completions are generated locally")
+
+    def create_chat_completion(self, *, model: str, messages: List[dict], max_tokens: Optional[int] = None, stream: bool = False,
+                               stream_options: Optional[dict] = None, timeout: Optional[float] = None,
+                               response_format: Optional[dict] = None, **kwargs) -> Union[ChatCompletion, Iterator[ChatCompletionChunk]]:
+        """
+        Create a chat completion, with the signature of `client.chat.completions.create`.
+        Other sampling parameters (temperature etc.) are accepted and ignored.
+
+        Raises
+        ------
+        openai.RateLimitError
+            With probability `rate_limit_error_rate`.
+        openai.InternalServerError
+            With probability `server_error_rate`.
+        openai.APITimeoutError
+            If the response (or, when streaming, the first token) would take longer than `timeout`.
+        """
+        with self._lock:
+            error_roll = self._random.random()
+            ttft_sec = self.ttft_median_sec * self._random.lognormvariate(0, self.ttft_sigma)
+            words = self._pick_words(messages[-1]['content'])
+
+        if error_roll < self.rate_limit_error_rate:
+            raise openai.RateLimitError("Rate limit reached (fake)", body=None,
+                                        response=_fake_response(429, {'retry-after': str(self.retry_after_sec)}))
+        if error_roll < self.rate_limit_error_rate + self.server_error_rate:
+            time.sleep(ttft_sec)
+            raise openai.InternalServerError("The server had an error while processing your request (fake)", body=None,
+                                             response=_fake_response(500))
+
+        try:
+            model_profile = get_model_profile(model)
+        except ConfigInvalidValueError:
+            model_profile = _FALLBACK_PROFILE
+        encoding = model_profile.get_encoding()
+        prompt_tokens = model_profile.reply_priming_tokens + model_profile.count_message_tokens(encoding, messages)
+
+        if response_format and response_format.get('type') == 'json_schema':
+            content = create_structured_flashcards(words)
+        else:
+            content = create_flashcard_lines(words)
+        tokens = encoding.encode(content)
+        finish_reason = 'stop'
+        if max_tokens is not None and len(tokens) > max_tokens:
+            # Cut the completion at the token limit like the API, possibly in the middle of a flashcard
+            _, offsets = encoding.decode_with_offsets(tokens)
+            content, tokens, finish_reason = content[:offsets[max_tokens]], tokens[:max_tokens], 'length'
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': len(tokens), 'total_tokens': prompt_tokens + len(tokens)}
+
+        generation_sec = len(tokens) / self.tokens_per_sec
+        completion_id = f'chatcmpl-fake-{uuid.uuid4().hex}'
+        if stream:
+            if timeout is not None and ttft_sec > timeout:
+                time.sleep(timeout)
+                raise openai.APITimeoutError(request=None)
+            _, offsets = encoding.decode_with_offsets(tokens)
+            pieces = [content[offsets[start]:offsets[start + _TOKENS_PER_CHUNK] if start + _TOKENS_PER_CHUNK < len(tokens) else None]
+                      for start in range(0, len(tokens), _TOKENS_PER_CHUNK)]
+            include_usage = bool(stream_options and stream_options.get('include_usage'))
+            return self._stream(completion_id, model, pieces, finish_reason, usage if include_usage else None, ttft_sec, generation_sec)
+
+        if timeout is not None and ttft_sec + generation_sec > timeout:
+            time.sleep(timeout)
+            raise openai.APITimeoutError(request=None)
+        time.sleep(ttft_sec + generation_sec)
+        return ChatCompletion(
+            id=completion_id, object='chat.completion', created=int(time.time()), model=model,
+            choices=[{'index': 0, 'finish_reason': finish_reason, 'message': {'role': 'assistant', 'content': content}}],
+            usage=usage
+        )
+
+    def _pick_words(self, input_text: str) -> List[str]:
+        # Distinct words in order of first occurrence, so the flashcards of a fragment are about its content
+        words = list(dict.fromkeys(word.lower() for word in _WORD_PATTERN.findall(input_text)))
+        if len(words) <= self.flashcards_per_completion:
+            return words
+        return self._random.sample(words, self.flashcards_per_completion)
+
+    @staticmethod
+    def _stream(completion_id: str, model: str, pieces: List[str], finish_reason: str, usage: Optional[dict], ttft_sec: float,
+                generation_sec: float) -> Iterator[ChatCompletionChunk]:
+        created = int(time.time())
+
+        def chunk(choices, **kwargs):
+            return ChatCompletionChunk(id=completion_id, object='chat.completion.chunk', created=created, model=model, choices=choices,
+                                       **kwargs)
+
+        time.sleep(ttft_sec)
+        yield chunk([{'index': 0, 'delta': {'role': 'assistant', 'content': ''}, 'finish_reason': None}])
+        for piece in pieces:
+            yield chunk([{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}])
+            time.sleep(generation_sec / len(pieces))
+        yield chunk([{'index': 0, 'delta': {}, 'finish_reason': finish_reason}])
+        if usage is not None:
+            yield chunk([], usage=usage)
+
+
+def _create_flashcards(words: List[str]) -> List[tuple]:
+    # Alternating definition and open-ended flashcards, as (prefix, front side, back side)
+    return [
+        ('Term', f"What is meant by '{word}'?", f"'{word}' is a key term of the text, defined by its context.") if index % 2 == 0 else
+        ('Concept', f"Explain the role of '{word}' in the text.", f"'{word}' connects the main ideas of the section.")
+        for index, word in enumerate(words)
+    ]
+
+
+def create_flashcard_lines(words: List[str]) -> str:
+    """
+    Create the completion content of flashcards about the given words, alternating definition and open-ended flashcards.
+    """
+    return '\n'.join(f"[{prefix}] {front}; {back}" for prefix, front, back in _create_flashcards(words))
+
+
+def create_structured_flashcards(words: List[str]) -> str:
+    """
+    Create the completion content of the same flashcards as `create_flashcard_lines` as structured output.
+    """
+    return json.dumps({'flashcards': [{'prefix': prefix, 'front': front, 'back': back}
+                                      for prefix, front, back in _create_flashcards(words)]})
+
+
+def _fake_response(status_code: int, headers: Optional[dict] = None) -> SimpleNamespace:
+    """
+    Create a minimal stand-in for the HTTP response the errors of the OpenAI SDK are constructed from.
+    """
+    return SimpleNamespace(request=None, status_code=status_code, headers=headers or {})
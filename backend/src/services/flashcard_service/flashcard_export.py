@@ -1,48 +1,137 @@
 import csv
+import hashlib
+import json
 import random
+import sqlite3
+import time
 import zipfile
-from io import StringIO, BytesIO
+from io import BytesIO, RawIOBase, StringIO
+from itertools import islice
+from typing import Iterator, List
 
-import genanki
+from genanki.apkg_col import APKG_COL
+from genanki.apkg_schema import APKG_SCHEMA
+from genanki.util import BASE91_TABLE
 from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
 
+# Number of flashcards per chunk of the streamed exports (a few dozen KB)
+CHUNK_FLASHCARDS = 500
+
+
+# Note type of the exported Anki decks, the same for every export, so importing several decks adds a single note type to the
+# collection. 'req' is the list of fields required by each template, computed by genanki from the templates
+_ANKI_MODEL_ID = 1607392319
+_ANKI_MODEL = {
+    'css': '',
+    'flds': [
+        {'name': name, 'ord': ord_, 'font': 'Liberation Sans', 'media': [], 'rtl': False, 'size': 20, 'sticky': False}
+        for ord_, name in enumerate(['Front', 'Back'])
+    ],
+    'id': str(_ANKI_MODEL_ID),
+    'latexPost': '\\end{document}',
+    'latexPre': '\\documentclass[12pt]{article}\n\\special{papersize=3in,5in}\n\\usepackage[utf8]{inputenc}\n'
+                '\\usepackage{amssymb,amsmath}\n\\pagestyle{empty}\n\\setlength{\\parindent}{0in}\n\\begin{document}\n',
+    'latexsvg': False,
+    'name': 'Simple Model',
+    'req': [[0, 'all', [0]]],
+    'sortf': 0,
+    'tags': [],
+    'tmpls': [{'name': 'Card 1', 'ord': 0, 'qfmt': '{{Front}}', 'afmt': '{{FrontSide}}<hr id="answer">{{Back}}', 'bafmt': '',
+               'bqfmt': '', 'bfont': '', 'bsize': 0, 'did': None}],
+    'type': 0,
+    'usn': -1,
+    'vers': [],
+}
+
+# The indexes are created after the bulk insert, which is faster than updating them with every row
+_APKG_TABLES, _APKG_INDEXES = APKG_SCHEMA[:APKG_SCHEMA.index('CREATE INDEX')], APKG_SCHEMA[APKG_SCHEMA.index('CREATE INDEX'):]
+# Two base 91 digits at a time
+_BASE91_PAIRS = [high + low for high in BASE91_TABLE for low in BASE91_TABLE]
+
+
+def _guid_for(front_side: str, back_side: str) -> str:
+    """
+    The GUID genanki assigns to a note with the given fields (the first 8 bytes of their SHA-256 in base 91), so re-importing
+    a deck updates its notes instead of duplicating them.
+    """
+    value = int.from_bytes(hashlib.sha256(f'{front_side}__{back_side}'.encode('utf-8')).digest()[:8], 'big')
+    digits = []
+    while value:
+        value, digit_pair = divmod(value, 91 * 91)
+        digits.append(_BASE91_PAIRS[digit_pair])
+    # Without leading zeros (the first digit of the table)
+    return ''.join(reversed(digits)).lstrip(BASE91_TABLE[0])
 
-def _create_anki_deck(deck_name: str, flashcard_deck: FlashcardDeck) -> genanki.Deck:
-    model_id = random.randrange(1 << 30, 1 << 31)
-    my_model = genanki.Model(
-        model_id,
-        'Simple Model',
-        fields=[
-            {'name': 'Front'},
-            {'name': 'Back'},
-        ],
-        templates=[
-            {
-                'name': 'Card 1',
-                'qfmt': '{{Front}}',
-                'afmt': '{{FrontSide}}<hr id="answer">{{Back}}',
-            },
-        ])
 
+def _create_anki_collection(deck_name: str, flashcard_deck: FlashcardDeck, timestamp: float) -> bytes:
+    """
+    Build the SQLite database of an Anki collection with one note and card per flashcard, inserted in bulk into an in-memory
+    database. The collection defaults and the schema are the ones genanki writes.
+    """
     deck_id = random.randrange(1 << 30, 1 << 31)
-    anki_deck = genanki.Deck(deck_id, deck_name)
+    modified = int(timestamp)
+    deck = {'collapsed': False, 'conf': 1, 'desc': '', 'dyn': 0, 'extendNew': 0, 'extendRev': 50, 'id': deck_id,
+            'lrnToday': [163, 2], 'mod': modified, 'name': deck_name, 'newToday': [163, 2], 'revToday': [163, 0],
+            'timeToday': [163, 23598], 'usn': -1}
+    model = dict(_ANKI_MODEL, did=deck_id, mod=modified)
+
+    connection = sqlite3.connect(':memory:')
+    try:
+        connection.executescript(_APKG_TABLES)
+        connection.executescript(APKG_COL)
+        decks = json.loads(connection.execute('SELECT decks FROM col').fetchone()[0])
+        decks[str(deck_id)] = deck
+        connection.execute('UPDATE col SET models = ?, decks = ?', (json.dumps({str(_ANKI_MODEL_ID): model}), json.dumps(decks)))
+
+        # Note and card IDs are consecutive millisecond timestamps, as in collections created by Anki
+        first_id = int(timestamp * 1000)
+        sides = [(flashcard.front_side, flashcard.back_side) for flashcard in flashcard_deck]
+        connection.executemany('INSERT INTO notes VALUES(?,?,?,?,?,?,?,?,?,?,?)', (
+            (first_id + 2 * position, _guid_for(front_side, back_side), _ANKI_MODEL_ID, modified, -1, '  ',
+             f'{front_side}\x1f{back_side}', front_side, 0, 0, '')
+            for position, (front_side, back_side) in enumerate(sides)
+        ))
+        # New cards are due by position, so they are studied in the order of the deck
+        connection.executemany('INSERT INTO cards VALUES(?,?,?,0,?,-1,0,0,?,0,0,0,0,0,0,0,0,\'\')', (
+            (first_id + 2 * position + 1, first_id + 2 * position, deck_id, modified, position) for position in range(len(sides))
+        ))
+        connection.executescript(_APKG_INDEXES)
+        connection.commit()
+        return connection.serialize()
+    finally:
+        connection.close()
+
+
+class _ChunkWriter(RawIOBase):
+    """
+    Unseekable file collecting the written bytes until they are drained, the target of a streamed zip file.
+    """
 
-    for flashcard in flashcard_deck.flashcards:
-        note = genanki.Note(model=my_model, fields=[flashcard.front_side, flashcard.back_side])
-        anki_deck.add_note(note)
+    def __init__(self):
+        self._chunks: List[bytes] = []
 
-    return anki_deck
+    def writable(self) -> bool:
+        return True
 
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
 
-def _save_anki_deck(anki_deck: genanki.Deck) -> bytes:
-    apkg_buffer = BytesIO()
-    genanki.Package(anki_deck).write_to_file(apkg_buffer)
-    apkg_buffer.seek(0)  # Rewind the buffer to the beginning
-    return apkg_buffer.getvalue()
+    def drain(self) -> bytes:
+        data, self._chunks = b''.join(self._chunks), []
+        return data
 
 
-def export_as_csv(flashcard_deck: FlashcardDeck) -> bytes:
+def _iter_batches(flashcard_deck: FlashcardDeck) -> Iterator[list]:
+    flashcards = iter(flashcard_deck)
+    while batch := list(islice(flashcards, CHUNK_FLASHCARDS)):
+        yield batch
+
+
+def iter_csv(flashcard_deck: FlashcardDeck) -> Iterator[bytes]:
     """
+    Stream the flashcards as CSV file, one row with front and back side per flashcard.
+
     Parameters
     ----------
     flashcard_deck : FlashcardDeck
@@ -50,22 +139,78 @@ def export_as_csv(flashcard_deck: FlashcardDeck) -> bytes:
 
     Returns
     -------
-    bytes
-        The csv file containing the flashcards.
+    Iterator[bytes]
+        The chunks of the CSV file, each with the rows of CHUNK_FLASHCARDS flashcards.
     """
     csv_buffer = StringIO()
     csv_writer = csv.writer(csv_buffer)
-    for flashcard in flashcard_deck.flashcards:
-        csv_writer.writerow([flashcard.front_side, flashcard.back_side])
+    for batch in _iter_batches(flashcard_deck):
+        csv_writer.writerows([flashcard.front_side, flashcard.back_side] for flashcard in batch)
+        yield csv_buffer.getvalue().encode('utf-8')
+        csv_buffer.seek(0)
+        csv_buffer.truncate()
+
+
+def iter_csv_zip(flashcard_deck: FlashcardDeck, compress: bool = True) -> Iterator[bytes]:
+    """
+    Stream the flashcards as zip file containing the CSV file 'flashcards.csv'.
+
+    The zip file is written without seeking (the sizes follow the data of the CSV file), so each chunk of the CSV file is
+    passed on as soon as it is compressed.
+
+    Parameters
+    ----------
+    flashcard_deck : FlashcardDeck
+        The flashcard deck to export
+    compress : bool
+        Whether to compress the CSV file with deflate, otherwise it is stored uncompressed (faster, but larger).
+
+    Returns
+    -------
+    Iterator[bytes]
+        The chunks of the zip file.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, 'w', zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED) as zip_file:
+        with zip_file.open('flashcards.csv', 'w') as csv_file:
+            for chunk in iter_csv(flashcard_deck):
+                csv_file.write(chunk)
+                if data := writer.drain():
+                    yield data
+    yield writer.drain()
+
+
+def iter_ndjson(flashcard_deck: FlashcardDeck) -> Iterator[bytes]:
+    """
+    Stream the flashcards as newline-delimited JSON, one object (see `Flashcard.to_dict`) per line.
+
+    Parameters
+    ----------
+    flashcard_deck : FlashcardDeck
+        The flashcard deck to export
+
+    Returns
+    -------
+    Iterator[bytes]
+        The chunks of the NDJSON file, each with the lines of CHUNK_FLASHCARDS flashcards.
+    """
+    for batch in _iter_batches(flashcard_deck):
+        yield ''.join(json.dumps(flashcard.to_dict(), ensure_ascii=False) + '\n' for flashcard in batch).encode('utf-8')
 
-    csv_buffer.seek(0)  # Rewind the buffer to the beginning
 
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        zip_file.writestr('flashcards.csv', csv_buffer.getvalue())
+def export_as_csv(flashcard_deck: FlashcardDeck) -> bytes:
+    """
+    Parameters
+    ----------
+    flashcard_deck : FlashcardDeck
+        The flashcard deck to export
 
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
+    Returns
+    -------
+    bytes
+        The csv file containing the flashcards.
+    """
+    return b''.join(iter_csv(flashcard_deck))
 
 
 def export_as_apkg(flashcard_deck: FlashcardDeck) -> bytes:
@@ -80,5 +225,10 @@ def export_as_apkg(flashcard_deck: FlashcardDeck) -> bytes:
     bytes
         The apkg file containing the flashcards.
     """
-    anki_deck = _create_anki_deck('flashcards', flashcard_deck)
-    return _save_anki_deck(anki_deck)
+    collection = _create_anki_collection('flashcards', flashcard_deck, time.time())
+    apkg_buffer = BytesIO()
+    with zipfile.ZipFile(apkg_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        zip_file.writestr('collection.anki2', collection)
+        # The package contains no media files
+        zip_file.writestr('media', '{}')
+    return apkg_buffer.getvalue()
@@ -0,0 +1,145 @@
+# src/services/flashcard_service/flashcard_generator_service/bulk_flashcard_generator.py
+import time
+from typing import Dict, List
+
+import structlog
+from dependency_injector.wiring import inject, Provide
+
+from src.container import Container
+from src.custom_exceptions.internal_exceptions import BatchJobError
+from src.dtos.generator_task import FlashcardGeneratorTaskDto
+from src.entities.completion_messages.completion_messages import Messages
+from src.entities.flashcard.flashcard import Flashcard
+from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
+from src.services.batch_service.batch_client_interface import IBatchClient, TERMINAL_BATCH_STATES, create_batch_request
+from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import FlashcardGenerator, number_flashcards, \
+    log_completion_metrics
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import count_dropped_lines
+from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
+
+logger = structlog.getLogger(__name__)
+
+
+class BulkFlashcardGenerator:
+    """
+    Generates the flashcard decks of many tasks at once with a single batch of completion requests (e.g. via the OpenAI Batch
+    API), for offline workloads that do not need their results interactively.
+
+    The fragments of all tasks are prepared exactly like in interactive generation and submitted as one batch. Once the batch
+    is complete, the results are parsed into decks. Fragments whose request failed or was not processed (e.g. because the batch
+    expired) are generated with regular completion requests, so a deck is only ever missing cards if that fails too.
+
+    Parameters
+    ----------
+    flashcard_generator : FlashcardGenerator
+        The generator used to prepare the requests and to generate failed fragments interactively.
+    batch_client : IBatchClient
+        The client of the batch endpoint.
+    """
+
+    @inject
+    def __init__(self, flashcard_generator=Provide[Container.flashcard_generator], batch_client=Provide[Container.batch_client]):
+        self.flashcard_generator: FlashcardGenerator = flashcard_generator
+        self.batch_client: IBatchClient = batch_client
+        self.bulk_generation_config = QuizardConfig.get_bulk_generation_config()
+
+    def _prepare_fragment_messages(self, tasks: Dict[str, FlashcardGeneratorTaskDto]) -> Dict[str, List[Messages]]:
+        return {task_id: self.flashcard_generator.prepare_fragment_messages(task) for task_id, task in tasks.items()}
+
+    def submit(self, tasks: Dict[str, FlashcardGeneratorTaskDto]) -> str:
+        """
+        Submit the completion requests of all fragments of all tasks as one batch.
+
+        Parameters
+        ----------
+        tasks : Dict[str, FlashcardGeneratorTaskDto]
+            The tasks by task ID.
+
+        Returns
+        -------
+        str
+            The ID of the batch.
+        """
+        max_tokens = self.flashcard_generator.token_limits['completion_limit']
+        requests = [
+            create_batch_request(create_custom_id(task_id, fragment), self.flashcard_generator.create_request_body(messages, max_tokens))
+            for task_id, fragment_messages in self._prepare_fragment_messages(tasks).items()
+            for fragment, messages in enumerate(fragment_messages)
+        ]
+        batch_id = self.batch_client.submit(requests)
+        logger.info("Bulk generation submitted", batch_id=batch_id, tasks=len(tasks), requests=len(requests))
+        return batch_id
+
+    def is_complete(self, batch_id: str) -> bool:
+        """
+        Check whether the results of a batch can be collected. Expired batches are complete, their unprocessed requests are
+        generated interactively when collecting the results.
+
+        Raises
+        ------
+        BatchJobError
+            If the batch failed or was cancelled.
+        """
+        status = self.batch_client.get_status(batch_id)
+        if status in ['failed', 'cancelled']:
+            raise BatchJobError(f"Batch {batch_id} {status}")
+        return status in TERMINAL_BATCH_STATES
+
+    def collect(self, batch_id: str, tasks: Dict[str, FlashcardGeneratorTaskDto]) -> Dict[str, FlashcardDeck]:
+        """
+        Collect the flashcard decks of a complete batch.
+
+        Parameters
+        ----------
+        batch_id : str
+            The ID of the batch.
+        tasks : Dict[str, FlashcardGeneratorTaskDto]
+            The tasks the batch was submitted for.
+
+        Returns
+        -------
+        Dict[str, FlashcardDeck]
+            The flashcard deck of each task by task ID.
+        """
+        max_tokens = self.flashcard_generator.token_limits['completion_limit']
+        results = self.batch_client.get_results(batch_id)
+        receive_time_sec = round(time.time(), 3)
+
+        flashcard_decks = {}
+        fallback_fragments = 0
+        # The prompts are deterministic, so the fragments are the same as when the batch was submitted
+        for task_id, fragment_messages in self._prepare_fragment_messages(tasks).items():
+            batch_flashcards: List[List[Flashcard]] = []
+            for fragment, messages in enumerate(fragment_messages):
+                completion = results.get(create_custom_id(task_id, fragment))
+                if completion is not None:
+                    parser = self.flashcard_generator.create_parser(fragment)
+                    flashcards = parser.feed(completion.choices[0].message.content) + parser.close()
+                    log_completion_metrics(completion, receive_time_sec, fragment, flashcards=len(flashcards),
+                                           dropped_lines=count_dropped_lines(parser.diagnostics))
+                    batch_flashcards.append(flashcards)
+                else:
+                    fallback_fragments += 1
+                    batch_flashcards.append(self.flashcard_generator.generate_batch(messages, max_tokens, fragment))
+            batch_flashcards, dropped_duplicates = self.flashcard_generator.deduplicate(batch_flashcards)
+            flashcard_decks[task_id] = FlashcardDeck(number_flashcards(batch_flashcards), dropped_duplicates)
+
+        logger.info("Bulk generation completed", batch_id=batch_id, tasks=len(tasks), fallback_fragments=fallback_fragments)
+        return flashcard_decks
+
+    def generate_flashcard_decks(self, tasks: Dict[str, FlashcardGeneratorTaskDto]) -> Dict[str, FlashcardDeck]:
+        """
+        Submit a batch for the given tasks and block until its results are collected.
+        Use `submit`, `is_complete` and `collect` to poll without blocking (e.g. from a Celery task).
+        """
+        batch_id = self.submit(tasks)
+        while not self.is_complete(batch_id):
+            time.sleep(self.bulk_generation_config['poll_interval_sec'])
+        return self.collect(batch_id, tasks)
+
+
+def create_custom_id(task_id: str, fragment: int) -> str:
+    """
+    Create the ID of the request of a fragment within a batch.
+    """
+    return f"{task_id}:{fragment}"
@@ -0,0 +1,113 @@
+# src/services/flashcard_service/flashcard_generator_service/flashcard_deduplication.py
+import re
+import zlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Set, Tuple
+
+from src.entities.flashcard.flashcard import Flashcard
+
+_NON_WORD_PATTERN = re.compile(r'[\W_]+')
+# Front sides are compared as sets of character 4-grams, which are robust against inflections and small rewordings
+SHINGLE_SIZE = 4
+# The MinHash sketch of a front side is the minimum shingle hash in each of NUM_BINS bins (one permutation hashing)
+NUM_BINS = 18
+# Front sides are candidates if the minimums of all bins of one band are equal (LSH banding)
+ROWS_PER_BAND = 3
+# Buckets stop growing at this size, a band key shared by that many distinct front sides carries no information
+MAX_BUCKET_SIZE = 20
+# Shingles occurring in more front sides than this (e.g. of "What is") are not used for the sketches, so they do not put most
+# of the deck into the same LSH bucket. The similarity of candidates is still computed on all shingles.
+MIN_FREQUENT_SHINGLE_COUNT = 10
+MAX_SHINGLE_DOCUMENT_FREQUENCY = 0.05
+_EMPTY_BAND = (None,) * ROWS_PER_BAND
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD_PATTERN.sub(' ', text.lower()).strip()
+
+
+def _shingles(text: str) -> Set[str]:
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _band_keys(shingles: Set[str]) -> List[tuple]:
+    # Iterating the hashes in descending order leaves the minimum of each bin in the dict
+    # CRC32 instead of the salted built-in hash, so the same deck is always deduplicated the same way
+    bin_minimums = {h % NUM_BINS: h for h in sorted((zlib.crc32(shingle.encode()) for shingle in shingles), reverse=True)}
+    sketch = [bin_minimums.get(i) for i in range(NUM_BINS)]
+    bands = [(band, tuple(sketch[band:band + ROWS_PER_BAND])) for band in range(0, NUM_BINS, ROWS_PER_BAND)]
+    # Bands of empty bins only (short front sides) would make all short front sides candidates
+    return [(band, rows) for band, rows in bands if rows != _EMPTY_BAND]
+
+
+def jaccard_similarity(a: Set[str], b: Set[str]) -> float:
+    """
+    Jaccard similarity of two sets (1.0 for two empty sets).
+    """
+    if not a and not b:
+        return 1.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def deduplicate_flashcards(batch_flashcards: List[List[Flashcard]], similarity_threshold: float) -> Tuple[List[List[Flashcard]], int]:
+    """
+    Remove flashcards whose front side is a near-duplicate of the front side of an earlier flashcard, e.g. flashcards generated
+    twice from the overlap of neighboring fragments.
+
+    Near-duplicates are found with MinHash LSH over the character shingles of the normalized front sides, so the runtime grows
+    roughly linearly with the size of the deck. Candidates are confirmed with their exact Jaccard similarity.
+
+    Parameters
+    ----------
+    batch_flashcards : List[List[Flashcard]]
+        The flashcards of each batch, in fragment order.
+    similarity_threshold : float
+        The Jaccard similarity of the shingles of two front sides from which on the later flashcard is dropped.
+
+    Returns
+    -------
+    Tuple[List[List[Flashcard]], int]
+        The flashcards of each batch without near-duplicates (the first flashcard of a group of near-duplicates is kept), and
+        the number of dropped flashcards.
+    """
+    normalized_front_sides = [[_normalize(flashcard.front_side) for flashcard in flashcards] for flashcards in batch_flashcards]
+    shingle_sets = [[_shingles(front_side) for front_side in front_sides] for front_sides in normalized_front_sides]
+
+    shingle_counts = Counter()
+    for shingles in (shingles for batch_shingles in shingle_sets for shingles in batch_shingles):
+        shingle_counts.update(shingles)
+    total_flashcards = sum(len(flashcards) for flashcards in batch_flashcards)
+    max_count = max(MIN_FREQUENT_SHINGLE_COUNT, MAX_SHINGLE_DOCUMENT_FREQUENCY * total_flashcards)
+    frequent_shingles = {shingle for shingle, count in shingle_counts.items() if count > max_count}
+
+    # Only kept flashcards are indexed, so every dropped flashcard is a near-duplicate of a kept one
+    kept_front_sides: Dict[str, int] = {}
+    kept_shingles: List[Set[str]] = []
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    deduplicated_batches = []
+    dropped = 0
+    for flashcards, front_sides, batch_shingles in zip(batch_flashcards, normalized_front_sides, shingle_sets):
+        kept_flashcards = []
+        for flashcard, front_side, shingles in zip(flashcards, front_sides, batch_shingles):
+            if front_side in kept_front_sides:
+                dropped += 1
+                continue
+            band_keys = _band_keys(shingles - frequent_shingles)
+            candidates = {candidate for key in band_keys for candidate in buckets.get(key, ())}
+            # The similarity of two sets is at most the ratio of their sizes, which rules out most candidates cheaply
+            min_size, max_size = len(shingles) * similarity_threshold, len(shingles) / similarity_threshold
+            if any(min_size <= len(kept_shingles[candidate]) <= max_size
+                   and jaccard_similarity(shingles, kept_shingles[candidate]) >= similarity_threshold for candidate in candidates):
+                dropped += 1
+                continue
+            kept_front_sides[front_side] = len(kept_shingles)
+            for key in band_keys:
+                if len(buckets[key]) < MAX_BUCKET_SIZE:
+                    buckets[key].append(len(kept_shingles))
+            kept_shingles.append(shingles)
+            kept_flashcards.append(flashcard)
+        deduplicated_batches.append(kept_flashcards)
+    return deduplicated_batches, dropped
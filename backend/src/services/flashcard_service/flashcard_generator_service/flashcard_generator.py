@@ -1,18 +1,18 @@
 # src/flashcard_service/flashcard_generator_service/flashcard_generator.py
 import os
 import time
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import openai
 import structlog
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 
-import tiktoken
 from dependency_injector.wiring import inject, Provide
 from openai import OpenAI
-from openai.types.chat import ChatCompletion
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
 
-from src.enums.generatorOptions import GeneratorMode, SupportedLanguage
-from src.utils.path_util import get_system_prompt_path, get_example_prompt_path, get_additional_prompt_path
 from src.custom_exceptions.internal_exceptions import PromptSizeError
 from src.dtos.generator_task import FlashcardGeneratorTaskDto
 from src.entities.completion_messages.completion_messages import Messages
@@ -20,14 +20,26 @@ from src.entities.flashcard.flashcard import Flashcard
 from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
 from src.container import Container
 from src.services.flashcard_service.flashcard_generator_service.flashcard_generator_interface import IFlashcardGenerator
-from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import parse_flashcards
+from src.services.flashcard_service.flashcard_generator_service.flashcard_deduplication import deduplicate_flashcards
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import FlashcardStreamParser, count_dropped_lines
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import ModelProfile
+from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
 from src.services.flashcard_service.flashcard_generator_service.quizard_config import QuizardConfig
-
-from src.utils.file_util import read_file
+from src.services.flashcard_service.flashcard_generator_service.retry_policy import RetryPolicies
+from src.services.flashcard_service.flashcard_generator_service.structured_output import LINES, JSON_SCHEMA, \
+    FLASHCARD_RESPONSE_FORMAT, StructuredFlashcardStreamParser
+from src.services.flashcard_service.flashcard_generator_service.text_splitting import TokenizedText, TextFragment, split_text, \
+    split_text_by_structure
+from src.services.checkpoint_service.checkpoint_store_interface import ICheckpointStore
+from src.services.completion_cache_service.completion_cache_interface import ICompletionCache, create_cache_key
+from src.services.rate_limit_service.rate_limiter_interface import IRateLimiter, estimate_request_tokens
 from src.utils.formatting_util import format_num, inset_into_string
 
 logger = structlog.getLogger(__name__)
 
+# Minimum interval in seconds between two reports of partial results while batches are in flight
+PARTIAL_RESULT_INTERVAL_SEC = 0.5
+
 
 class FlashcardGenerator(IFlashcardGenerator):
     """
@@ -37,26 +49,57 @@ class FlashcardGenerator(IFlashcardGenerator):
     ----------
     client : OpenAI
         The OpenAI client object.
+    rate_limiter : Optional[IRateLimiter]
+        The rate limiter charged before each completion request, or None to send requests without limiting.
+    completion_cache : Optional[ICompletionCache]
+        The cache looked up before each completion request, or None to disable caching.
+    prompt_registry : PromptRegistry
+        The process-wide registry of the preloaded prompts.
+    checkpoint_store : Optional[ICheckpointStore]
+        The store of the flashcards of finished fragments, or None to disable checkpointing.
 
     Attributes
     ----------
     client : OpenAI
         The OpenAI client object.
+    rate_limiter : Optional[IRateLimiter]
+        The rate limiter charged before each completion request.
+    completion_cache : Optional[ICompletionCache]
+        The cache looked up before each completion request.
+    prompt_registry : PromptRegistry
+        The process-wide registry of the preloaded prompts.
     model_config : dict
         A dictionary containing model configuration parameters.
+    model_profile : ModelProfile
+        The context window, output limit, encoding and chat format overhead of the configured model.
     text_splitting_config: dict
         ...
+    retry_policies : RetryPolicies
+        The retry policies applied to failed completion requests, per error class.
+    checkpoint_store : Optional[ICheckpointStore]
+        The store of the flashcards of finished fragments, used to resume restarted tasks.
     """
 
     @inject
-    def __init__(self, client=Provide[Container.openai_client]):
+    def __init__(self, client=Provide[Container.openai_client], rate_limiter=Provide[Container.rate_limiter],
+                 completion_cache=Provide[Container.completion_cache], prompt_registry=Provide[Container.prompt_registry],
+                 checkpoint_store=Provide[Container.checkpoint_store]):
         self.client = client
+        self.rate_limiter: Optional[IRateLimiter] = rate_limiter
+        self.completion_cache: Optional[ICompletionCache] = completion_cache
+        self.prompt_registry: PromptRegistry = prompt_registry
+        self.checkpoint_store: Optional[ICheckpointStore] = checkpoint_store
         self.model_config = QuizardConfig.get_model_config()
         self.text_splitting_config = QuizardConfig.get_text_splitting_config()
         self.token_limits = QuizardConfig.get_token_limits()
-        self.prompt_config = QuizardConfig.get_prompt_config()
-
-    def generate_flashcard_deck(self, flashcards_generator_task: FlashcardGeneratorTaskDto, fn_update_progress: Optional[Callable], *args,
+        self.model_profile = QuizardConfig.get_model_profile()
+        self.generation_config = QuizardConfig.get_generation_config()
+        self.deduplication_config = QuizardConfig.get_deduplication_config()
+        self.retry_config = QuizardConfig.get_retry_config()
+        self.retry_policies = RetryPolicies.from_config(self.retry_config)
+
+    def generate_flashcard_deck(self, flashcards_generator_task: FlashcardGeneratorTaskDto, fn_update_progress: Optional[Callable],
+                                fn_partial_result: Optional[Callable] = None, checkpoint_id: Optional[str] = None, *args,
                                 **kwargs) -> FlashcardDeck:
         """
         Generate flashcards based on input.
@@ -67,6 +110,12 @@ class FlashcardGenerator(IFlashcardGenerator):
         fn_update_progress: Optional[Callable]
             Optional callback function to update the caller about the current progress of the generation process.
             Takes in two arguments: current batch and total number of batches.
+        fn_partial_result: Optional[Callable]
+            Optional callback function to update the caller about the flashcards generated so far, while the generation is still
+            running. Takes in the list of flashcards parsed so far.
+        checkpoint_id: Optional[str]
+            Optional ID (e.g. the task ID) under which the flashcards of finished fragments are checkpointed. A generation with the
+            same ID skips the fragments checkpointed by a previous, interrupted run.
         args
         kwargs
         Returns
@@ -74,112 +123,349 @@ class FlashcardGenerator(IFlashcardGenerator):
         FlashcardDeck
             The generated flashcards.
         """
+        # Log start time
+        start_time = time.time()
+        fragment_messages = self.prepare_fragment_messages(flashcards_generator_task)
+
+        batch_flashcards = self.generate_batches(fragment_messages, self.token_limits['completion_limit'], fn_update_progress,
+                                                 fn_partial_result, checkpoint_id)
+        batch_flashcards, dropped_duplicates = self.deduplicate(batch_flashcards)
+        flashcards = number_flashcards(batch_flashcards)
+        if checkpoint_id is not None and self.checkpoint_store is not None:
+            # Checkpoints that are not deleted (e.g. of failed tasks that are never retried) expire after their TTL
+            self.checkpoint_store.delete(checkpoint_id)
+
+        # Log end time
+        end_time = time.time()
+        logger.info("Flashcard generation completed", total_flashcards=len(flashcards), dropped_duplicates=dropped_duplicates,
+                    duration=round(end_time - start_time, 3),
+                    completion_cache=self.completion_cache.get_stats() if self.completion_cache is not None else 'N/A')
+        flashcard_deck = FlashcardDeck(flashcards, dropped_duplicates)
+        return flashcard_deck
+
+    def deduplicate(self, batch_flashcards: List[List[Flashcard]]) -> Tuple[List[List[Flashcard]], int]:
+        """
+        Drop near-duplicate flashcards across all batches, if deduplication is enabled.
 
-        # Load the prompts
-        (system_prompt,
-         example_user_prompt,
-         example_assistant_prompt,
-         additional_prompt) = load_prompts(self.prompt_config, flashcards_generator_task.mode, flashcards_generator_task.lang)
+        Parameters
+        ----------
+        batch_flashcards : List[List[Flashcard]]
+            The flashcards of each batch, in fragment order.
+
+        Returns
+        -------
+        Tuple[List[List[Flashcard]], int]
+            The flashcards of each batch without near-duplicates and the number of dropped flashcards.
+        """
+        if not self.deduplication_config['enabled']:
+            return batch_flashcards, 0
+        return deduplicate_flashcards(batch_flashcards, self.deduplication_config['similarity_threshold'])
+
+    def prepare_fragment_messages(self, flashcards_generator_task: FlashcardGeneratorTaskDto) -> List[Messages]:
+        """
+        Split the input text of a task into fragments and create the message sequence of each fragment.
+
+        Parameters
+        ----------
+        flashcards_generator_task: FlashcardGeneratorTaskDto
+            The DTO containing the parameters for generating flashcards including language, mode, export format, and input.
+
+        Returns
+        -------
+        List[Messages]
+            One Messages object per text fragment, in fragment order.
+
+        Raises
+        ------
+        PromptSizeError
+            If the prompts exceed the prompt token limit or leave no room for input text.
+        """
+        # Get the preloaded prompts
+        mode, lang = flashcards_generator_task.mode, flashcards_generator_task.lang
+        prompts = self.prompt_registry.get_prompts(mode, lang)
 
-        app_token_limit = self.token_limits['app_limit']
         prompt_token_limit = self.token_limits['prompt_limit']
-        completion_token_limit = self.token_limits['completion_limit']
-
-        encoding = tiktoken.encoding_for_model(self.model_config['model_name'])
-
-        # Estimate prompt tokes
-        prompt_tokens = calculate_prompt_tokens(encoding, system_prompt, example_user_prompt, example_assistant_prompt, additional_prompt,
-                                                prompt_token_limit)
-        # Add an instruction at the top of the input text.
-        modified_input_text = inset_into_string(insert=additional_prompt, target=flashcards_generator_task.input_text, position=0)
-
-        # Initialize messages sent to OpenAI API
-        messages = Messages(
-            system=system_prompt,
-            example_user=example_user_prompt,
-            example_assistant=example_assistant_prompt,
-            input_text=modified_input_text
-        )
 
-        # Log start time
-        start_time = time.time()
+        encoding = self.model_profile.get_encoding()
+
+        # Token counts of the static prompts are computed once per process
+        prompt_tokens = self.prompt_registry.get_prompt_tokens(mode, lang, self.model_profile)
+        check_prompt_size(prompt_tokens, prompt_token_limit)
+        message_prompt_tokens = self.prompt_registry.get_message_prompt_tokens(mode, lang, self.model_profile)
+        # Tokens added to every input text: the additional prompt and the chat format overhead of the input message
+        input_overhead_tokens = self.prompt_registry.get_additional_prompt_tokens(mode, lang, self.model_profile) + \
+            self.model_profile.tokens_per_message + len(encoding.encode('user'))
+
+        # Encode the input text exactly once, all token counts and fragments are derived from it
+        tokenized_input_text = TokenizedText(flashcards_generator_task.input_text, encoding)
+        input_tokens = input_overhead_tokens + len(tokenized_input_text)
+
         logger.info(
             "Flashcard generation started",
             generation_mode=flashcards_generator_task.mode,
             language=flashcards_generator_task.lang,
-            token_est=format_num(messages.compute_input_tokens(encoding=encoding))
+            token_est=format_num(input_tokens)
         )
-        # Compute total tokens of the messages
-        total_message_tokens = messages.compute_total_tokens(encoding=encoding)
-
-        # Empty flashcard list to store generated flashcards
-        flashcards: List[Flashcard] = []
+        # Each fragment is packed up to the context window of the model, less the messages, the completion and the safety margin
+        fragment_size = compute_fragment_size(self.model_profile, self.token_limits, message_prompt_tokens + input_overhead_tokens)
 
         # For short texts generate the flashcards in a single run
-        if total_message_tokens < app_token_limit:
-            if fn_update_progress:
-                # Set progress to 0
-                fn_update_progress(0, 1)
-
-            completion = self.make_gpt_completion_request(messages=messages, max_tokens=completion_token_limit)
-            receive_time_sec = round(time.time(), 3)
-            log_completion_metrics(completion, receive_time_sec)
+        if len(tokenized_input_text) <= fragment_size:
+            fragment_list = [TextFragment(flashcards_generator_task.input_text, len(tokenized_input_text))]
 
-            completion_message_content = completion.choices[0].message.content
-            flashcards += parse_flashcards(completion_message_content)
-            if fn_update_progress:
-                fn_update_progress(1, 1)
-
-        # For longer texts, splut the text into fragments and generate flashcards in multiple batches
+        # For longer texts, split the text into fragments and generate flashcards in multiple batches
         else:
             # Split the text into fragments
-            fragment_size = app_token_limit - (prompt_tokens + completion_token_limit)
-            fragment_list = split_text(
-                encoding=encoding,
-                text=modified_input_text,
-                fragment_size=fragment_size,
-                overlap_type=self.text_splitting_config['overlap_type'],
-                overlap=self.text_splitting_config['overlap']
+            if self.text_splitting_config['splitter'] == 'structural':
+                fragment_list = split_text_by_structure(tokenized_text=tokenized_input_text, fragment_size=fragment_size)
+            else:
+                fragment_list = split_text(
+                    tokenized_text=tokenized_input_text,
+                    fragment_size=fragment_size,
+                    overlap_type=self.text_splitting_config['overlap_type'],
+                    overlap=self.text_splitting_config['overlap']
+                )
+
+        # Generate a Message for each fragment, with an instruction added at the top of the fragment
+        fragment_messages = [
+            Messages(
+                system=prompts.system,
+                example_user=prompts.example_user,
+                example_assistant=prompts.example_assistant,
+                input_text=inset_into_string(insert=prompts.additional, target=fragment.text, position=0),
+                prompt_tokens=message_prompt_tokens,
+                input_tokens=input_overhead_tokens + fragment.token_count
             )
+            for fragment in fragment_list
+        ]
+        return fragment_messages
 
-            if fn_update_progress:
-                # Set progress to 0
-                fn_update_progress(0, len(fragment_list))
-
-            total_batch_num = len(fragment_list)
-            for batch in range(total_batch_num):
-                modified_input_text = inset_into_string(additional_prompt, fragment_list[batch], 0)
-                # Generate a new Message for the new shorter fragment
-                new_message = Messages(
-                    system=system_prompt,
-                    example_user=example_user_prompt,
-                    example_assistant=example_assistant_prompt,
-                    input_text=modified_input_text
-                )
+    def generate_batches(self, fragment_messages: List[Messages], max_tokens: int, fn_update_progress: Optional[Callable] = None,
+                         fn_partial_result: Optional[Callable] = None, checkpoint_id: Optional[str] = None) -> List[List[Flashcard]]:
+        """
+        Generate the flashcards of each fragment, keeping up to `max_concurrent_requests` completion requests in flight.
 
-                completion = self.make_gpt_completion_request(
-                    messages=new_message,
-                    max_tokens=completion_token_limit
-                )
-                receive_time_sec = round(time.time(), 3)
-                log_completion_metrics(completion, receive_time_sec, batch)
-                completion_message_content = completion.choices[0].message.content
+        Parameters
+        ----------
+        fragment_messages : List[Messages]
+            One Messages object per text fragment, in fragment order.
+        max_tokens : int
+            The maximum number of tokens to generate per completion.
+        fn_update_progress : Optional[Callable]
+            Optional callback that is called with the number of completed batches and the total number of batches
+            whenever a batch completes.
+        fn_partial_result : Optional[Callable]
+            Optional callback that is called with all flashcards parsed so far (in fragment order) whenever new flashcards were
+            parsed, at most every `PARTIAL_RESULT_INTERVAL_SEC` seconds while batches are in flight.
+        checkpoint_id : Optional[str]
+            Optional ID under which the flashcards of each batch are checkpointed as soon as it completes. Batches already
+            checkpointed under this ID are not generated again.
 
-                start_id = len(flashcards) + 1
-                flashcards += parse_flashcards(completion_message_content, start_id, batch)
-                if fn_update_progress:
-                    fn_update_progress(batch + 1, len(fragment_list))
+        Returns
+        -------
+        List[List[Flashcard]]
+            The flashcards of each batch, in fragment order (independent of the order in which the batches completed).
+        """
+        total_batches = len(fragment_messages)
+        # The batch number is only logged when the text was actually split
+        batch_numbers = range(total_batches) if total_batches > 1 else [None]
+        batch_flashcards: List[List[Flashcard]] = [[] for _ in range(total_batches)]
+
+        # Restore the batches finished by a previous run, checkpoints are addressed by the content of the request
+        checkpointing = checkpoint_id is not None and self.checkpoint_store is not None
+        fragment_keys = [create_cache_key(self.model_config, max_tokens, messages.as_message_list()) for messages in fragment_messages] \
+            if checkpointing else []
+        checkpoints = self.checkpoint_store.load(checkpoint_id) if checkpointing else {}
+        remaining_batches = []
+        for batch in range(total_batches):
+            if checkpointing and fragment_keys[batch] in checkpoints:
+                batch_flashcards[batch] = checkpoints[fragment_keys[batch]]
+            else:
+                remaining_batches.append(batch)
+        completed_batches = total_batches - len(remaining_batches)
+        if completed_batches:
+            logger.info("Resuming flashcard generation from checkpoints", checkpoint_id=checkpoint_id, restored_batches=completed_batches,
+                        total_batches=total_batches)
+        if fn_update_progress:
+            # Set progress to the number of restored batches (0 for a new generation)
+            fn_update_progress(completed_batches, total_batches)
+
+        max_workers = max(1, min(self.generation_config['max_concurrent_requests'], len(remaining_batches)))
+
+        # Batches push the flashcards parsed so far from their (streamed) completions into this queue, the calling thread collects them
+        partial_queue = queue.Queue() if fn_partial_result else None
+        partial_flashcards: List[List[Flashcard]] = [list(flashcards) for flashcards in batch_flashcards]
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='flashcard-batch') as executor:
+            futures = {
+                executor.submit(
+                    self.generate_batch, fragment_messages[batch], max_tokens, batch_numbers[batch],
+                    (lambda flashcards, batch=batch: partial_queue.put((batch, flashcards))) if partial_queue else None
+                ): batch
+                for batch in remaining_batches
+            }
+            pending = set(futures)
+            try:
+                # Progress is reported from the calling thread, so callbacks (e.g. Celery state updates) need not be thread-safe
+                while pending:
+                    done, pending = wait(pending, timeout=PARTIAL_RESULT_INTERVAL_SEC if partial_queue else None,
+                                         return_when=FIRST_COMPLETED)
+                    # Successful batches are checkpointed before the error of a failed batch is raised
+                    for future in sorted(done, key=lambda f: f.exception() is not None):
+                        batch = futures[future]
+                        batch_flashcards[batch] = future.result()
+                        if checkpointing:
+                            self.checkpoint_store.save(checkpoint_id, fragment_keys[batch], batch_flashcards[batch])
+                        completed_batches += 1
+                        if fn_update_progress:
+                            fn_update_progress(completed_batches, total_batches)
+                    if partial_queue and pending and not partial_queue.empty():
+                        while not partial_queue.empty():
+                            batch, flashcards = partial_queue.get_nowait()
+                            partial_flashcards[batch] = flashcards
+                        fn_partial_result(number_flashcards(partial_flashcards))
+            except BaseException:
+                # Do not send the requests of batches that have not started yet, one failed batch fails the whole deck
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return batch_flashcards
+
+    def generate_batch(self, messages: Messages, max_tokens: int, batch_number: Optional[int] = None,
+                       fn_partial_result: Optional[Callable] = None) -> List[Flashcard]:
+        """
+        Generate the flashcards of a single batch.
+        The flashcards are parsed incrementally while the completion is received.
 
-        # Log end time
-        end_time = time.time()
-        logger.info("Flashcard generation completed", total_flashcards=len(flashcards), duration=round(end_time - start_time, 3), )
-        flashcard_deck = FlashcardDeck(flashcards)
-        return flashcard_deck
+        Parameters
+        ----------
+        messages : Messages
+            The message sequence containing the text fragment of the batch.
+        max_tokens : int
+            The maximum number of tokens to generate.
+        batch_number : Optional[int]
+            The number of the batch, used for logging.
+        fn_partial_result : Optional[Callable]
+            Optional callback that is called with all flashcards of the batch parsed so far whenever a line of the completion
+            is complete, and with an empty list when the request is retried.
 
-    def make_gpt_completion_request(self, messages: Messages, max_tokens: int) \
-            -> ChatCompletion:
+        Returns
+        -------
+        List[Flashcard]
+            The flashcards of the batch, numbered starting from 1.
+        """
+        parser = self.create_parser(batch_number)
+        flashcards = []
+        retries = 0
+
+        def on_content(content: str):
+            new_flashcards = parser.feed(content)
+            if new_flashcards:
+                flashcards.extend(new_flashcards)
+                if fn_partial_result:
+                    fn_partial_result(list(flashcards))
+
+        def on_retry(attempt: int):
+            nonlocal parser, retries
+            # Discard the flashcards of the failed attempt, the retry generates a new completion
+            retries = attempt
+            parser = self.create_parser(batch_number)
+            flashcards.clear()
+            if fn_partial_result:
+                fn_partial_result([])
+
+        completion = self.make_gpt_completion_request(messages=messages, max_tokens=max_tokens, fn_on_content=on_content,
+                                                      fn_on_retry=on_retry)
+        receive_time_sec = round(time.time(), 3)
+        flashcards.extend(parser.close())
+        log_completion_metrics(completion, receive_time_sec, batch_number, retries, flashcards=len(flashcards),
+                               dropped_lines=count_dropped_lines(parser.diagnostics))
+        return flashcards
+
+    def create_parser(self, batch_number: Optional[int] = None):
+        """
+        Create an incremental parser for a completion in the configured output format (FlashcardStreamParser for the line format,
+        StructuredFlashcardStreamParser for structured output).
+
+        Parameters
+        ----------
+        batch_number : Optional[int]
+            The number of the batch, used for logging.
+        """
+        if self.generation_config.get('output_format', LINES) == JSON_SCHEMA:
+            return StructuredFlashcardStreamParser(1, batch_number)
+        return FlashcardStreamParser(1, batch_number)
+
+    def make_gpt_completion_request(self, messages: Messages, max_tokens: int, fn_on_content: Optional[Callable] = None,
+                                    fn_on_retry: Optional[Callable] = None) -> ChatCompletion:
         """
         Make a GPT completion request to the OpenAI API.
+        Byte-identical requests (same model config and messages) are answered from the completion cache if one is configured.
+        Requests failing with transient errors (rate limits, server errors, timeouts and connection errors) are retried according
+        to the retry policy of the error class, non-transient errors are raised immediately.
+
+        Parameters
+        ----------
+        messages : Messages
+            A Messages object containing the input message sequence.
+        max_tokens : int
+            The maximum number of tokens to generate.
+        fn_on_content : Optional[Callable]
+            Optional callback that is called with each piece of the completion content as soon as it is received. Without
+            streaming (and for cached completions) it is called once with the whole content.
+        fn_on_retry : Optional[Callable]
+            Optional callback that is called with the number of the failed attempt before the request is retried. Content passed
+            to `fn_on_content` before the failure is superseded by the content of the retry.
+
+        Returns
+        -------
+        ChatCompletion
+            The completion response from the OpenAI API.
+
+        Raises
+        ------
+        RateLimitTimeoutError
+            If the rate limit budget for the request does not become available in time.
+        OpenAIError
+            If the request fails with a non-transient error or the retry policy of the error class is exhausted.
+        """
+        cache_key = None
+        if self.completion_cache is not None:
+            cache_key = create_cache_key(self.model_config, max_tokens, messages.as_message_list())
+            cached_completion = self.completion_cache.get(cache_key)
+            if cached_completion is not None:
+                logger.info("Completion served from cache", cache_key=cache_key)
+                if fn_on_content:
+                    fn_on_content(cached_completion.choices[0].message.content)
+                return cached_completion
+
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                # Charge the budget shared by all workers before sending the request, so the provider quota is not exceeded
+                self.rate_limiter.acquire(estimate_request_tokens(messages.as_message_list(), max_tokens))
+            try:
+                response = self.request_completion(messages, max_tokens, fn_on_content)
+                break
+            except openai.OpenAIError as e:
+                # Only the failing request is retried, the completions of the other fragments are kept
+                delay_sec = self.retry_policies.get_delay(e, attempt)
+                if delay_sec is None:
+                    raise
+                logger.warning("Retrying completion request", attempt=attempt, delay_sec=round(delay_sec, 3), error_type=type(e).__name__)
+                if fn_on_retry:
+                    fn_on_retry(attempt)
+                time.sleep(delay_sec)
+                attempt += 1
+
+        if self.completion_cache is not None:
+            self.completion_cache.set(cache_key, response)
+        return response
+
+    def create_request_body(self, messages: Messages, max_tokens: int) -> dict:
+        """
+        Create the body of a chat completion request, as sent to the API directly or as part of a batch.
 
         Parameters
         ----------
@@ -188,22 +474,58 @@ class FlashcardGenerator(IFlashcardGenerator):
         max_tokens : int
             The maximum number of tokens to generate.
 
+        Returns
+        -------
+        dict
+            The request body.
+        """
+        body = dict(
+            model=self.model_config["model_name"],
+            messages=messages.as_message_list(),
+            max_tokens=max_tokens,
+            temperature=self.model_config.get("temperature", 0.7),
+            top_p=self.model_config.get("top_p", 1.0),
+            frequency_penalty=self.model_config.get("frequency_penalty", 0.0),
+            presence_penalty=self.model_config.get("presence_penalty", 0.0)
+        )
+        if self.generation_config.get('output_format', LINES) == JSON_SCHEMA:
+            body['response_format'] = FLASHCARD_RESPONSE_FORMAT
+        return body
+
+    def request_completion(self, messages: Messages, max_tokens: int, fn_on_content: Optional[Callable] = None) -> ChatCompletion:
+        """
+        Send a single completion request to the OpenAI API, without caching or retries.
+        If `stream_completions` is enabled, the completion is streamed and reassembled into a single ChatCompletion.
+
+        Parameters
+        ----------
+        messages : Messages
+            A Messages object containing the input message sequence.
+        max_tokens : int
+            The maximum number of tokens to generate.
+        fn_on_content : Optional[Callable]
+            Optional callback that is called with each piece of the completion content as soon as it is received.
+
         Returns
         -------
         ChatCompletion
             The completion response from the OpenAI API.
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_config["model_name"],
-                messages=messages.as_message_list(),
-                max_tokens=max_tokens,
-                temperature=self.model_config.get("temperature", 0.7),
-                top_p=self.model_config.get("top_p", 1.0),
-                frequency_penalty=self.model_config.get("frequency_penalty", 0.0),
-                presence_penalty=self.model_config.get("presence_penalty", 0.0)
-            )
-            return response
+            request_params = dict(self.create_request_body(messages, max_tokens), timeout=self.retry_config['timeout_sec'])
+            if self.generation_config['stream_completions']:
+                # The usage is only sent in the final chunk of the stream if requested explicitly
+                stream = self.client.chat.completions.create(**request_params, stream=True, stream_options={'include_usage': True})
+                chunks = []
+                for chunk in stream:
+                    chunks.append(chunk)
+                    if fn_on_content and chunk.choices and chunk.choices[0].delta.content:
+                        fn_on_content(chunk.choices[0].delta.content)
+                response = assemble_streamed_completion(chunks)
+            else:
+                response = self.client.chat.completions.create(**request_params)
+                if fn_on_content:
+                    fn_on_content(response.choices[0].message.content)
         except openai.BadRequestError as e:
             # Handle error 400
             logger.error("OpenAI API Error occurred", error=f"Error 400: {e}")
@@ -236,11 +558,13 @@ class FlashcardGenerator(IFlashcardGenerator):
             # Handle API connection error
             logger.error("OpenAI API Error occurred", error=f"API connection error: {e}")
             raise
+        return response
 
 
-def log_completion_metrics(completion: openai.Completion, receive_time_sec: float, batch_number: Optional[int] = None):
+def log_completion_metrics(completion: openai.Completion, receive_time_sec: float, batch_number: Optional[int] = None, retries: int = 0,
+                           flashcards: Optional[int] = None, dropped_lines: Optional[int] = None):
     """
-    Logs the metrics of a completion response, including optional batch information.
+    Logs the metrics of a completion response, including optional batch information and the yield of the completion.
 
     Parameters
     ----------
@@ -250,43 +574,121 @@ def log_completion_metrics(completion: openai.Completion, receive_time_sec: floa
         The time at which the completion was received.
     batch_number : Optional[int], optional
         The batch number in the context of multiple batch processing, by default None.
+    retries : int, optional
+        The number of times the request was retried before it succeeded, by default 0.
+    flashcards : Optional[int], optional
+        The number of flashcards parsed from the completion. Logged with the flashcards per 1k completion tokens.
+    dropped_lines : Optional[int], optional
+        The number of lines (or structured output items) of the completion that could not be parsed into a flashcard.
     """
     response_time_sec = round(receive_time_sec - completion.created, 3)
+    yield_metrics = {}
+    if flashcards is not None:
+        yield_metrics['flashcards'] = flashcards
+        if completion.usage and completion.usage.completion_tokens:
+            yield_metrics['flashcards_per_1k_tokens'] = round(1000 * flashcards / completion.usage.completion_tokens, 2)
+    if dropped_lines is not None:
+        yield_metrics['dropped_lines'] = dropped_lines
     logger.info(
         "Completion metrics logged",
         response_time_sec=response_time_sec,
-        completion_tokens=format_num(completion.usage.completion_tokens),
-        total_tokens=format_num(completion.usage.total_tokens),
-        batch=batch_number if batch_number is not None else 'N/A'
+        completion_tokens=format_num(completion.usage.completion_tokens) if completion.usage else 'N/A',
+        total_tokens=format_num(completion.usage.total_tokens) if completion.usage else 'N/A',
+        batch=batch_number if batch_number is not None else 'N/A',
+        retries=retries,
+        **yield_metrics
+    )
+
+
+def assemble_streamed_completion(chunks: List[ChatCompletionChunk]) -> ChatCompletion:
+    """
+    Assemble the chunks of a streamed completion into the ChatCompletion the API returns without streaming.
+
+    Parameters
+    ----------
+    chunks : List[ChatCompletionChunk]
+        All chunks of the stream, in the order they were received.
+
+    Returns
+    -------
+    ChatCompletion
+        The completion with the concatenated content and the usage of the final chunk.
+    """
+    content = ''.join(chunk.choices[0].delta.content or '' for chunk in chunks if chunk.choices)
+    finish_reason = next((chunk.choices[0].finish_reason for chunk in reversed(chunks) if chunk.choices and chunk.choices[0].finish_reason),
+                         'stop')
+    return ChatCompletion(
+        id=chunks[0].id,
+        object='chat.completion',
+        created=chunks[0].created,
+        model=chunks[0].model,
+        system_fingerprint=chunks[0].system_fingerprint,
+        choices=[Choice(index=0, finish_reason=finish_reason, message=ChatCompletionMessage(role='assistant', content=content))],
+        usage=chunks[-1].usage
     )
 
 
-def load_prompts(prompt_config: dict, generation_mode: GeneratorMode, lang: SupportedLanguage) -> (str, str, str, str):
+def number_flashcards(batch_flashcards: List[List[Flashcard]]) -> List[Flashcard]:
     """
-    Initializes the message components for the OpenAI API request.
+    Concatenates the flashcards of all batches in fragment order and assigns them consecutive IDs starting from 1.
+
+    Parameters
+    ----------
+    batch_flashcards : List[List[Flashcard]]
+        The flashcards of each batch, in fragment order.
+
+    Returns
+    -------
+    List[Flashcard]
+        All flashcards with IDs that are stable with respect to the fragment order.
     """
-    example_prompt_name = prompt_config.get('example_prompt')
-    additional_prompt_name = prompt_config.get('additional_prompt')
+    flashcards = [flashcard for flashcards in batch_flashcards for flashcard in flashcards]
+    for flashcard_id, flashcard in enumerate(flashcards, start=1):
+        flashcard.id = flashcard_id
+    return flashcards
 
-    system_prompt = read_file(get_system_prompt_path(generation_mode, lang))
-    example_user_prompt = read_file(get_example_prompt_path(example_prompt_name, 'user', lang))
-    example_assistant_prompt = read_file(get_example_prompt_path(example_prompt_name, 'assistant', lang))
-    additional_prompt = read_file(get_additional_prompt_path(additional_prompt_name, lang))
 
-    return system_prompt, example_user_prompt, example_assistant_prompt, additional_prompt
+def compute_fragment_size(model_profile: ModelProfile, token_limits: dict, message_overhead_tokens: int) -> int:
+    """
+    Compute the maximum number of input text tokens per request.
 
+    Parameters
+    ----------
+    model_profile : ModelProfile
+        The profile of the model the requests are sent to.
+    token_limits : dict
+        The token limits, containing the completion limit, the safety margin and the optional maximum fragment size.
+    message_overhead_tokens : int
+        The tokens of each request besides the input text (prompt messages, additional prompt and chat format overhead).
 
-def calculate_prompt_tokens(encoding: tiktoken.Encoding, system_prompt: str, example_user: str, example_assistant: str,
-                            additional_prompt: str, prompt_token_limit: int) -> int:
+    Returns
+    -------
+    int
+        The number of tokens left for the input text in the context window, capped at `max_fragment_tokens` if set.
+
+    Raises
+    ------
+    PromptSizeError
+        If the prompts and the completion leave no room for input text in the context window.
     """
-    Calculate the total tokens of the prompts given the prompts components.
+    fragment_size = model_profile.context_window - token_limits['safety_margin'] - token_limits['completion_limit'] - message_overhead_tokens
+    if fragment_size <= 0:
+        raise PromptSizeError(f"Prompts of {format_num(message_overhead_tokens)} tokens leave no room for input text in the context "
+                              f"window of {model_profile.name}.")
+    if token_limits.get('max_fragment_tokens') is not None:
+        fragment_size = min(fragment_size, token_limits['max_fragment_tokens'])
+    return fragment_size
+
+
+def check_prompt_size(prompt_tokens: int, prompt_token_limit: int) -> None:
+    """
+    Check the total tokens of the prompts against the prompt token limit and log violations.
 
     Raises
     ------
     PromptSizeError
         If the prompts exceeds the token limit.
     """
-    prompt_tokens = len(encoding.encode(system_prompt + example_user + example_assistant + additional_prompt))
     try:
         validate_prompt_size(prompt_tokens, prompt_token_limit)
     except PromptSizeError as e:
@@ -297,7 +699,6 @@ def calculate_prompt_tokens(encoding: tiktoken.Encoding, system_prompt: str, exa
             prompt_token_limit=prompt_token_limit
         )
         raise
-    return prompt_tokens
 
 
 def validate_prompt_size(prompt_size: int, prompt_token_limit: int):
@@ -311,48 +712,3 @@ def validate_prompt_size(prompt_size: int, prompt_token_limit: int):
     """
     if prompt_size > prompt_token_limit:
         raise PromptSizeError(f"Prompt size of {format_num(prompt_size)} exceeds set prompts token limit.")
-
-
-def split_text(encoding: tiktoken.Encoding, text: str, fragment_size: int, overlap_type: str, overlap: float) -> List[str]:
-    """
-    Split a given text into fragments based on specified encoding, fragment size, and overlap settings.
-
-    Parameters
-    ----------
-    encoding : tiktoken.Encoding
-        Encoding object for the desired model.
-    text : str
-        Text to be split into fragments.
-    fragment_size : int
-        Size of each text fragment in tokens.
-    overlap_type : str
-        Type of overlap ('absolute' or 'relative') used in text splitting.
-    overlap : float
-        Value of overlap. Interpreted as absolute or relative based on overlap_type.
-
-    Returns
-    -------
-    List[str]
-        List of text fragments.
-
-    Raises
-    ------
-    ConfigInvalidValueError
-        If the overlap type is neither 'absolute' nor 'relative'.
-    """
-    if overlap_type == 'absolute':
-        abs_overlap = overlap
-    elif overlap_type == 'relative':
-        abs_overlap = fragment_size * overlap
-
-    encoded_text = encoding.encode(text)
-    fragments = []
-
-    current_start = 0
-    while current_start < len(encoded_text):
-        current_end = current_start + fragment_size
-        current_fragment = encoded_text[current_start:current_end]
-        fragments.append(encoding.decode(current_fragment))
-        current_start += int(fragment_size - abs_overlap)
-
-    return fragments
@@ -12,7 +12,9 @@ class IFlashcardGenerator(ABC):
     Interface for flashcard generators.
     """
     @abstractmethod
-    def generate_flashcard_deck(self, flashcards_generator_task: FlashcardGeneratorTaskDto, fn_update_progress: Optional[Callable], *args, **kwargs) -> FlashcardDeck:
+    def generate_flashcard_deck(self, flashcards_generator_task: FlashcardGeneratorTaskDto, fn_update_progress: Optional[Callable],
+                                fn_partial_result: Optional[Callable] = None, checkpoint_id: Optional[str] = None, *args,
+                                **kwargs) -> FlashcardDeck:
         """
         Generate flashcards based on input.
         Parameters
@@ -21,6 +23,10 @@ class IFlashcardGenerator(ABC):
             The DTO containing the parameters for generating flashcards including language, mode, export format, and input.
         fn_update_progress: Optional[Callable]
             Optional callback function.
+        fn_partial_result: Optional[Callable]
+            Optional callback function receiving the flashcards generated so far while the generation is running.
+        checkpoint_id: Optional[str]
+            Optional ID under which progress is checkpointed, so a repeated generation with the same ID resumes where it stopped.
         args
         kwargs
         Returns
@@ -1,81 +1,124 @@
+# src/services/flashcard_service/flashcard_generator_service/flashcard_parsing.py
 import re
-from typing import Optional, List
+from typing import List, NamedTuple, Optional
 
 import structlog
 
-from src.custom_exceptions.internal_exceptions import FlashcardInvalidFormatError, FlashcardPrefixError
 from src.entities.flashcard.flashcard import Flashcard, FlashcardType
 
 logger = structlog.getLogger(__name__)
 
-
-def parse_flashcard(id: int, line: str) -> Flashcard:
+# One match per line: the optional [prefix], the front side up to the first separator, the separator and the rest of the line
+# as back side, so semicolons in the answer stay part of the back side
+_LINE_PATTERN = re.compile(r'^[^\S\n]*(\[[^\]\n]*\])?([^;\n]*)(;?)([^\n]*)', re.MULTILINE)
+_PREFIX_SEPARATOR_PATTERN = re.compile(r'[\s_-]+')
+# Prefixes of the prompts, normalized to lowercase without whitespace, underscores and hyphens
+_PREFIX_TYPES = {
+    'term': FlashcardType.DEFINITION,
+    'definition': FlashcardType.DEFINITION,
+    'concept': FlashcardType.OPEN_ENDED,
+    'criticalthinking': FlashcardType.OPEN_ENDED,
+}
+# The prefixes exactly as the prompts spell them, looked up before normalizing
+_PROMPT_PREFIX_TYPES = {
+    '[Term]': FlashcardType.DEFINITION,
+    '[Concept]': FlashcardType.OPEN_ENDED,
+    '[Critical Thinking]': FlashcardType.OPEN_ENDED,
+    '[CriticalThinking]': FlashcardType.OPEN_ENDED,
+}
+
+MISSING_SEPARATOR = 'missing_separator'
+MISSING_PREFIX = 'missing_prefix'
+UNKNOWN_PREFIX = 'unknown_prefix'
+
+
+class ParseDiagnostic(NamedTuple):
     """
-    Parses a single line into a Flashcard object.
+    A problem with a line of a completion.
 
-    Parameters
+    Attributes
     ----------
-    id : int
-        The flashcard number or ID.
+    line_number : int
+        The number of the line within the completion, starting at 1 (for structured output the position of the flashcard in the
+        array).
+    code : str
+        The kind of problem, e.g. MISSING_SEPARATOR (the line is skipped), MISSING_PREFIX or UNKNOWN_PREFIX (the flashcard of the
+        line has the type UNKNOWN).
     line : str
-        A string representing the flashcard content in 'question;answer' format.
+        The line (for structured output the invalid content).
+    """
+    line_number: int
+    code: str
+    line: str
 
-    Returns
-    -------
-    Flashcard
-        A Flashcard object created from the parsed line.
 
-    Raises
-    ------
-    FlashcardInvalidFormatError
-        If the line does not conform to the expected 'question;answer' format.
+class ParseResult(NamedTuple):
+    """
+    The flashcards parsed from a completion and the diagnostics of the lines that were not well-formed.
     """
-    split_line = line.split(';')
-    if len(split_line) < 2:
-        raise FlashcardInvalidFormatError(f"Invalid format")
+    flashcards: List[Flashcard]
+    diagnostics: List[ParseDiagnostic]
 
-    prefix_match = re.match(r'\[(.*?)\]', split_line[0])
-    if not prefix_match:
-        raise FlashcardPrefixError(f"Missing prefix")
 
-    prefix = prefix_match.group(1).lower()
-    front_side = split_line[0][len(prefix) + 2:].strip()
-    flashcard_type = get_flashcard_type(prefix, id)
+def get_flashcard_type(prefix: Optional[str]) -> FlashcardType:
+    """
+    Determine the type of a flashcard from its prefix (without brackets), FlashcardType.UNKNOWN if it is missing or unknown.
+    """
+    if prefix is None:
+        return FlashcardType.UNKNOWN
+    return _PREFIX_TYPES.get(_PREFIX_SEPARATOR_PATTERN.sub('', prefix).lower(), FlashcardType.UNKNOWN)
 
-    return Flashcard(id, flashcard_type, front_side, split_line[1])
 
+def count_dropped_lines(diagnostics: List[ParseDiagnostic]) -> int:
+    """
+    Count the diagnostics of lines that did not yield a flashcard (flashcards of type UNKNOWN are kept).
+    """
+    return sum(diagnostic.code not in (MISSING_PREFIX, UNKNOWN_PREFIX) for diagnostic in diagnostics)
 
-def get_flashcard_type(prefix: str, number: int) -> FlashcardType:
+
+def parse_completion(content: str, start_id: int = 1, first_line_number: int = 1) -> ParseResult:
     """
-    Determines the type of flashcards based on the prefix.
+    Parse the content of a completion in a single pass.
+
+    Each non-empty line is a flashcard in the format '[prefix] front side; back side'. Malformed lines do not raise, they are
+    reported as diagnostics.
 
     Parameters
     ----------
-    prefix : str
-        The prefix indicating the type of the flashcard.
-    number : int
-        The flashcard number or ID.
+    content : str
+        The content to parse.
+    start_id : int, optional
+        The ID of the first flashcard, by default 1. IDs are consecutive over the parsed flashcards.
+    first_line_number : int, optional
+        The line number of the first line of the content, by default 1, for content that continues earlier content.
 
     Returns
     -------
-    FlashcardType
-        The determined FlashcardType.
-
-    Raises
-    ------
-    FlashcardPrefixError
-        If the prefix does not match any known flashcard types.
+    ParseResult
+        The flashcards and the diagnostics of the content.
     """
-    if "term" in prefix:
-        return FlashcardType.DEFINITION
-    elif "concept" or "critical thinking" in prefix:
-        return FlashcardType.OPEN_ENDED
-    raise FlashcardPrefixError(f"Unexpected prefix", Flashcard(number, FlashcardType.UNKNOWN, '', ''))
+    flashcards = []
+    diagnostics = []
+    for line_number, (prefix, front, separator, back) in enumerate(_LINE_PATTERN.findall(content), first_line_number):
+        if back.endswith('\r'):
+            back = back[:-1]
+        if not separator:
+            if prefix or front.strip():
+                diagnostics.append(ParseDiagnostic(line_number, MISSING_SEPARATOR, prefix + front.rstrip('\r')))
+            continue
+
+        flashcard_type = _PROMPT_PREFIX_TYPES.get(prefix)
+        if flashcard_type is None:
+            flashcard_type = get_flashcard_type(prefix[1:-1] if prefix else None)
+        if flashcard_type == FlashcardType.UNKNOWN:
+            diagnostics.append(ParseDiagnostic(line_number, UNKNOWN_PREFIX if prefix else MISSING_PREFIX, f'{prefix}{front};{back}'))
+        flashcards.append(Flashcard(start_id + len(flashcards), flashcard_type, front.strip(), back))
+    return ParseResult(flashcards, diagnostics)
 
 
 def parse_flashcards(content: str, start_id=1, batch_number: Optional[int] = None) -> List[Flashcard]:
     """
-    Parses the content into a list of Flashcard objects.
+    Parses the content into a list of Flashcard objects. The diagnostics of malformed lines are logged.
 
     Parameters
     ----------
@@ -83,8 +126,6 @@ def parse_flashcards(content: str, start_id=1, batch_number: Optional[int] = Non
         The number of the batch.
     content : str
         The content to parse into flashcards.
-    generation_mode : str
-        The mode of flashcard generation.
     start_id : int, optional
         The starting ID for the flashcards, by default 1.
 
@@ -93,15 +134,77 @@ def parse_flashcards(content: str, start_id=1, batch_number: Optional[int] = Non
     List[Flashcard]
         A list of Flashcard objects generated from the content.
     """
-    cards = []
-    lines = content.replace('\n\n', '\n').split('\n')
-    for cnt, line in enumerate(lines, start=start_id):
-        try:
-            flashcard = parse_flashcard(cnt, line)
-            cards.append(flashcard)
-        except FlashcardPrefixError as e:
-            logger.warning("Flashcard prefix error", error=str(e), batch=batch_number, flashcard_number=cnt)
-            cards.append(e.flashcard)
-        except FlashcardInvalidFormatError as e:
-            logger.error("Flashcard invalid format error", error=str(e), batch=batch_number, flashcard_number=cnt)
-    return cards
+    result = parse_completion(content, start_id)
+    log_diagnostics(result.diagnostics, batch_number)
+    return result.flashcards
+
+
+def log_diagnostics(diagnostics: List[ParseDiagnostic], batch_number: Optional[int] = None):
+    """
+    Log the diagnostics of a completion as one warning, with the line numbers of the malformed lines by problem.
+    """
+    if not diagnostics:
+        return
+    line_numbers = {}
+    for diagnostic in diagnostics:
+        line_numbers.setdefault(diagnostic.code, []).append(diagnostic.line_number)
+    logger.warning("Malformed flashcards", batch=batch_number, **line_numbers)
+
+
+class FlashcardStreamParser:
+    """
+    Incremental flashcard parser for streamed completions.
+
+    Content is fed in arbitrary chunks, each flashcard is parsed as soon as its line is complete. The diagnostics of malformed
+    lines are logged and collected in `diagnostics`.
+
+    Parameters
+    ----------
+    start_id : int, optional
+        The starting ID for the flashcards, by default 1.
+    batch_number : Optional[int]
+        The number of the batch, used for logging.
+    """
+
+    def __init__(self, start_id=1, batch_number: Optional[int] = None):
+        self.batch_number = batch_number
+        self.diagnostics: List[ParseDiagnostic] = []
+        self._next_id = start_id
+        self._next_line_number = 1
+        self._buffer = ''
+
+    def feed(self, chunk: str) -> List[Flashcard]:
+        """
+        Feed the next chunk of the content.
+
+        Returns
+        -------
+        List[Flashcard]
+            The flashcards of all lines completed by the chunk.
+        """
+        self._buffer += chunk
+        end = self._buffer.rfind('\n')
+        if end == -1:
+            return []
+        lines, self._buffer = self._buffer[:end], self._buffer[end + 1:]
+        return self._parse(lines)
+
+    def close(self) -> List[Flashcard]:
+        """
+        Signal the end of the content.
+
+        Returns
+        -------
+        List[Flashcard]
+            The flashcard of the last line, if it is not empty.
+        """
+        line, self._buffer = self._buffer, ''
+        return self._parse(line) if line else []
+
+    def _parse(self, lines: str) -> List[Flashcard]:
+        result = parse_completion(lines, self._next_id, self._next_line_number)
+        self._next_id += len(result.flashcards)
+        self._next_line_number += lines.count('\n') + 1
+        log_diagnostics(result.diagnostics, self.batch_number)
+        self.diagnostics.extend(result.diagnostics)
+        return result.flashcards
@@ -0,0 +1,92 @@
+# src/services/flashcard_service/flashcard_generator_service/model_profiles.py
+from dataclasses import dataclass
+from typing import Dict, List
+
+import tiktoken
+
+from src.custom_exceptions.internal_exceptions import ConfigInvalidValueError
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """
+    The properties of a chat model that determine how much text fits into a single request.
+
+    Attributes
+    ----------
+    name : str
+        The model name (without snapshot suffix).
+    context_window : int
+        The maximum number of tokens of the messages and the completion combined.
+    max_output_tokens : int
+        The maximum number of tokens the model can generate in a single completion.
+    encoding_name : str
+        The name of the tiktoken encoding of the model.
+    tokens_per_message : int
+        The number of tokens the chat format adds to every message (in addition to its role and content).
+    reply_priming_tokens : int
+        The number of tokens the chat format adds once per request to prime the assistant reply.
+    """
+    name: str
+    context_window: int
+    max_output_tokens: int
+    encoding_name: str
+    tokens_per_message: int = 3
+    reply_priming_tokens: int = 3
+
+    def get_encoding(self) -> tiktoken.Encoding:
+        """
+        Get the tiktoken encoding of the model (tiktoken caches encodings, so this is cheap after the first call).
+        """
+        return tiktoken.get_encoding(self.encoding_name)
+
+    def count_message_tokens(self, encoding: tiktoken.Encoding, messages: List[dict]) -> int:
+        """
+        Count the tokens of a list of messages including the per-message overhead of the chat format, but excluding the
+        reply priming.
+
+        Parameters
+        ----------
+        encoding : tiktoken.Encoding
+            The encoding of the model.
+        messages : List[dict]
+            Messages, each message being a dictionary with 'role' and 'content'.
+
+        Returns
+        -------
+        int
+            The number of tokens the messages occupy in the context window.
+        """
+        return sum(
+            self.tokens_per_message + len(encoding.encode(message['role'])) + len(encoding.encode(message['content']))
+            for message in messages
+        )
+
+
+MODEL_PROFILES: Dict[str, ModelProfile] = {
+    profile.name: profile for profile in [
+        ModelProfile('gpt-4o-mini', context_window=128_000, max_output_tokens=16_384, encoding_name='o200k_base'),
+        ModelProfile('gpt-4o', context_window=128_000, max_output_tokens=16_384, encoding_name='o200k_base'),
+        ModelProfile('gpt-4-turbo', context_window=128_000, max_output_tokens=4_096, encoding_name='cl100k_base'),
+        ModelProfile('gpt-4', context_window=8_192, max_output_tokens=8_192, encoding_name='cl100k_base'),
+        ModelProfile('gpt-3.5-turbo', context_window=16_385, max_output_tokens=4_096, encoding_name='cl100k_base'),
+    ]
+}
+
+
+def get_model_profile(model_name: str) -> ModelProfile:
+    """
+    Get the profile of a model. Snapshot names (e.g. 'gpt-4o-mini-2024-07-18') resolve to the profile of their model.
+
+    Raises
+    ------
+    ConfigInvalidValueError
+        If no profile is registered for the model.
+    """
+    if model_name in MODEL_PROFILES:
+        return MODEL_PROFILES[model_name]
+    # The longest matching name wins, so 'gpt-4o-mini-...' does not resolve to 'gpt-4o' or 'gpt-4'
+    for name in sorted(MODEL_PROFILES, key=len, reverse=True):
+        if model_name.startswith(name + '-'):
+            return MODEL_PROFILES[name]
+    raise ConfigInvalidValueError(f"No model profile registered for model: {model_name}")
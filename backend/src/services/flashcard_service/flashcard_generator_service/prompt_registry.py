@@ -0,0 +1,151 @@
+# src/services/flashcard_service/flashcard_generator_service/prompt_registry.py
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+import structlog
+
+from src.enums.generatorOptions import GeneratorMode, SupportedLanguage
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import ModelProfile
+from src.services.flashcard_service.flashcard_generator_service.structured_output import LINES, JSON_SCHEMA, \
+    convert_example_to_structured_output
+from src.utils.file_util import read_file
+from src.utils.path_util import get_system_prompt_path, get_example_prompt_path, get_additional_prompt_path
+
+logger = structlog.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PromptSet:
+    """
+    The static prompts used for one combination of generator mode and language.
+
+    Attributes
+    ----------
+    system : str
+        The system prompt.
+    example_user : str
+        The example user prompt.
+    example_assistant : str
+        The example assistant response.
+    additional : str
+        The prompt inserted at the top of the input text.
+    file_mtimes : Tuple[float, ...]
+        The modification times of the prompt files when they were read.
+    """
+    system: str
+    example_user: str
+    example_assistant: str
+    additional: str
+    file_mtimes: Tuple[float, ...] = field(repr=False)
+
+
+class PromptRegistry:
+    """
+    Process-wide registry of the prompts of all generator modes and languages and their token counts.
+
+    All combinations are loaded once when the registry is created. Token counts are computed once per model. Both are
+    only invalidated when the modification time of one of the underlying asset files changes.
+
+    Parameters
+    ----------
+    prompt_config : dict
+        The prompt configuration, naming the example and additional prompt to use.
+    output_format : str
+        The output format of the generation. With JSON_SCHEMA the example assistant response is converted to structured output.
+    """
+
+    def __init__(self, prompt_config: dict, output_format: str = LINES):
+        self.example_prompt_name = prompt_config.get('example_prompt')
+        self.additional_prompt_name = prompt_config.get('additional_prompt')
+        self.output_format = output_format
+        self._lock = threading.Lock()
+        self._prompts: Dict[Tuple[GeneratorMode, SupportedLanguage], PromptSet] = {}
+        self._token_counts: Dict[Tuple[GeneratorMode, SupportedLanguage, str], Tuple[int, int, int]] = {}
+        self.load_all()
+
+    def load_all(self) -> None:
+        """
+        Load the prompts of all combinations of generator mode and language.
+        Combinations without prompt files are skipped and fail only when they are requested.
+        """
+        for mode in GeneratorMode:
+            for lang in SupportedLanguage:
+                try:
+                    self.get_prompts(mode, lang)
+                except OSError as e:
+                    logger.warning("Prompts not available", generation_mode=mode, language=lang, error=str(e))
+
+    def _prompt_paths(self, mode: GeneratorMode, lang: SupportedLanguage) -> list:
+        return [
+            get_system_prompt_path(mode, lang),
+            get_example_prompt_path(self.example_prompt_name, 'user', lang),
+            get_example_prompt_path(self.example_prompt_name, 'assistant', lang),
+            get_additional_prompt_path(self.additional_prompt_name, lang),
+        ]
+
+    def get_prompts(self, mode: GeneratorMode, lang: SupportedLanguage) -> PromptSet:
+        """
+        Get the prompts of a generator mode and language, reloading them if one of the files changed since they were read.
+
+        Raises
+        ------
+        FileNotFoundError
+            If a prompt file of the combination does not exist.
+        """
+        paths = self._prompt_paths(mode, lang)
+        file_mtimes = tuple(os.stat(path).st_mtime for path in paths)
+        prompts = self._prompts.get((mode, lang))
+        if prompts is not None and prompts.file_mtimes == file_mtimes:
+            return prompts
+
+        system, example_user, example_assistant, additional = [read_file(str(path)) for path in paths]
+        if self.output_format == JSON_SCHEMA:
+            example_assistant = convert_example_to_structured_output(example_assistant)
+        prompts = PromptSet(system, example_user, example_assistant, additional, file_mtimes)
+        with self._lock:
+            self._prompts[(mode, lang)] = prompts
+            # Token counts of outdated prompts are recomputed lazily
+            for key in [key for key in self._token_counts if key[:2] == (mode, lang)]:
+                del self._token_counts[key]
+        logger.info("Prompts loaded", generation_mode=mode, language=lang)
+        return prompts
+
+    def _get_token_counts(self, mode: GeneratorMode, lang: SupportedLanguage, model_profile: ModelProfile) -> Tuple[int, int, int]:
+        prompts = self.get_prompts(mode, lang)
+        key = (mode, lang, model_profile.name)
+        token_counts = self._token_counts.get(key)
+        if token_counts is None:
+            encoding = model_profile.get_encoding()
+            prompt_tokens = len(encoding.encode(prompts.system + prompts.example_user + prompts.example_assistant + prompts.additional))
+            # Equivalent to Messages.compute_prompt_tokens for the three static messages
+            message_prompt_tokens = model_profile.reply_priming_tokens + model_profile.count_message_tokens(encoding, [
+                {'role': 'system', 'content': prompts.system},
+                {'role': 'user', 'content': prompts.example_user},
+                {'role': 'assistant', 'content': prompts.example_assistant}
+            ])
+            additional_prompt_tokens = len(encoding.encode(prompts.additional))
+            token_counts = (prompt_tokens, message_prompt_tokens, additional_prompt_tokens)
+            with self._lock:
+                self._token_counts[key] = token_counts
+        return token_counts
+
+    def get_prompt_tokens(self, mode: GeneratorMode, lang: SupportedLanguage, model_profile: ModelProfile) -> int:
+        """
+        Get the number of tokens of all static prompts (system, examples and additional prompt) combined.
+        """
+        return self._get_token_counts(mode, lang, model_profile)[0]
+
+    def get_message_prompt_tokens(self, mode: GeneratorMode, lang: SupportedLanguage, model_profile: ModelProfile) -> int:
+        """
+        Get the number of tokens of the static messages (system and example messages) including the chat format overhead,
+        as computed by `Messages.compute_prompt_tokens`.
+        """
+        return self._get_token_counts(mode, lang, model_profile)[1]
+
+    def get_additional_prompt_tokens(self, mode: GeneratorMode, lang: SupportedLanguage, model_profile: ModelProfile) -> int:
+        """
+        Get the number of tokens of the additional prompt inserted at the top of each input text.
+        """
+        return self._get_token_counts(mode, lang, model_profile)[2]
@@ -5,6 +5,7 @@ import structlog
 
 from src.utils.path_util import get_config_dir
 from src.custom_exceptions.internal_exceptions import ConfigInvalidValueError, ConfigFieldNotFoundError
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import ModelProfile, get_model_profile
 from src.utils.file_util import load_yaml_config
 from src.utils.env_util import get_env_variable
 
@@ -15,9 +16,23 @@ logger = structlog.getLogger(__name__)
 class QuizardConfig:
     _config = load_yaml_config(config_dir, get_env_variable("QUIZARD_CONFIG"))
     _model_config = None
+    _model_profile = None
     _token_limits = None
     _text_splitting_config = None
     _prompt_config = None
+    _generation_config = None
+    _deduplication_config = None
+    _rate_limit_config = None
+    _completion_cache_config = None
+    _retry_config = None
+    _checkpoint_config = None
+    _partial_result_config = None
+    _bulk_generation_config = None
+    _fake_openai_config = None
+    _serialization_config = None
+    _export_cache_config = None
+    _progress_events_config = None
+    _task_status_cache_config = None
 
     @classmethod
     def get_config(cls):
@@ -32,17 +47,24 @@ class QuizardConfig:
             cls.validate_model_config(cls._model_config)
         return cls._model_config
 
+    @classmethod
+    def get_model_profile(cls) -> ModelProfile:
+        if cls._model_profile is None:
+            cls._model_profile = get_model_profile(cls.get_model_config()['model_name'])
+        return cls._model_profile
+
     @classmethod
     def get_token_limits(cls) -> dict:
         if cls._token_limits is None:
             cls._token_limits = cls.get_config().get('token_limits')
-            cls.validate_token_limits(cls._token_limits)
+            cls.validate_token_limits(cls._token_limits, cls.get_model_profile())
         return cls._token_limits
 
     @classmethod
     def get_text_splitting_config(cls) -> dict:
         if cls._text_splitting_config is None:
             cls._text_splitting_config = cls.get_config().get('text_splitting')
+            cls.validate_text_splitting_config(cls._text_splitting_config)
         return cls._text_splitting_config
 
     @classmethod
@@ -51,6 +73,97 @@ class QuizardConfig:
             cls._prompt_config = cls.get_config().get('prompts')
         return cls._prompt_config
 
+    @classmethod
+    def get_generation_config(cls) -> dict:
+        if cls._generation_config is None:
+            cls._generation_config = cls.get_config().get('generation')
+            cls.validate_generation_config(cls._generation_config)
+        return cls._generation_config
+
+    @classmethod
+    def get_deduplication_config(cls) -> dict:
+        if cls._deduplication_config is None:
+            cls._deduplication_config = cls.get_config().get('deduplication')
+            cls.validate_deduplication_config(cls._deduplication_config)
+        return cls._deduplication_config
+
+    @classmethod
+    def get_rate_limit_config(cls) -> dict:
+        if cls._rate_limit_config is None:
+            cls._rate_limit_config = cls.get_config().get('rate_limits')
+            cls.validate_rate_limit_config(cls._rate_limit_config)
+        return cls._rate_limit_config
+
+    @classmethod
+    def get_completion_cache_config(cls) -> dict:
+        if cls._completion_cache_config is None:
+            cls._completion_cache_config = cls.get_config().get('completion_cache')
+            cls.validate_completion_cache_config(cls._completion_cache_config)
+        return cls._completion_cache_config
+
+    @classmethod
+    def get_retry_config(cls) -> dict:
+        if cls._retry_config is None:
+            cls._retry_config = cls.get_config().get('retries')
+            cls.validate_retry_config(cls._retry_config)
+        return cls._retry_config
+
+    @classmethod
+    def get_checkpoint_config(cls) -> dict:
+        if cls._checkpoint_config is None:
+            cls._checkpoint_config = cls.get_config().get('checkpoints')
+            cls.validate_checkpoint_config(cls._checkpoint_config)
+        return cls._checkpoint_config
+
+    @classmethod
+    def get_partial_result_config(cls) -> dict:
+        if cls._partial_result_config is None:
+            cls._partial_result_config = cls.get_config().get('partial_results')
+            cls.validate_partial_result_config(cls._partial_result_config)
+        return cls._partial_result_config
+
+    @classmethod
+    def get_bulk_generation_config(cls) -> dict:
+        if cls._bulk_generation_config is None:
+            cls._bulk_generation_config = cls.get_config().get('bulk_generation')
+            cls.validate_bulk_generation_config(cls._bulk_generation_config)
+        return cls._bulk_generation_config
+
+    @classmethod
+    def get_fake_openai_config(cls) -> dict:
+        if cls._fake_openai_config is None:
+            cls._fake_openai_config = cls.get_config().get('fake_openai')
+            cls.validate_fake_openai_config(cls._fake_openai_config)
+        return cls._fake_openai_config
+
+    @classmethod
+    def get_serialization_config(cls) -> dict:
+        if cls._serialization_config is None:
+            cls._serialization_config = cls.get_config().get('serialization')
+            cls.validate_serialization_config(cls._serialization_config)
+        return cls._serialization_config
+
+    @classmethod
+    def get_export_cache_config(cls) -> dict:
+        if cls._export_cache_config is None:
+            cls._export_cache_config = cls.get_config().get('export_cache')
+            cls.validate_export_cache_config(cls._export_cache_config)
+        return cls._export_cache_config
+
+    @classmethod
+    def get_progress_events_config(cls) -> dict:
+        if cls._progress_events_config is None:
+            cls._progress_events_config = cls.get_config().get('progress_events')
+            cls.validate_progress_events_config(cls._progress_events_config)
+        return cls._progress_events_config
+
+    @classmethod
+    def get_task_status_cache_config(cls) -> dict:
+        if cls._task_status_cache_config is None:
+            cls._task_status_cache_config = cls.get_config().get('task_status_cache')
+            cls.validate_task_status_cache_config(cls._task_status_cache_config)
+        return cls._task_status_cache_config
+
     @staticmethod
     def validate_model_config(config: dict) -> None:
         validate_field(config, 'model_name', str)
@@ -60,26 +173,178 @@ class QuizardConfig:
         validate_field(config, 'presence_penalty', float, 0.0, 1.0)
 
     @staticmethod
-    def validate_token_limits(config: dict) -> None:
-        validate_field(config, 'app_limit', int, 0)
+    def validate_token_limits(config: dict, model_profile: ModelProfile) -> None:
         validate_field(config, 'prompt_limit', int, 0)
         validate_field(config, 'completion_limit', int, 0)
-        if config['app_limit'] - (config['prompt_limit'] + config['completion_limit']) <= 0:
-            raise ConfigInvalidValueError("The sum of the prompts token and the completion token limits exceeds the total token limit of the app.")
+        validate_field(config, 'safety_margin', int, 0)
+        if config.get('max_fragment_tokens') is not None:
+            validate_field(config, 'max_fragment_tokens', int, 1)
+            if config['max_fragment_tokens'] < 1:
+                raise ConfigInvalidValueError("The maximum fragment size must be at least one token.")
+        if config['completion_limit'] > model_profile.max_output_tokens:
+            raise ConfigInvalidValueError(f"The completion token limit exceeds the maximum output of {model_profile.name}.")
+        if model_profile.context_window - (config['prompt_limit'] + config['completion_limit'] + config['safety_margin']) <= 0:
+            raise ConfigInvalidValueError(f"The sum of the prompts token and the completion token limits exceeds the context window of "
+                                          f"{model_profile.name}.")
 
     @staticmethod
     def validate_text_splitting_config(config: dict) -> None:
+        validate_field(config, 'splitter', str)
+        if config['splitter'] not in ['fixed', 'structural']:
+            raise ConfigInvalidValueError("Invalid splitter")
         validate_field(config, 'overlap_type', str)
-        validate_field(config, 'relative_overlap', float, 0.0, 1.0)
-        validate_field(config, 'absolute_overlap', int, 0)
+        validate_field(config, 'overlap', (int, float), 0)
         if config['overlap_type'] not in ['relative', 'absolute']:
             raise ConfigInvalidValueError("Invalid overlap type")
+        if config['overlap_type'] == 'relative' and config['overlap'] >= 1:
+            raise ConfigInvalidValueError("Relative overlap must be in range [0, 1)")
+
+    @staticmethod
+    def validate_generation_config(config: dict) -> None:
+        validate_field(config, 'max_concurrent_requests', int, 1)
+        if config['max_concurrent_requests'] < 1:
+            raise ConfigInvalidValueError("At least one concurrent request is required for flashcard generation.")
+        validate_field(config, 'stream_completions', bool)
+        validate_field(config, 'output_format', str)
+        if config['output_format'] not in ['lines', 'json_schema']:
+            raise ConfigInvalidValueError("Invalid output format")
+
+    @staticmethod
+    def validate_deduplication_config(config: dict) -> None:
+        validate_field(config, 'enabled', bool)
+        validate_field(config, 'similarity_threshold', (int, float))
+        if not 0 < config['similarity_threshold'] <= 1:
+            raise ConfigInvalidValueError("The duplicate similarity threshold must be in (0, 1].")
+
+    @staticmethod
+    def validate_rate_limit_config(config: dict) -> None:
+        validate_field(config, 'requests_per_minute', int, 1)
+        validate_field(config, 'tokens_per_minute', int, 1)
+        validate_field(config, 'max_wait_sec', (int, float), 0)
+        if config['requests_per_minute'] < 1 or config['tokens_per_minute'] < 1:
+            raise ConfigInvalidValueError("Rate limits must allow at least one request and token per minute.")
+
+    @staticmethod
+    def validate_completion_cache_config(config: dict) -> None:
+        validate_field(config, 'backend', str)
+        validate_field(config, 'ttl_sec', int, 1)
+        validate_field(config, 'max_entries', int, 1)
+        if config['backend'] not in ['redis', 'local', 'none']:
+            raise ConfigInvalidValueError("Invalid completion cache backend")
 
     @staticmethod
     def validate_prompt_config(config: dict) -> None:
         validate_field(config, 'example_prompt', str)
         validate_field(config, 'additional_prompt', str)
 
+    @staticmethod
+    def validate_retry_config(config: dict) -> None:
+        validate_field(config, 'timeout_sec', (int, float), 0)
+        validate_field(config, 'policies', dict)
+        for error_class, policy in config['policies'].items():
+            if error_class not in ['rate_limit', 'server_error', 'timeout', 'connection_error']:
+                raise ConfigInvalidValueError(f"Invalid retry policy: {error_class}")
+            validate_field(policy, 'max_attempts', int, 1)
+            validate_field(policy, 'base_delay_sec', (int, float), 0)
+            validate_field(policy, 'max_delay_sec', (int, float), 0)
+            if 'max_retry_after_sec' in policy:
+                validate_field(policy, 'max_retry_after_sec', (int, float), 0)
+            if policy['max_attempts'] < 1:
+                raise ConfigInvalidValueError(f"Retry policy {error_class} must allow at least one attempt.")
+
+    @staticmethod
+    def validate_checkpoint_config(config: dict) -> None:
+        validate_field(config, 'backend', str)
+        validate_field(config, 'ttl_sec', int, 1)
+        if config['backend'] not in ['redis', 'local', 'none']:
+            raise ConfigInvalidValueError("Invalid checkpoint backend")
+
+    @staticmethod
+    def validate_partial_result_config(config: dict) -> None:
+        validate_field(config, 'backend', str)
+        validate_field(config, 'ttl_sec', int, 1)
+        if config['backend'] not in ['redis', 'local', 'none']:
+            raise ConfigInvalidValueError("Invalid partial results backend")
+
+    @staticmethod
+    def validate_bulk_generation_config(config: dict) -> None:
+        validate_field(config, 'backend', str)
+        validate_field(config, 'local_batch_dir', str)
+        validate_field(config, 'completion_window', str)
+        validate_field(config, 'poll_interval_sec', int, 1)
+        if config['backend'] not in ['openai', 'local']:
+            raise ConfigInvalidValueError("Invalid bulk generation backend")
+        if config['poll_interval_sec'] < 1:
+            raise ConfigInvalidValueError("The poll interval must be at least one second.")
+
+    @staticmethod
+    def validate_fake_openai_config(config: dict) -> None:
+        validate_field(config, 'ttft_median_sec', (int, float))
+        validate_field(config, 'ttft_sigma', (int, float))
+        validate_field(config, 'tokens_per_sec', (int, float))
+        validate_field(config, 'flashcards_per_completion', int)
+        validate_field(config, 'rate_limit_error_rate', (int, float))
+        validate_field(config, 'server_error_rate', (int, float))
+        validate_field(config, 'retry_after_sec', (int, float))
+        if config.get('seed') is not None:
+            validate_field(config, 'seed', int)
+        if config['ttft_median_sec'] < 0 or config['ttft_sigma'] < 0 or config['retry_after_sec'] < 0:
+            raise ConfigInvalidValueError("The latencies of the fake OpenAI client must not be negative.")
+        if config['tokens_per_sec'] <= 0 or config['flashcards_per_completion'] < 1:
+            raise ConfigInvalidValueError("The generation speed and the flashcards per completion must be positive.")
+        if not 0 <= config['rate_limit_error_rate'] + config['server_error_rate'] <= 1 \
+                or config['rate_limit_error_rate'] < 0 or config['server_error_rate'] < 0:
+            raise ConfigInvalidValueError("The error rates of the fake OpenAI client must be probabilities.")
+
+    @staticmethod
+    def validate_serialization_config(config: dict) -> None:
+        validate_field(config, 'compression', str)
+        validate_field(config, 'compression_threshold_bytes', int)
+        validate_field(config, 'compression_level', int)
+        if config['compression'] not in ['zstd', 'zlib', 'none']:
+            raise ConfigInvalidValueError("Invalid compression of the serialization")
+        if config['compression_threshold_bytes'] < 0:
+            raise ConfigInvalidValueError("The compression threshold must not be negative.")
+        if not 1 <= config['compression_level'] <= 9:
+            raise ConfigInvalidValueError("The compression level must be between 1 and 9.")
+
+    @staticmethod
+    def validate_export_cache_config(config: dict) -> None:
+        validate_field(config, 'backend', str)
+        validate_field(config, 'cache_dir', str)
+        validate_field(config, 'ttl_sec', int)
+        validate_field(config, 'max_bytes', int)
+        validate_field(config, 'offload', str)
+        if config['backend'] not in ['disk', 'local', 'none']:
+            raise ConfigInvalidValueError("Invalid export cache backend")
+        if config['ttl_sec'] < 1 or config['max_bytes'] < 1:
+            raise ConfigInvalidValueError("The time to live and the size of the export cache must be positive.")
+        if config['offload'] not in ['x-accel-redirect', 'x-sendfile', 'none']:
+            raise ConfigInvalidValueError("Invalid export offload")
+        if config['offload'] == 'x-accel-redirect':
+            validate_field(config, 'x_accel_redirect_location', str)
+
+    @staticmethod
+    def validate_progress_events_config(config: dict) -> None:
+        validate_field(config, 'backend', str)
+        validate_field(config, 'channel_prefix', str)
+        validate_field(config, 'heartbeat_sec', (int, float))
+        validate_field(config, 'max_queued_events', int)
+        if config['backend'] not in ['redis', 'local', 'none']:
+            raise ConfigInvalidValueError("Invalid progress events backend")
+        if config['heartbeat_sec'] <= 0:
+            raise ConfigInvalidValueError("The heartbeat interval of the progress events must be positive.")
+        if config['max_queued_events'] < 1:
+            raise ConfigInvalidValueError("The maximum number of queued progress events must be at least 1.")
+
+    @staticmethod
+    def validate_task_status_cache_config(config: dict) -> None:
+        validate_field(config, 'enabled', bool)
+        validate_field(config, 'ttl_sec', int)
+        validate_field(config, 'max_entries', int)
+        if config['ttl_sec'] < 1 or config['max_entries'] < 1:
+            raise ConfigInvalidValueError("The time to live and the size of the task status cache must be positive.")
+
 
 def validate_field(config: dict, field: str, expected_type: type, min_value=None, max_value=None) -> None:
     if field not in config:
@@ -0,0 +1,134 @@
+# src/services/flashcard_service/flashcard_generator_service/retry_policy.py
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import openai
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy for one class of transient errors: exponential backoff with full jitter.
+
+    Attributes
+    ----------
+    max_attempts : int
+        The maximum number of attempts of a request, including the first one (1 = no retries).
+    base_delay_sec : float
+        The upper bound of the delay before the first retry, doubled with every further retry.
+    max_delay_sec : float
+        The upper bound of the backoff delay.
+    max_retry_after_sec : Optional[float]
+        The longest delay requested by the server via Retry-After that is honored, None for `max_delay_sec`. A request asked
+        to wait longer is not retried, so a worker is not blocked for an unbounded time.
+    """
+    max_attempts: int
+    base_delay_sec: float
+    max_delay_sec: float
+    max_retry_after_sec: Optional[float] = None
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Compute the delay before the next attempt.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the attempt that failed, starting from 1.
+        retry_after : Optional[float]
+            The delay in seconds requested by the server via the Retry-After header. Takes precedence over a shorter backoff.
+
+        Returns
+        -------
+        Optional[float]
+            The delay in seconds, or None if the requested delay exceeds `max_retry_after_sec`.
+        """
+        delay = random.uniform(0, min(self.max_delay_sec, self.base_delay_sec * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            max_retry_after_sec = self.max_retry_after_sec if self.max_retry_after_sec is not None else self.max_delay_sec
+            if retry_after > max_retry_after_sec:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """
+    Map an OpenAI error to the name of its retry policy in the config, or None if the error is not transient.
+    """
+    # APITimeoutError is a subclass of APIConnectionError and is checked first
+    if isinstance(error, openai.APITimeoutError):
+        return 'timeout'
+    if isinstance(error, openai.APIConnectionError):
+        return 'connection_error'
+    if isinstance(error, openai.RateLimitError):
+        return 'rate_limit'
+    if isinstance(error, openai.InternalServerError):
+        return 'server_error'
+    return None
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Get the delay in seconds requested by the Retry-After (or retry-after-ms) header of an error response, if any.
+    """
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if 'retry-after-ms' in headers:
+            return float(headers['retry-after-ms']) / 1000
+        if 'retry-after' in headers:
+            retry_after = headers['retry-after']
+            try:
+                return float(retry_after)
+            except ValueError:
+                # The header may also contain an HTTP date
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class RetryPolicies:
+    """
+    The retry policies of all classes of transient errors.
+
+    Parameters
+    ----------
+    policies : Dict[str, RetryPolicy]
+        The retry policy of each error class (see `classify_error`). Errors of classes without a policy are not retried.
+    """
+
+    def __init__(self, policies: Dict[str, RetryPolicy]):
+        self.policies = policies
+
+    @classmethod
+    def from_config(cls, retry_config: dict) -> 'RetryPolicies':
+        return cls({error_class: RetryPolicy(**policy) for error_class, policy in retry_config['policies'].items()})
+
+    def get_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Get the delay before retrying a request that failed with the given error.
+
+        Parameters
+        ----------
+        error : Exception
+            The error the attempt failed with.
+        attempt : int
+            The number of the attempt that failed, starting from 1.
+
+        Returns
+        -------
+        Optional[float]
+            The delay in seconds, or None if the request must not be retried (not transient, out of attempts or the server
+            requested a delay beyond the cap).
+        """
+        policy = self.policies.get(classify_error(error))
+        if policy is None or attempt >= policy.max_attempts:
+            return None
+        return policy.compute_delay(attempt, get_retry_after(error))
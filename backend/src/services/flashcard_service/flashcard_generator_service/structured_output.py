@@ -0,0 +1,221 @@
+# src/services/flashcard_service/flashcard_generator_service/structured_output.py
+import json
+import re
+from typing import List, Optional
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import ParseDiagnostic, ParseResult, \
+    UNKNOWN_PREFIX, get_flashcard_type, log_diagnostics
+
+try:
+    # orjson decodes whole completions several times faster than the json module, but is not required
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Output formats of the generation (config generation.output_format)
+LINES = 'lines'
+JSON_SCHEMA = 'json_schema'
+
+INVALID_JSON = 'invalid_json'
+INVALID_FLASHCARD = 'invalid_flashcard'
+
+# The prefixes the prompts ask for, as values of the prefix field
+FLASHCARD_PREFIXES = ['Term', 'Concept', 'Critical Thinking']
+
+# Structured output of the chat completions API, the model can only generate content matching the schema
+FLASHCARD_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'flashcards',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'flashcards': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'prefix': {'type': 'string', 'enum': FLASHCARD_PREFIXES},
+                            'front': {'type': 'string'},
+                            'back': {'type': 'string'},
+                        },
+                        'required': ['prefix', 'front', 'back'],
+                        'additionalProperties': False,
+                    },
+                },
+            },
+            'required': ['flashcards'],
+            'additionalProperties': False,
+        },
+    },
+}
+
+_ARRAY_START_PATTERN = re.compile(r'\{\s*"flashcards"\s*:\s*\[')
+_EXAMPLE_LINE_PATTERN = re.compile(r'^\s*\[([^\]\n]*)\]([^;\n]*);([^\n]*)$', re.MULTILINE)
+_decoder = json.JSONDecoder()
+
+
+def convert_example_to_structured_output(content: str) -> str:
+    """
+    Convert an example completion in the line format ('[prefix] front side; back side') to the structured output format, so the
+    example assistant message matches the completions requested with FLASHCARD_RESPONSE_FORMAT.
+    """
+    flashcards = [{'prefix': prefix, 'front': front.strip(), 'back': back.strip()}
+                  for prefix, front, back in _EXAMPLE_LINE_PATTERN.findall(content)]
+    return json.dumps({'flashcards': flashcards}, ensure_ascii=False)
+
+
+def _to_flashcard(item, flashcard_id: int, number: int, diagnostics: List[ParseDiagnostic]) -> Optional[Flashcard]:
+    if not isinstance(item, dict) or not isinstance(item.get('front'), str) or not isinstance(item.get('back'), str) \
+            or not item['front'].strip():
+        diagnostics.append(ParseDiagnostic(number, INVALID_FLASHCARD, str(item)))
+        return None
+    prefix = item.get('prefix')
+    flashcard_type = get_flashcard_type(prefix if isinstance(prefix, str) else None)
+    if flashcard_type == FlashcardType.UNKNOWN:
+        diagnostics.append(ParseDiagnostic(number, UNKNOWN_PREFIX, str(item)))
+    return Flashcard(flashcard_id, flashcard_type, item['front'].strip(), item['back'])
+
+
+def parse_structured_completion(content: str, start_id: int = 1) -> ParseResult:
+    """
+    Parse the content of a completion generated with FLASHCARD_RESPONSE_FORMAT.
+
+    The content is decoded as a whole. Content that is not valid JSON (e.g. a completion cut off at the token limit) is reported
+    as INVALID_JSON, and the flashcards completed before the error are kept. The line number of the diagnostics of structured
+    output is the position of the flashcard in the array, starting at 1.
+
+    Parameters
+    ----------
+    content : str
+        The content to parse.
+    start_id : int, optional
+        The ID of the first flashcard, by default 1.
+
+    Returns
+    -------
+    ParseResult
+        The flashcards and the diagnostics of the content.
+    """
+    try:
+        document = _loads(content)
+    except ValueError:
+        parser = StructuredFlashcardStreamParser(start_id, log=False)
+        flashcards = parser.feed(content) + parser.close()
+        return ParseResult(flashcards, parser.diagnostics)
+
+    items = document.get('flashcards') if isinstance(document, dict) else None
+    if not isinstance(items, list):
+        return ParseResult([], [ParseDiagnostic(1, INVALID_JSON, content)])
+    flashcards = []
+    diagnostics = []
+    for number, item in enumerate(items, 1):
+        flashcard = _to_flashcard(item, start_id + len(flashcards), number, diagnostics)
+        if flashcard is not None:
+            flashcards.append(flashcard)
+    return ParseResult(flashcards, diagnostics)
+
+
+def parse_structured_flashcards(content: str, start_id=1, batch_number: Optional[int] = None) -> List[Flashcard]:
+    """
+    Parse the content of a completion generated with FLASHCARD_RESPONSE_FORMAT into a list of Flashcard objects, the counterpart
+    of `parse_flashcards` for the line format. The diagnostics of invalid content are logged.
+    """
+    result = parse_structured_completion(content, start_id)
+    log_diagnostics(result.diagnostics, batch_number)
+    return result.flashcards
+
+
+class StructuredFlashcardStreamParser:
+    """
+    Incremental parser for streamed completions generated with FLASHCARD_RESPONSE_FORMAT, with the interface of
+    `FlashcardStreamParser`.
+
+    Each flashcard is decoded as soon as its object in the flashcards array is complete. The diagnostics of invalid content are
+    logged when the parser is closed and collected in `diagnostics`.
+
+    Parameters
+    ----------
+    start_id : int, optional
+        The starting ID for the flashcards, by default 1.
+    batch_number : Optional[int]
+        The number of the batch, used for logging.
+    log : bool
+        Whether to log the diagnostics when the parser is closed.
+    """
+
+    def __init__(self, start_id=1, batch_number: Optional[int] = None, log: bool = True):
+        self.batch_number = batch_number
+        self.diagnostics: List[ParseDiagnostic] = []
+        self._log = log
+        self._next_id = start_id
+        self._number = 0
+        self._buffer = ''
+        # Position of the next flashcard object in the buffer, None until the start of the array was received
+        self._position: Optional[int] = None
+        self._complete = False
+
+    def feed(self, chunk: str) -> List[Flashcard]:
+        """
+        Feed the next chunk of the content.
+
+        Returns
+        -------
+        List[Flashcard]
+            The flashcards whose objects were completed by the chunk.
+        """
+        if self._complete:
+            return []
+        self._buffer += chunk
+        if self._position is None:
+            match = _ARRAY_START_PATTERN.search(self._buffer)
+            if match is None:
+                return []
+            self._position = match.end()
+        elif '}' not in chunk and ']' not in chunk:
+            # Neither an object nor the array can be complete
+            return []
+
+        flashcards = []
+        buffer = self._buffer
+        while True:
+            # Skip the whitespace and the separator before the next object
+            while self._position < len(buffer) and buffer[self._position] in ' \t\r\n,':
+                self._position += 1
+            if self._position == len(buffer):
+                break
+            if buffer[self._position] == ']':
+                self._complete = True
+                break
+            try:
+                item, self._position = _decoder.raw_decode(buffer, self._position)
+            except json.JSONDecodeError:
+                # The object is not complete yet
+                break
+            self._number += 1
+            flashcard = _to_flashcard(item, self._next_id, self._number, self.diagnostics)
+            if flashcard is not None:
+                self._next_id += 1
+                flashcards.append(flashcard)
+        # Decoded objects are not needed anymore
+        self._buffer, self._position = buffer[self._position:], 0
+        return flashcards
+
+    def close(self) -> List[Flashcard]:
+        """
+        Signal the end of the content. Content that ends before the flashcards array is reported as INVALID_JSON.
+
+        Returns
+        -------
+        List[Flashcard]
+            Always empty, flashcards are returned by `feed` as soon as they are complete.
+        """
+        if not self._complete:
+            self.diagnostics.append(ParseDiagnostic(self._number + 1, INVALID_JSON, self._buffer[self._position or 0:]))
+        if self._log:
+            log_diagnostics(self.diagnostics, self.batch_number)
+        return []
@@ -0,0 +1,215 @@
+# src/services/flashcard_service/flashcard_generator_service/text_splitting.py
+import re
+from bisect import bisect_right
+from typing import List, NamedTuple, Tuple
+
+import tiktoken
+
+from src.custom_exceptions.internal_exceptions import ConfigInvalidValueError
+
+
+class TokenizedText:
+    """
+    A text encoded exactly once, with a map from token indices to character offsets.
+
+    Token counts and fragments of the text are derived from the single token array, fragments are sliced from the original
+    string instead of being decoded from tokens.
+
+    Parameters
+    ----------
+    text : str
+        The text to tokenize.
+    encoding : tiktoken.Encoding
+        Encoding object for the desired model.
+
+    Attributes
+    ----------
+    text : str
+        The original text.
+    tokens : List[int]
+        The tokens of the text.
+    offsets : List[int]
+        The index of the first character of each token in the text.
+    """
+
+    def __init__(self, text: str, encoding: tiktoken.Encoding):
+        self.text = text
+        self.tokens = encoding.encode(text)
+        _, self.offsets = encoding.decode_with_offsets(self.tokens)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def char_offset(self, token_index: int) -> int:
+        """
+        Get the character offset at which the token with the given index starts (the text length past the last token).
+        """
+        if token_index >= len(self.tokens):
+            return len(self.text)
+        return self.offsets[token_index]
+
+    def slice(self, start: int, end: int) -> str:
+        """
+        Get the part of the original text covered by the tokens in the range [start, end).
+        """
+        return self.text[self.char_offset(start):self.char_offset(end)]
+
+
+class TextFragment(NamedTuple):
+    """
+    A fragment of a text together with its number of tokens.
+    """
+    text: str
+    token_count: int
+
+
+def split_text(tokenized_text: TokenizedText, fragment_size: int, overlap_type: str, overlap: float) -> List[TextFragment]:
+    """
+    Split a given text into fragments based on specified fragment size and overlap settings.
+
+    Parameters
+    ----------
+    tokenized_text : TokenizedText
+        Text to be split into fragments.
+    fragment_size : int
+        Size of each text fragment in tokens.
+    overlap_type : str
+        Type of overlap ('absolute' or 'relative') used in text splitting.
+    overlap : float
+        Value of overlap. Interpreted as absolute or relative based on overlap_type.
+
+    Returns
+    -------
+    List[TextFragment]
+        List of text fragments.
+
+    Raises
+    ------
+    ConfigInvalidValueError
+        If the overlap type is neither 'absolute' nor 'relative'.
+    """
+    if overlap_type == 'absolute':
+        abs_overlap = overlap
+    elif overlap_type == 'relative':
+        abs_overlap = fragment_size * overlap
+    else:
+        raise ConfigInvalidValueError(f"Invalid overlap type: {overlap_type}")
+
+    fragments = []
+    current_start = 0
+    while current_start < len(tokenized_text):
+        current_end = min(current_start + fragment_size, len(tokenized_text))
+        fragments.append(TextFragment(tokenized_text.slice(current_start, current_end), current_end - current_start))
+        current_start += int(fragment_size - abs_overlap)
+
+    return fragments
+
+
+# Markdown headings, numbered headings (e.g. "2.3 Mitose") and chapter headings (e.g. "Kapitel 2", "Chapter 2")
+_HEADING_PATTERN = re.compile(r'\s*(#{1,6}\s+\S|(\d+\.)+\d*\s+\S[^\n]{0,80}$|(kapitel|chapter|teil|part)\s+\d+)', re.IGNORECASE)
+# Bullet markers, including the private use characters PDF-to-text converters produce for bullet symbols
+_BULLET_PATTERN = re.compile(r'\s*([-*\u2022\u2013\u25aa\u25e6\u00b7\uf0a7\uf0b7\uf0d8\uf076o]|\d+[.)]|[a-z][.)])\s+')
+_SENTENCE_END_PATTERN = re.compile(r'[.!?\u2026]["\')\]]*\s+')
+
+
+def _block_starts(text: str, start: int, end: int) -> List[int]:
+    """
+    Character offsets at which the structural blocks in text[start:end] start.
+    Blocks are paragraphs separated by blank lines or headings and runs of bullet points. A heading always starts the
+    block of the text following it, so no fragment ends with a heading.
+    """
+    starts = [start]
+    previous_kind = None
+    after_blank = False
+    position = start
+    for line in text[start:end].splitlines(keepends=True):
+        if not line.strip():
+            after_blank = True
+        else:
+            if _HEADING_PATTERN.match(line):
+                kind = 'heading'
+            elif _BULLET_PATTERN.match(line) or (previous_kind == 'bullet' and line[:1].isspace() and not after_blank):
+                kind = 'bullet'
+            else:
+                kind = 'text'
+            if previous_kind not in [None, 'heading'] and (after_blank or kind == 'heading' or kind != previous_kind):
+                starts.append(position)
+            previous_kind = kind
+            after_blank = False
+        position += len(line)
+    return starts
+
+
+def _line_starts(text: str, start: int, end: int) -> List[int]:
+    """
+    Character offsets at which the lines in text[start:end] start.
+    """
+    starts = [start]
+    position = text.find('\n', start, end)
+    while position != -1:
+        starts.append(position + 1)
+        position = text.find('\n', position + 1, end)
+    return starts
+
+
+def _sentence_starts(text: str, start: int, end: int) -> List[int]:
+    """
+    Character offsets at which the sentences in text[start:end] start.
+    """
+    return [start] + [match.end() for match in _SENTENCE_END_PATTERN.finditer(text, start, end)]
+
+
+# Units are split into finer units only if they do not fit into one fragment
+_SEGMENTERS = [_block_starts, _line_starts, _sentence_starts]
+
+
+def _split_units(tokenized_text: TokenizedText, start: int, end: int, fragment_size: int, level: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split the tokens in [start, end) into consecutive units of at most `fragment_size` tokens, splitting on the coarsest
+    structural level (blocks, then lines, then sentences) that yields units fitting into a fragment.
+    """
+    if level == 0 or end - start > fragment_size:
+        if level == len(_SEGMENTERS):
+            # A single sentence exceeding the fragment size is cut at fixed token offsets
+            return [(unit_start, min(unit_start + fragment_size, end)) for unit_start in range(start, end, fragment_size)]
+
+        char_starts = _SEGMENTERS[level](tokenized_text.text, tokenized_text.char_offset(start), tokenized_text.char_offset(end))
+        # Map the character offsets to the tokens containing them, so a unit starts with the token its first character is in
+        token_bounds = sorted({start, end} | {max(bisect_right(tokenized_text.offsets, char_start, start, end) - 1, start) for char_start in char_starts})
+        units = []
+        for unit_start, unit_end in zip(token_bounds, token_bounds[1:]):
+            units += _split_units(tokenized_text, unit_start, unit_end, fragment_size, level + 1)
+        return units
+    return [(start, end)]
+
+
+def split_text_by_structure(tokenized_text: TokenizedText, fragment_size: int) -> List[TextFragment]:
+    """
+    Split a given text into fragments along its structure instead of at fixed token offsets.
+
+    The text is segmented into headings, paragraphs and bullet blocks. Blocks exceeding the fragment size are segmented
+    further into lines and sentences. Whole units are then packed greedily into fragments of up to `fragment_size` tokens.
+    Since no unit is cut, the fragments do not overlap.
+
+    Parameters
+    ----------
+    tokenized_text : TokenizedText
+        Text to be split into fragments.
+    fragment_size : int
+        Maximum size of each text fragment in tokens.
+
+    Returns
+    -------
+    List[TextFragment]
+        List of text fragments.
+    """
+    fragments = []
+    fragment_start = fragment_end = 0
+    for unit_start, unit_end in _split_units(tokenized_text, 0, len(tokenized_text), fragment_size):
+        if unit_end - fragment_start > fragment_size:
+            fragments.append(TextFragment(tokenized_text.slice(fragment_start, fragment_end), fragment_end - fragment_start))
+            fragment_start = unit_start
+        fragment_end = unit_end
+    if fragment_end > fragment_start:
+        fragments.append(TextFragment(tokenized_text.slice(fragment_start, fragment_end), fragment_end - fragment_start))
+    return fragments
@@ -1,13 +1,14 @@
 # src/flashcard_service/flashcard_service.py
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterator, List
 
 from dependency_injector.wiring import inject, Provide
 
 from src.dtos.generator_task import FlashcardGeneratorTaskDto
+from src.entities.flashcard.flashcard import Flashcard
 from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
 from src.enums.generatorOptions import ExportFormat
 from src.container import Container
-from src.services.flashcard_service.flashcard_export import export_as_apkg, export_as_csv
+from src.services.flashcard_service.flashcard_export import export_as_apkg, iter_csv, iter_csv_zip, iter_ndjson
 
 
 # TODO: Validate DTOs (especially length of input text!)
@@ -22,11 +23,14 @@ class FlashcardService:
         self.flashcard_generator = flashcard_generator
 
     def generate_flashcard_deck(self, flashcards_request_dto: FlashcardGeneratorTaskDto,
-                                fn_update_progress: Optional[Callable[[int, int], None]]) -> FlashcardDeck:
-        return self.flashcard_generator.generate_flashcard_deck(flashcards_request_dto, fn_update_progress)
+                                fn_update_progress: Optional[Callable[[int, int], None]],
+                                fn_partial_result: Optional[Callable[[List[Flashcard]], None]] = None,
+                                checkpoint_id: Optional[str] = None) -> FlashcardDeck:
+        return self.flashcard_generator.generate_flashcard_deck(flashcards_request_dto, fn_update_progress, fn_partial_result,
+                                                                checkpoint_id)
 
     @staticmethod
-    def export_flashcard_deck(flashcard_deck: FlashcardDeck, export_format: ExportFormat) -> bytes:
+    def export_flashcard_deck(flashcard_deck: FlashcardDeck, export_format: ExportFormat, compress: bool = True) -> bytes:
         """
         Exports the generated flashcards to the specified format.
 
@@ -36,13 +40,42 @@ class FlashcardService:
             The deck of generated flashcards.
         export_format : ExportFormat
             The format in which to export the flashcards.
+        compress : bool
+            Whether to compress the zip file of the 'zip' format.
 
         Returns
         -------
         bytes
             The exported flashcards in the specified format.
         """
+        return b''.join(FlashcardService.stream_flashcard_deck(flashcard_deck, export_format, compress))
+
+    @staticmethod
+    def stream_flashcard_deck(flashcard_deck: FlashcardDeck, export_format: ExportFormat, compress: bool = True) -> Iterator[bytes]:
+        """
+        Exports the generated flashcards to the specified format in chunks, so the exported file is never held in memory as a
+        whole (except for the 'apkg' format, which is built as a whole).
+
+        Parameters
+        ----------
+        flashcard_deck : FlashcardDeck
+            The deck of generated flashcards.
+        export_format : ExportFormat
+            The format in which to export the flashcards.
+        compress : bool
+            Whether to compress the zip file of the 'zip' format.
+
+        Returns
+        -------
+        Iterator[bytes]
+            The chunks of the exported flashcards.
+        """
         if export_format == ExportFormat.anki:
-            return export_as_apkg(flashcard_deck)
+            return iter([export_as_apkg(flashcard_deck)])
         elif export_format == ExportFormat.csv:
-            return export_as_csv(flashcard_deck)
+            return iter_csv(flashcard_deck)
+        elif export_format == ExportFormat.csv_zip:
+            return iter_csv_zip(flashcard_deck, compress)
+        elif export_format == ExportFormat.ndjson:
+            return iter_ndjson(flashcard_deck)
+        raise ValueError(f"Unsupported export format: {export_format}")
@@ -0,0 +1,42 @@
+# src/services/partial_result_service/local_partial_result_store.py
+import threading
+import time
+from typing import Dict, List
+
+from src.services.partial_result_service.partial_result_store_interface import IPartialResultStore
+
+
+class LocalPartialResultStore(IPartialResultStore):
+    """
+    In-process partial result store, for tests and for running the API and the worker in one process.
+
+    Parameters
+    ----------
+    ttl_sec : int
+        Time in seconds after the last update after which the partial flashcards of a task expire.
+    """
+
+    def __init__(self, ttl_sec: int):
+        self.ttl_sec = ttl_sec
+        self._partial_results: Dict[str, tuple[float, List[dict]]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, task_id: str, flashcards: List[dict]) -> None:
+        if not flashcards:
+            return
+        with self._lock:
+            entry = self._partial_results.get(task_id)
+            partial_flashcards = entry[1] if entry is not None else []
+            partial_flashcards.extend(flashcards)
+            self._partial_results[task_id] = (time.monotonic() + self.ttl_sec, partial_flashcards)
+
+    def load(self, task_id: str) -> List[dict]:
+        with self._lock:
+            self._collect_garbage()
+            entry = self._partial_results.get(task_id)
+            return list(entry[1]) if entry is not None else []
+
+    def _collect_garbage(self) -> None:
+        now = time.monotonic()
+        for task_id in [task_id for task_id, (expires_at, _) in self._partial_results.items() if expires_at <= now]:
+            del self._partial_results[task_id]
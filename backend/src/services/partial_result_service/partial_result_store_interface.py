@@ -0,0 +1,43 @@
+# src/services/partial_result_service/partial_result_store_interface.py
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class IPartialResultStore(ABC):
+    """
+    Interface for stores of the flashcards a running generator task has parsed so far.
+
+    The partial flashcards of a task only grow, so each update appends the new flashcards instead of rewriting all of them
+    (as the task meta would be). They expire after the task, the result of a successful task replaces them.
+    """
+
+    @abstractmethod
+    def append(self, task_id: str, flashcards: List[dict]) -> None:
+        """
+        Append flashcards to the partial flashcards of a task and renew their expiry.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+        flashcards : List[dict]
+            The new flashcards, as dictionaries of their attributes.
+        """
+        pass
+
+    @abstractmethod
+    def load(self, task_id: str) -> List[dict]:
+        """
+        Load the partial flashcards of a task.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+
+        Returns
+        -------
+        List[dict]
+            The partial flashcards in the order they were appended, empty if the task has no (unexpired) partial flashcards.
+        """
+        pass
@@ -0,0 +1,44 @@
+# src/services/partial_result_service/redis_partial_result_store.py
+import json
+from typing import List
+
+from redis import Redis
+
+from src.services.partial_result_service.partial_result_store_interface import IPartialResultStore
+
+
+class RedisPartialResultStore(IPartialResultStore):
+    """
+    Partial result store shared by the workers and the API, backed by Redis.
+
+    The partial flashcards of a task are stored in one list with an element per flashcard, so an update only sends the new
+    flashcards. The list expires `ttl_sec` after the last update.
+
+    Parameters
+    ----------
+    redis_client : Redis
+        The Redis client.
+    ttl_sec : int
+        Time in seconds after the last update after which the partial flashcards of a task expire.
+    key_prefix : str
+        Prefix of all Redis keys used by the store.
+    """
+
+    def __init__(self, redis_client: Redis, ttl_sec: int, key_prefix: str = 'quizard:partial'):
+        self.redis_client = redis_client
+        self.ttl_sec = ttl_sec
+        self._key_prefix = key_prefix
+
+    def _task_key(self, task_id: str) -> str:
+        return f'{self._key_prefix}:{task_id}'
+
+    def append(self, task_id: str, flashcards: List[dict]) -> None:
+        if not flashcards:
+            return
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.rpush(self._task_key(task_id), *[json.dumps(flashcard, ensure_ascii=False) for flashcard in flashcards])
+        pipeline.expire(self._task_key(task_id), self.ttl_sec)
+        pipeline.execute()
+
+    def load(self, task_id: str) -> List[dict]:
+        return [json.loads(value) for value in self.redis_client.lrange(self._task_key(task_id), 0, -1)]
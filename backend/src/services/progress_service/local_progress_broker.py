@@ -0,0 +1,46 @@
+# src/services/progress_service/local_progress_broker.py
+import threading
+from typing import Dict, Set
+
+from src.services.progress_service.progress_broker_interface import IProgressBroker, ProgressSubscription
+
+
+class LocalProgressBroker(IProgressBroker):
+    """
+    In-process progress broker. Events only reach subscribers in the publishing process, so it is meant for tests and for
+    running the API and the worker in one process.
+
+    Parameters
+    ----------
+    max_queued_events : int
+        Maximum number of events queued per subscription (see ProgressSubscription).
+    """
+
+    def __init__(self, max_queued_events: int = 100):
+        self.max_queued_events = max_queued_events
+        self._subscriptions: Dict[str, Set[ProgressSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, task_id: str, event: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(task_id, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def subscribe(self, task_id: str) -> ProgressSubscription:
+        subscription = ProgressSubscription(task_id, self._unsubscribe, self.max_queued_events)
+        with self._lock:
+            self._subscriptions.setdefault(task_id, set()).add(subscription)
+        return subscription
+
+    def has_subscriptions(self, task_id: str) -> bool:
+        with self._lock:
+            return task_id in self._subscriptions
+
+    def _unsubscribe(self, subscription: ProgressSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.task_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.task_id]
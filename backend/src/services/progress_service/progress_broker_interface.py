@@ -0,0 +1,116 @@
+# src/services/progress_service/progress_broker_interface.py
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Optional
+
+
+class ProgressSubscription:
+    """
+    Subscription to the progress events of a task. Events published after the subscription was created are queued until
+    they are read with `get`.
+
+    The queue holds at most `max_events` events. When a slow subscriber lets it overflow, the queued events are dropped and
+    `take_missed` reports it once, so the subscriber can read the current task state again instead of applying an incomplete
+    sequence of events.
+
+    Parameters
+    ----------
+    task_id : str
+        The ID of the task.
+    fn_close : Callable[[ProgressSubscription], None]
+        Called once when the subscription is closed, to remove it from the broker.
+    max_events : int
+        Maximum number of queued events.
+    """
+
+    def __init__(self, task_id: str, fn_close: Callable[['ProgressSubscription'], None], max_events: int = 100):
+        self.task_id = task_id
+        self.max_events = max_events
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._missed = False
+        self._fn_close = fn_close
+        self._closed = False
+
+    def put(self, event: dict) -> None:
+        with self._condition:
+            if len(self._events) >= self.max_events:
+                self._events.clear()
+                self._missed = True
+            self._events.append(event)
+            self._condition.notify()
+
+    def get(self, timeout_sec: float) -> Optional[dict]:
+        """
+        Wait for the next event.
+
+        Parameters
+        ----------
+        timeout_sec : float
+            Maximum time in seconds to wait for an event.
+
+        Returns
+        -------
+        Optional[dict]
+            The next event, or None if no event was published within the timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._events, timeout=timeout_sec):
+                return None
+            return self._events.popleft()
+
+    def take_missed(self) -> bool:
+        """
+        Check whether events were dropped since the last call, because the queue overflowed.
+        """
+        with self._condition:
+            missed, self._missed = self._missed, False
+            return missed
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._fn_close(self)
+
+
+class IProgressBroker(ABC):
+    """
+    Interface for brokers of the progress events of tasks, published by the workers and pushed to the clients by the API.
+
+    An event is a JSON-serializable dictionary with the field 'task_state' and the task info of that state (e.g. the progress
+    and partial flashcards of a task in progress). Events are not stored, only subscribers at the time of publishing receive
+    them, so a subscriber reads the current task state after subscribing.
+    """
+
+    @abstractmethod
+    def publish(self, task_id: str, event: dict) -> None:
+        """
+        Publish an event to the current subscribers of a task. Publishing never fails the task, errors are only logged.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+        event : dict
+            The event.
+        """
+        pass
+
+    @abstractmethod
+    def subscribe(self, task_id: str) -> ProgressSubscription:
+        """
+        Subscribe to the events of a task. The subscription receives every event published after this method returned and
+        must be closed by the subscriber.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+
+        Returns
+        -------
+        ProgressSubscription
+            The subscription.
+        """
+        pass
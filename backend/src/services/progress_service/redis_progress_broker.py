@@ -0,0 +1,97 @@
+# src/services/progress_service/redis_progress_broker.py
+import json
+import threading
+import time
+
+import structlog
+from redis import ConnectionError, Redis, RedisError
+
+from src.services.progress_service.local_progress_broker import LocalProgressBroker
+from src.services.progress_service.progress_broker_interface import IProgressBroker, ProgressSubscription
+
+logger = structlog.get_logger(__name__)
+
+
+class RedisProgressBroker(IProgressBroker):
+    """
+    Progress broker over Redis pub/sub, the workers publish the events of a task to its channel.
+
+    Each API process subscribes to the channels of all tasks with a single pattern subscription, read by a listener thread
+    that hands the events to the subscriptions of the process. The subscribers therefore share one Redis connection instead
+    of holding one each, and events of tasks without a subscriber in the process are dropped without being decoded.
+
+    Parameters
+    ----------
+    redis_client : Redis
+        The Redis client.
+    channel_prefix : str
+        Prefix of the channels of the tasks.
+    reconnect_interval_sec : float
+        Time in seconds to wait before the listener reconnects after a connection error.
+    subscribe_timeout_sec : float
+        Maximum time in seconds a subscriber waits for the listener to subscribe.
+    max_queued_events : int
+        Maximum number of events queued per subscription (see ProgressSubscription).
+    """
+
+    def __init__(self, redis_client: Redis, channel_prefix: str = 'quizard:progress', reconnect_interval_sec: float = 1.0,
+                 subscribe_timeout_sec: float = 5.0, max_queued_events: int = 100):
+        self.redis_client = redis_client
+        self.channel_prefix = channel_prefix
+        self.reconnect_interval_sec = reconnect_interval_sec
+        self.subscribe_timeout_sec = subscribe_timeout_sec
+        self._local_broker = LocalProgressBroker(max_queued_events)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._subscribed = threading.Event()
+
+    def _channel(self, task_id: str) -> str:
+        return f'{self.channel_prefix}:{task_id}'
+
+    def publish(self, task_id: str, event: dict) -> None:
+        try:
+            self.redis_client.publish(self._channel(task_id), json.dumps(event))
+        except RedisError as e:
+            # Clients still receive the current state when they reconnect or poll
+            logger.warning("Could not publish progress event", task_id=task_id, error=str(e))
+
+    def subscribe(self, task_id: str) -> ProgressSubscription:
+        self._start_listener()
+        return self._local_broker.subscribe(task_id)
+
+    def _start_listener(self) -> None:
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='progress-listener', daemon=True)
+                self._listener.start()
+        # Events published before the pattern subscription is active would be lost
+        if not self._subscribed.wait(self.subscribe_timeout_sec):
+            raise ConnectionError("The progress listener could not subscribe to Redis")
+
+    def _listen(self) -> None:
+        prefix_length = len(self.channel_prefix) + 1
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                pubsub.psubscribe(f'{self.channel_prefix}:*')
+                for message in pubsub.listen():
+                    if message['type'] == 'psubscribe':
+                        self._subscribed.set()
+                    elif message['type'] == 'pmessage':
+                        self._dispatch(message['channel'][prefix_length:].decode(), message['data'])
+            except RedisError as e:
+                self._subscribed.clear()
+                logger.warning("Progress listener lost the connection to Redis", error=str(e))
+                time.sleep(self.reconnect_interval_sec)
+            finally:
+                pubsub.close()
+
+    def _dispatch(self, task_id: str, data: bytes) -> None:
+        if not self._local_broker.has_subscriptions(task_id):
+            return
+        try:
+            event = json.loads(data)
+        except ValueError as e:
+            logger.warning("Invalid progress event", task_id=task_id, error=str(e))
+            return
+        self._local_broker.publish(task_id, event)
@@ -0,0 +1,38 @@
+# src/services/rate_limit_service/in_memory_rate_limiter.py
+import threading
+import time
+
+from src.services.rate_limit_service.rate_limiter_interface import IRateLimiter
+
+
+class InMemoryRateLimiter(IRateLimiter):
+    """
+    Token-bucket rate limiter local to the current process.
+    Stand-in for the RedisRateLimiter in tests and local development, where no budget has to be shared between workers.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_wait_sec: float):
+        super().__init__(requests_per_minute, tokens_per_minute, max_wait_sec)
+        self._lock = threading.Lock()
+        self._request_level = float(requests_per_minute)
+        self._token_level = float(tokens_per_minute)
+        self._timestamp = time.monotonic()
+
+    def try_acquire(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            elapsed_min = (now - self._timestamp) / 60
+            self._timestamp = now
+            # Refill both buckets at their per-minute rate, capped at their capacity
+            self._request_level = min(self.requests_per_minute, self._request_level + elapsed_min * self.requests_per_minute)
+            self._token_level = min(self.tokens_per_minute, self._token_level + elapsed_min * self.tokens_per_minute)
+
+            wait_sec = max(
+                (1 - self._request_level) * 60 / self.requests_per_minute,
+                (tokens - self._token_level) * 60 / self.tokens_per_minute,
+                0.0
+            )
+            if wait_sec == 0:
+                self._request_level -= 1
+                self._token_level -= tokens
+            return wait_sec
@@ -0,0 +1,105 @@
+# src/services/rate_limit_service/rate_limiter_interface.py
+import time
+from abc import ABC, abstractmethod
+
+import structlog
+
+from src.custom_exceptions.internal_exceptions import RateLimitTimeoutError
+
+logger = structlog.get_logger(__name__)
+
+
+class IRateLimiter(ABC):
+    """
+    Interface for rate limiters guarding the requests-per-minute and tokens-per-minute budget of the OpenAI account.
+
+    Implementations only have to decide whether a request fits into the budget right now, the blocking behaviour is shared.
+
+    Parameters
+    ----------
+    requests_per_minute : int
+        The number of requests that may be sent per minute.
+    tokens_per_minute : int
+        The number of tokens (prompt + completion) that may be used per minute.
+    max_wait_sec : float
+        The maximum time a single request waits for budget before giving up.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_wait_sec: float):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait_sec = max_wait_sec
+
+    @abstractmethod
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Try to charge one request and the given number of tokens against the budget.
+
+        Parameters
+        ----------
+        tokens : int
+            The estimated number of tokens of the request.
+
+        Returns
+        -------
+        float
+            0 if the budget was charged, otherwise the number of seconds after which enough budget is expected to be free.
+            Nothing is charged if the request does not fit.
+        """
+        pass
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Block until one request and the given number of tokens fit into the budget and charge them.
+
+        Parameters
+        ----------
+        tokens : int
+            The estimated number of tokens of the request.
+
+        Returns
+        -------
+        float
+            The number of seconds spent waiting for budget.
+
+        Raises
+        ------
+        RateLimitTimeoutError
+            If the budget does not become free within `max_wait_sec`.
+        """
+        # A request larger than the whole bucket would never fit, so it is charged as a full bucket instead
+        tokens = min(tokens, self.tokens_per_minute)
+        start_time = time.monotonic()
+        while True:
+            wait_sec = self.try_acquire(tokens)
+            waited_sec = time.monotonic() - start_time
+            if wait_sec <= 0:
+                if waited_sec > 0.001:
+                    logger.info("Waited for rate limit budget", waited_sec=round(waited_sec, 3), tokens=tokens)
+                return waited_sec
+            if waited_sec + wait_sec > self.max_wait_sec:
+                raise RateLimitTimeoutError(f"Rate limit budget for {tokens} tokens not available within {self.max_wait_sec} seconds.")
+            time.sleep(wait_sec)
+
+
+def estimate_request_tokens(message_list: list, max_tokens: int) -> int:
+    """
+    Estimates the number of tokens a completion request is charged with.
+
+    Like the OpenAI rate limiter, the prompt is estimated from its character count (about 4 characters per token) and the
+    completion is charged with `max_tokens`, so no encoding is needed before each request.
+
+    Parameters
+    ----------
+    message_list : list
+        The messages of the request, each message being a dictionary with 'role' and 'content'.
+    max_tokens : int
+        The maximum number of tokens to generate.
+
+    Returns
+    -------
+    int
+        The estimated number of tokens.
+    """
+    prompt_chars = sum(len(message['content']) + len(message['role']) for message in message_list)
+    return prompt_chars // 4 + max_tokens
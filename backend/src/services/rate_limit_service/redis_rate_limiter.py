@@ -0,0 +1,65 @@
+# src/services/rate_limit_service/redis_rate_limiter.py
+from redis import Redis
+
+from src.services.rate_limit_service.rate_limiter_interface import IRateLimiter
+
+# Refills and charges the request and the token bucket atomically. The Redis server clock is used, so all workers share
+# the same notion of time. Returns the number of seconds to wait as string, since Lua numbers are truncated to integers.
+_TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local function refill(key, capacity)
+    local bucket = redis.call('HMGET', key, 'level', 'timestamp')
+    local level = tonumber(bucket[1]) or capacity
+    local timestamp = tonumber(bucket[2]) or now
+    return math.min(capacity, level + math.max(0, now - timestamp) * capacity / 60)
+end
+
+local requests_per_minute = tonumber(ARGV[1])
+local tokens_per_minute = tonumber(ARGV[2])
+local tokens = tonumber(ARGV[3])
+
+local request_level = refill(KEYS[1], requests_per_minute)
+local token_level = refill(KEYS[2], tokens_per_minute)
+local wait = math.max(
+    (1 - request_level) * 60 / requests_per_minute,
+    (tokens - token_level) * 60 / tokens_per_minute,
+    0
+)
+if wait == 0 then
+    request_level = request_level - 1
+    token_level = token_level - tokens
+end
+
+redis.call('HSET', KEYS[1], 'level', tostring(request_level), 'timestamp', tostring(now))
+redis.call('HSET', KEYS[2], 'level', tostring(token_level), 'timestamp', tostring(now))
+-- A full bucket is the same as a missing one, so idle buckets can expire
+redis.call('EXPIRE', KEYS[1], 120)
+redis.call('EXPIRE', KEYS[2], 120)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(IRateLimiter):
+    """
+    Token-bucket rate limiter backed by Redis.
+    All Celery workers using the same Redis instance and key prefix share one requests-per-minute and tokens-per-minute budget.
+
+    Parameters
+    ----------
+    redis_client : Redis
+        The Redis client.
+    key_prefix : str
+        Prefix of the Redis keys holding the buckets, e.g. to separate the budgets of different OpenAI accounts.
+    """
+
+    def __init__(self, redis_client: Redis, requests_per_minute: int, tokens_per_minute: int, max_wait_sec: float,
+                 key_prefix: str = 'quizard:rate_limit'):
+        super().__init__(requests_per_minute, tokens_per_minute, max_wait_sec)
+        self._keys = [f'{key_prefix}:requests', f'{key_prefix}:tokens']
+        self._script = redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, tokens: int) -> float:
+        wait_sec = self._script(keys=self._keys, args=[self.requests_per_minute, self.tokens_per_minute, tokens])
+        return float(wait_sec)
@@ -1,4 +1,6 @@
 # src/services/task_service/flashcard_generator_task_service.py
+from typing import Dict, List, Optional
+
 import structlog
 from dependency_injector.wiring import inject, Provide
 from itsdangerous import URLSafeSerializer, BadSignature
@@ -6,9 +8,10 @@ from itsdangerous import URLSafeSerializer, BadSignature
 from src.custom_exceptions.external_exceptions import TokenAuthenticationError, ResultNotFoundError
 from src.dtos.generator_task import FlashcardGeneratorTaskDto
 from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
-from src.enums.task_states import TaskState
+from src.enums.task_states import TERMINAL_STATES, TaskState
 from src.container import Container
-from src.services.task_service.task_service_interface import ITaskService
+from src.services.task_service.task_service_interface import ITaskService, TaskStatus
+from src.services.task_service.task_status_cache import TaskStatusCache
 from src.celery.tasks import flashcard_generator_task
 from src.utils.env_util import get_env_variable
 
@@ -19,11 +22,19 @@ class FlashcardGeneratorTaskService(ITaskService):
     """
     Implementation of IFlashcardGeneratorTaskService.
     Essentially a wrapper for performing operations on the flashcard generator celery task.
+
+    Parameters
+    ----------
+    celery_app
+        The Celery app, injected by the dependency injector.
+    status_cache : Optional[TaskStatusCache]
+        Cache of the status of finished tasks, None to read the status of every task from the backend.
     """
 
     @inject
-    def __init__(self, celery_app=Provide[Container.celery_app]):
+    def __init__(self, celery_app=Provide[Container.celery_app], status_cache: Optional[TaskStatusCache] = None):
         self.celery_app = celery_app
+        self.status_cache = status_cache
 
     def start_task(self, task: FlashcardGeneratorTaskDto, *args, **kwargs):
         task_id = flashcard_generator_task.delay(task).id
@@ -46,6 +57,39 @@ class FlashcardGeneratorTaskService(ITaskService):
             }
         return task.info
 
+    def get_task_status(self, task_id: str) -> TaskStatus:
+        task_status = self.status_cache.get(task_id) if self.status_cache is not None else None
+        if task_status is None:
+            # AsyncResult.state and AsyncResult.info would each read the meta from the backend
+            task_status = create_task_status(flashcard_generator_task.backend.get_task_meta(task_id))
+            if self.status_cache is not None and task_status.state in TERMINAL_STATES:
+                self.status_cache.set(task_id, task_status)
+        if task_status.state == TaskState.failure:
+            # The cached error is raised again, its traceback must not grow with every raise
+            raise task_status.error.with_traceback(None)
+        return task_status
+
+    def get_task_statuses(self, task_ids: List[str]) -> Dict[str, TaskStatus]:
+        task_statuses = {}
+        if self.status_cache is not None:
+            for task_id in task_ids:
+                task_status = self.status_cache.get(task_id)
+                if task_status is not None:
+                    task_statuses[task_id] = task_status
+        missing_task_ids = [task_id for task_id in dict.fromkeys(task_ids) if task_id not in task_statuses]
+        if missing_task_ids:
+            backend = flashcard_generator_task.backend
+            # One MGET of the result keys instead of a round trip per task
+            values = backend.mget([backend.get_key_for_task(task_id) for task_id in missing_task_ids])
+            for task_id, value in zip(missing_task_ids, values):
+                # Tasks without a result key are pending, like in backend.get_task_meta
+                meta = backend.decode_result(value) if value is not None else {'status': TaskState.pending.value, 'result': None}
+                task_status = create_task_status(meta)
+                if self.status_cache is not None and task_status.state in TERMINAL_STATES:
+                    self.status_cache.set(task_id, task_status)
+                task_statuses[task_id] = task_status
+        return {task_id: task_statuses[task_id] for task_id in task_ids}
+
     def get_task_result(self, task_id: str) -> FlashcardDeck:
         task = flashcard_generator_task.AsyncResult(task_id)
         if TaskState(task.state) != TaskState.success:
@@ -71,3 +115,17 @@ class FlashcardGeneratorTaskService(ITaskService):
             return task_id
         except BadSignature:
             raise TokenAuthenticationError("Invalid or expired retrieval token link")
+
+
+def create_task_status(meta: dict) -> TaskStatus:
+    """
+    Create the status of a task from its meta in the result backend (see celery.backends.base.Backend.get_task_meta).
+    """
+    task_state = TaskState(meta['status'])
+    result = meta.get('result')
+    if task_state == TaskState.success:
+        # The info of a successful task is the result, the original number of batches is not kept (see get_task_info)
+        return TaskStatus(task_state, {'current_batch': 1, 'total_batches': 1})
+    if task_state == TaskState.failure:
+        return TaskStatus(task_state, {}, error=result)
+    return TaskStatus(task_state, result if isinstance(result, dict) else {})
@@ -1,9 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from src.enums.task_states import TaskState
 
 
+class TaskStatus(NamedTuple):
+    """
+    State and metadata of a task, read together from the task backend.
+
+    Attributes
+    ----------
+    state : TaskState
+        The state of the task.
+    info : dict
+        The metadata of the task, empty if the task has none (e.g. while it is pending).
+    error : Optional[BaseException]
+        The error of a failed task.
+    """
+    state: TaskState
+    info: dict
+    error: Optional[BaseException] = None
+
+
 class ITaskService(ABC):
     """
     Interface for task services.
@@ -60,6 +78,46 @@ class ITaskService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_task_status(self, task_id: str) -> TaskStatus:
+        """
+        Get the state and the metadata of the task with a single read of the task backend.
+
+        Parameters
+        ----------
+        task_id: str
+            The ID of the task.
+
+        Returns
+        -------
+        TaskStatus
+            The state and metadata of the task.
+
+        Raises
+        ------
+        Exception
+            The error of the task, if it failed.
+        """
+        pass
+
+    @abstractmethod
+    def get_task_statuses(self, task_ids: List[str]) -> Dict[str, TaskStatus]:
+        """
+        Get the state and the metadata of many tasks with a single read of the task backend. Unlike get_task_status, the
+        error of a failed task is returned in its status instead of being raised.
+
+        Parameters
+        ----------
+        task_ids: List[str]
+            The IDs of the tasks.
+
+        Returns
+        -------
+        Dict[str, TaskStatus]
+            The state and metadata of each task by task ID, in the order of the task IDs.
+        """
+        pass
+
     @abstractmethod
     def get_task_result(self, task_id: str) -> Any:
         """
@@ -0,0 +1,46 @@
+# src/services/task_service/task_status_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.services.task_service.task_service_interface import TaskStatus
+
+
+class TaskStatusCache:
+    """
+    In-process LRU cache of the status of finished tasks with a time to live.
+    The status of a task in a terminal state never changes, so it is only read from the task backend once per process. The
+    time to live should not exceed the expiry of the task results, after which the backend no longer knows the task.
+
+    Parameters
+    ----------
+    ttl_sec : int
+        Time in seconds after which an entry expires.
+    max_entries : int
+        Maximum number of cached statuses, the least recently used entry is evicted beyond that.
+    """
+
+    def __init__(self, ttl_sec: int, max_entries: int):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, TaskStatus]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, task_id: str) -> Optional[TaskStatus]:
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[task_id]
+                return None
+            self._entries.move_to_end(task_id)
+            return entry[1]
+
+    def set(self, task_id: str, task_status: TaskStatus) -> None:
+        with self._lock:
+            self._entries[task_id] = (time.monotonic() + self.ttl_sec, task_status)
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
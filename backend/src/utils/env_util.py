@@ -50,6 +50,7 @@ def get_env_variable(name: str, optional: bool = False) -> str:
 def create_celery_broker_url() -> str:
     """
     Create the broker URL for Celery based on environment variables.
+    If CELERY_BROKER_URL is set, it is used as is (e.g. "memory://" for load tests without RabbitMQ).
 
     Returns
     -------
@@ -61,6 +62,9 @@ def create_celery_broker_url() -> str:
     EnvironmentLoadingError
         If required environment variables are not set, this error is raised.
     """
+    broker_url = get_env_variable("CELERY_BROKER_URL", optional=True)
+    if broker_url:
+        return broker_url
     try:
         rabbit_user = get_env_variable("RABBITMQ_DEFAULT_USER")
         rabbit_password = get_env_variable("RABBITMQ_DEFAULT_PASS")
@@ -74,6 +78,7 @@ def create_celery_broker_url() -> str:
 def create_celery_result_backend_url() -> str:
     """
     Create the result backend URL for Celery based on environment variables.
+    If CELERY_RESULT_BACKEND_URL is set, it is used as is.
 
     Returns
     -------
@@ -85,6 +90,9 @@ def create_celery_result_backend_url() -> str:
     EnvironmentLoadingError
         If required environment variables are not set, this error is raised.
     """
+    result_backend_url = get_env_variable("CELERY_RESULT_BACKEND_URL", optional=True)
+    if result_backend_url:
+        return result_backend_url
     try:
         redis_host = get_env_variable("REDIS_HOST")
         redis_port = get_env_variable("REDIS_PORT")
@@ -1,3 +1,38 @@
+import os
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parents[1]))
\ No newline at end of file
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+# QuizardConfig loads the config file specified in the environment on import
+os.environ.setdefault('QUIZARD_CONFIG', 'quizard_config.yaml')
+
+
+class WordEncoding:
+    """Stand-in for a tiktoken encoding that encodes every word including its leading whitespace as one token."""
+    name = 'words'
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, text):
+        self.encode_calls += 1
+        tokens, start = [], 0
+        for index in range(1, len(text) + 1):
+            if index == len(text) or (text[index].isspace() and not text[index - 1].isspace()):
+                tokens.append(text[start:index])
+                start = index
+        return tokens
+
+    def decode_with_offsets(self, tokens):
+        offsets, length = [], 0
+        for token in tokens:
+            offsets.append(length)
+            length += len(token)
+        return ''.join(tokens), offsets
+
+
+@pytest.fixture
+def word_encoding():
+    return WordEncoding()
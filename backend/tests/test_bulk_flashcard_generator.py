@@ -0,0 +1,68 @@
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+
+from src.custom_exceptions.internal_exceptions import BatchJobError
+from src.dtos.generator_task import FlashcardGeneratorTaskDto
+from src.services.batch_service.local_batch_client import LocalBatchClient
+from src.services.flashcard_service.flashcard_generator_service import model_profiles
+from src.services.flashcard_service.flashcard_generator_service.bulk_flashcard_generator import BulkFlashcardGenerator
+from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import FlashcardGenerator
+from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+
+
+def make_completion(content: str) -> ChatCompletion:
+    return ChatCompletion(id='chatcmpl-1', object='chat.completion', created=int(time.time()), model='gpt-3.5-turbo',
+                          choices=[{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': content}}],
+                          usage={'prompt_tokens': 90, 'completion_tokens': 10, 'total_tokens': 100})
+
+
+class TestBulkFlashcardGenerator:
+
+    @pytest.fixture
+    def client(self, mocker, word_encoding):
+        mocker.patch.object(model_profiles.tiktoken, 'get_encoding', return_value=word_encoding)
+        client = mocker.MagicMock(spec=OpenAI)
+        failed_once = set()
+
+        def create(**kwargs):
+            input_text = kwargs['messages'][-1]['content']
+            # The first request containing "unlucky" fails, so it has to be generated again interactively
+            if 'unlucky' in input_text and input_text not in failed_once:
+                failed_once.add(input_text)
+                raise openai.BadRequestError("Bad request", response=SimpleNamespace(request=None, status_code=400, headers={}), body=None)
+            return make_completion(f"[Term] {input_text.split()[-1]}; A\n[Concept] Q; A")
+
+        client.chat.completions.create.side_effect = create
+        return client
+
+    @pytest.fixture
+    def bulk_generator(self, client, tmp_path):
+        prompt_registry = PromptRegistry({'example_prompt': 'ex1_genetics_of_cancer', 'additional_prompt': 'ad1_top_instr'})
+        generator = FlashcardGenerator(client=client, rate_limiter=None, completion_cache=None, prompt_registry=prompt_registry)
+        generator.generation_config = {'max_concurrent_requests': 1, 'stream_completions': False}
+        return BulkFlashcardGenerator(flashcard_generator=generator, batch_client=LocalBatchClient(str(tmp_path), client))
+
+    def make_task(self, input_text):
+        return FlashcardGeneratorTaskDto(lang='en', mode='PRACTICE', export_format='csv', input_text=input_text)
+
+    def test_decks_are_generated_from_one_batch(self, bulk_generator, client):
+        tasks = {'task-1': self.make_task("The first text."), 'task-2': self.make_task("The unlucky text.")}
+
+        flashcard_decks = bulk_generator.generate_flashcard_decks(tasks)
+
+        assert set(flashcard_decks) == {'task-1', 'task-2'}
+        assert [flashcard.id for flashcard in flashcard_decks['task-1'].flashcards] == [1, 2]
+        assert flashcard_decks['task-1'].flashcards[0].front_side == "text."
+        # The failed request of the batch was generated with a regular completion request
+        assert len(flashcard_decks['task-2'].flashcards) == 2
+        assert client.chat.completions.create.call_count == 3
+
+    def test_failed_batch_raises(self, bulk_generator, mocker):
+        mocker.patch.object(bulk_generator.batch_client, 'get_status', return_value='failed')
+        with pytest.raises(BatchJobError):
+            bulk_generator.is_complete('batch_1')
@@ -0,0 +1,35 @@
+import pytest
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.services.checkpoint_service.local_checkpoint_store import LocalCheckpointStore
+from src.services.checkpoint_service.redis_checkpoint_store import RedisCheckpointStore
+
+
+@pytest.fixture(params=['local', 'redis'])
+def checkpoint_store(request):
+    if request.param == 'local':
+        return LocalCheckpointStore(ttl_sec=60)
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisCheckpointStore(fakeredis.FakeRedis(), ttl_sec=60)
+
+
+def test_checkpoints_are_saved_per_task(checkpoint_store):
+    checkpoint_store.save('task-1', 'fragment-a', [Flashcard(1, FlashcardType.DEFINITION, 'Mitose', 'Zellteilung')])
+    checkpoint_store.save('task-1', 'fragment-b', [])
+    checkpoint_store.save('task-2', 'fragment-a', [Flashcard(1, FlashcardType.OPEN_ENDED, 'Warum?', 'Darum')])
+
+    checkpoints = checkpoint_store.load('task-1')
+    assert set(checkpoints) == {'fragment-a', 'fragment-b'}
+    assert [(card.type, card.front_side, card.back_side) for card in checkpoints['fragment-a']] == \
+           [(FlashcardType.DEFINITION, 'Mitose', 'Zellteilung')]
+
+    checkpoint_store.delete('task-1')
+    assert checkpoint_store.load('task-1') == {}
+    assert set(checkpoint_store.load('task-2')) == {'fragment-a'}
+
+
+def test_redis_checkpoints_expire():
+    fakeredis = pytest.importorskip('fakeredis')
+    redis_client = fakeredis.FakeRedis()
+    RedisCheckpointStore(redis_client, ttl_sec=60).save('task-1', 'fragment-a', [])
+    assert 0 < redis_client.ttl('quizard:checkpoint:task-1') <= 60
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from src.services.completion_cache_service.completion_cache_interface import create_cache_key
+from src.services.completion_cache_service.local_completion_cache import LocalCompletionCache
+from src.services.completion_cache_service.redis_completion_cache import RedisCompletionCache
+
+
+@pytest.fixture
+def completion():
+    return ChatCompletion.model_validate({
+        'id': 'chatcmpl-1',
+        'object': 'chat.completion',
+        'created': 1700000000,
+        'model': 'gpt-4o-mini',
+        'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': '[Term] Q1; A1'}}],
+        'usage': {'prompt_tokens': 100, 'completion_tokens': 10, 'total_tokens': 110},
+    })
+
+
+def test_cache_key_depends_on_model_config_and_messages():
+    messages = [{'role': 'user', 'content': 'text'}]
+    key = create_cache_key({'model_name': 'gpt-4o-mini', 'temperature': 0.8}, 800, messages)
+
+    assert key == create_cache_key({'temperature': 0.8, 'model_name': 'gpt-4o-mini'}, 800, [{'role': 'user', 'content': 'text'}])
+    assert key != create_cache_key({'model_name': 'gpt-4o-mini', 'temperature': 0.7}, 800, messages)
+    assert key != create_cache_key({'model_name': 'gpt-4o-mini', 'temperature': 0.8}, 800, [{'role': 'user', 'content': 'text!'}])
+
+
+class TestLocalCompletionCache:
+
+    def test_hit_and_miss(self, completion):
+        cache = LocalCompletionCache(ttl_sec=60, max_entries=10)
+        assert cache.get('key') is None
+        cache.set('key', completion)
+        assert cache.get('key') is completion
+        assert cache.get_stats() == {'hits': 1, 'misses': 1}
+
+    def test_evicts_least_recently_used(self, completion):
+        cache = LocalCompletionCache(ttl_sec=60, max_entries=2)
+        cache.set('a', completion)
+        cache.set('b', completion)
+        cache.get('a')
+        cache.set('c', completion)
+        assert cache.get('b') is None
+        assert cache.get('a') is completion
+        assert cache.get('c') is completion
+
+    def test_entries_expire(self, completion, mocker):
+        cache = LocalCompletionCache(ttl_sec=60, max_entries=10)
+        cache.set('key', completion)
+        mocker.patch('time.monotonic', return_value=time.monotonic() + 61)
+        assert cache.get('key') is None
+
+
+class TestRedisCompletionCache:
+
+    @pytest.fixture
+    def redis_client(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        return fakeredis.FakeRedis()
+
+    def test_round_trip(self, redis_client, completion):
+        cache = RedisCompletionCache(redis_client, ttl_sec=60, max_entries=10)
+        assert cache.get('key') is None
+        cache.set('key', completion)
+        assert cache.get('key') == completion
+        assert cache.get_stats() == {'hits': 1, 'misses': 1}
+
+    def test_evicts_beyond_max_entries(self, redis_client, completion):
+        cache = RedisCompletionCache(redis_client, ttl_sec=60, max_entries=2)
+        for key in ['a', 'b', 'c']:
+            cache.set(key, completion)
+        assert cache.get('a') is None
+        assert cache.get('c') == completion
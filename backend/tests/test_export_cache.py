@@ -0,0 +1,119 @@
+import os
+import time
+
+import pytest
+from flask import Flask
+from flask_restful import Api
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
+from src.rest.resources.flashcard_exporter_resource import FlashcardExporterResource
+from src.services.export_cache_service.disk_export_cache import DiskExportCache
+from src.services.export_cache_service.local_export_cache import LocalExportCache
+from src.services.flashcard_service.flashcard_service import FlashcardService
+
+DECK = FlashcardDeck([Flashcard(1, FlashcardType.DEFINITION, "Mitose", "Zellteilung")])
+
+
+class TestLocalExportCache:
+
+    def test_hit_and_miss(self):
+        cache = LocalExportCache(ttl_sec=60, max_bytes=100)
+        assert cache.get('task', 'csv') is None
+        artifact = cache.set('task', 'csv', [b'front,back'])
+
+        assert cache.get('task', 'csv') == artifact
+        assert (artifact.data, artifact.size) == (b'front,back', 10)
+        assert cache.get('task', 'apkg') is None
+        assert cache.get_stats() == {'hits': 1, 'misses': 2}
+
+    def test_least_recently_used_artifacts_are_evicted_beyond_max_bytes(self):
+        cache = LocalExportCache(ttl_sec=60, max_bytes=20)
+        cache.set('a', 'csv', [b'x' * 10])
+        cache.set('b', 'csv', [b'x' * 10])
+        cache.get('a', 'csv')
+        cache.set('c', 'csv', [b'x' * 10])
+
+        assert cache.get('b', 'csv') is None
+        assert cache.get('a', 'csv') is not None and cache.get('c', 'csv') is not None
+
+    def test_artifacts_expire(self, mocker):
+        cache = LocalExportCache(ttl_sec=60, max_bytes=100)
+        cache.set('task', 'csv', [b'front,back'])
+        mocker.patch('time.monotonic', return_value=time.monotonic() + 61)
+
+        assert cache.get('task', 'csv') is None
+
+
+class TestDiskExportCache:
+
+    def test_hit_is_served_from_file(self, tmp_path):
+        cache = DiskExportCache(str(tmp_path), ttl_sec=60, max_bytes=100)
+        assert cache.get('task', 'csv') is None
+        artifact = cache.set('task', 'csv', [b'front,back'])
+
+        assert cache.get('task', 'csv').etag == artifact.etag
+        assert artifact.data is None and open(artifact.path, 'rb').read() == b'front,back'
+        assert DiskExportCache(str(tmp_path), ttl_sec=60, max_bytes=100).get('task', 'csv') is not None
+        assert cache.get_stats() == {'hits': 1, 'misses': 1}
+
+    def test_least_recently_used_files_are_evicted_beyond_max_bytes(self, tmp_path):
+        cache = DiskExportCache(str(tmp_path), ttl_sec=60, max_bytes=20)
+        cache.set('a', 'csv', [b'x' * 10])
+        cache.set('b', 'csv', [b'x' * 10])
+        os.utime(tmp_path / 'b.csv', (1, os.stat(tmp_path / 'b.csv').st_mtime))
+        cache.set('c', 'csv', [b'x' * 10])
+
+        assert sorted(os.listdir(tmp_path)) == ['a.csv', 'c.csv']
+
+    def test_expired_files_are_removed(self, tmp_path):
+        cache = DiskExportCache(str(tmp_path), ttl_sec=60, max_bytes=100)
+        cache.set('task', 'csv', [b'front,back'])
+        os.utime(tmp_path / 'task.csv', (time.time(), time.time() - 61))
+
+        assert cache.get('task', 'csv') is None
+        assert os.listdir(tmp_path) == []
+
+
+@pytest.fixture
+def task_service(mocker):
+    task_service = mocker.MagicMock()
+    task_service.verify_retrival_token.side_effect = lambda token: token
+    task_service.get_task_result.return_value = DECK
+    return task_service
+
+
+def create_client(task_service, **resource_kwargs):
+    flask_app = Flask(__name__)
+    Api(flask_app).add_resource(FlashcardExporterResource, '/exporter/<token>', resource_class_kwargs={
+        'task_service': task_service, 'flashcard_service': FlashcardService(flashcard_generator=None), **resource_kwargs})
+    return flask_app.test_client()
+
+
+@pytest.mark.parametrize('export_cache', ['local', 'disk'])
+def test_export_is_built_once_and_served_conditionally(task_service, tmp_path, export_cache):
+    cache = LocalExportCache(60, 10 ** 6) if export_cache == 'local' else DiskExportCache(str(tmp_path), 60, 10 ** 6)
+    client = create_client(task_service, export_cache=cache)
+
+    response = client.get('/exporter/task?format=apkg')
+    etag = response.headers['ETag']
+    not_modified = client.get('/exporter/task?format=apkg', headers={'If-None-Match': etag})
+    partial = client.get('/exporter/task?format=apkg', headers={'Range': 'bytes=0-9'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'] == 'attachment; filename=flashcards.apkg'
+    assert int(response.headers['Content-Length']) == len(response.data) > 0
+    assert not_modified.status_code == 304
+    assert partial.status_code == 206 and partial.data == response.data[:10]
+    assert task_service.get_task_result.call_count == 1
+
+
+def test_export_is_offloaded_to_nginx(task_service, tmp_path):
+    client = create_client(task_service, export_cache=DiskExportCache(str(tmp_path), 60, 10 ** 6), offload='x-accel-redirect',
+                           x_accel_redirect_location='/protected-exports/')
+
+    response = client.get('/exporter/task?format=csv')
+
+    assert response.status_code == 200 and response.data == b''
+    assert response.headers['X-Accel-Redirect'] == '/protected-exports/task.csv'
+    assert response.headers['ETag']
@@ -0,0 +1,75 @@
+import openai
+import pytest
+
+from src.services.fake_openai_service.fake_openai_client import FakeOpenAI
+from src.services.flashcard_service.flashcard_generator_service import model_profiles
+from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import assemble_streamed_completion
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import parse_flashcards
+from src.services.flashcard_service.flashcard_generator_service.retry_policy import get_retry_after
+from src.services.flashcard_service.flashcard_generator_service.structured_output import parse_structured_flashcards
+
+MESSAGES = [
+    {'role': 'system', 'content': "Generate flashcards."},
+    {'role': 'user', 'content': "Mitosis divides the nucleus. Cytokinesis divides the cytoplasm. Chromosomes condense first."}
+]
+
+
+@pytest.fixture(autouse=True)
+def encoding(mocker, word_encoding):
+    mocker.patch.object(model_profiles.tiktoken, 'get_encoding', return_value=word_encoding)
+    return word_encoding
+
+
+def create_client(**kwargs):
+    return FakeOpenAI(**dict(dict(ttft_median_sec=0.0, ttft_sigma=0.0, tokens_per_sec=1e6, seed=42), **kwargs))
+
+
+def test_completion_contains_parsable_flashcards_with_usage():
+    completion = create_client(flashcards_per_completion=4).chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+
+    flashcards = parse_flashcards(completion.choices[0].message.content)
+    assert len(flashcards) == 4
+    assert all(flashcard.front_side and flashcard.back_side for flashcard in flashcards)
+    assert completion.usage.prompt_tokens > 0
+    assert completion.usage.total_tokens == completion.usage.prompt_tokens + completion.usage.completion_tokens
+
+
+def test_streamed_completion_equals_content_and_usage():
+    client = create_client(seed=1)
+    completion = client.chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+    stream = create_client(seed=1).chat.completions.create(model='gpt-4o-mini', messages=MESSAGES, stream=True,
+                                                           stream_options={'include_usage': True})
+
+    streamed_completion = assemble_streamed_completion(list(stream))
+    assert streamed_completion.choices[0].message.content == completion.choices[0].message.content
+    assert streamed_completion.usage.completion_tokens == completion.usage.completion_tokens
+
+
+def test_completion_is_cut_at_max_tokens():
+    completion = create_client().chat.completions.create(model='gpt-4o-mini', messages=MESSAGES, max_tokens=5)
+
+    assert completion.usage.completion_tokens == 5
+    assert completion.choices[0].finish_reason == 'length'
+
+
+def test_errors_are_raised_at_configured_rates():
+    with pytest.raises(openai.RateLimitError) as exc_info:
+        create_client(rate_limit_error_rate=1.0, retry_after_sec=2.5).chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+    assert get_retry_after(exc_info.value) == 2.5
+
+    with pytest.raises(openai.InternalServerError):
+        create_client(server_error_rate=1.0).chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+
+
+def test_slow_completion_times_out():
+    with pytest.raises(openai.APITimeoutError):
+        create_client(ttft_median_sec=0.05).chat.completions.create(model='gpt-4o-mini', messages=MESSAGES, timeout=0.01)
+
+
+def test_structured_output_contains_same_flashcards():
+    response_format = {'type': 'json_schema', 'json_schema': {'name': 'flashcards', 'schema': {}}}
+    lines = create_client().chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+    structured = create_client().chat.completions.create(model='gpt-4o-mini', messages=MESSAGES, response_format=response_format)
+
+    assert [card.front_side for card in parse_structured_flashcards(structured.choices[0].message.content)] == \
+           [card.front_side for card in parse_flashcards(lines.choices[0].message.content)]
@@ -0,0 +1,43 @@
+import json
+import pickle
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.entities.flashcard_deck.flashcard_deck import ColumnarFlashcardDeck, FlashcardDeck
+
+FLASHCARDS = [
+    Flashcard(1, FlashcardType.DEFINITION, "Mitose", " Zellteilung"),
+    Flashcard(2, FlashcardType.OPEN_ENDED, "Warum teilen sich Zellen?", "Wachstum; Regeneration"),
+    Flashcard(3, FlashcardType.UNKNOWN, "", "Ω – keine Frage"),
+]
+
+
+def test_flashcard_is_slotted_and_compared_by_value():
+    flashcard = Flashcard(1, FlashcardType.DEFINITION, "Mitose", "Zellteilung")
+
+    assert not hasattr(flashcard, '__dict__')
+    assert flashcard == Flashcard(1, FlashcardType.DEFINITION, "Mitose", "Zellteilung")
+    assert flashcard != Flashcard(2, FlashcardType.DEFINITION, "Mitose", "Zellteilung")
+    assert pickle.loads(pickle.dumps(flashcard)) == flashcard
+
+
+def test_columnar_deck_has_same_flashcards():
+    deck = FlashcardDeck(FLASHCARDS, dropped_duplicates=2)
+    columnar_deck = deck.to_columnar()
+
+    assert isinstance(columnar_deck, ColumnarFlashcardDeck)
+    assert len(columnar_deck) == 3
+    assert list(columnar_deck) == columnar_deck.flashcards == FLASHCARDS
+    assert columnar_deck.to_dict_list() == deck.to_dict_list()
+    assert json.loads(columnar_deck.to_json()) == json.loads(deck.to_json())
+    assert columnar_deck.dropped_duplicates == 2
+
+
+def test_columnar_deck_survives_pickling():
+    columnar_deck = pickle.loads(pickle.dumps(FlashcardDeck(FLASHCARDS, dropped_duplicates=1).to_columnar()))
+
+    assert columnar_deck.flashcards == FLASHCARDS
+    assert columnar_deck.dropped_duplicates == 1
+
+
+def test_empty_deck_to_columnar():
+    assert list(FlashcardDeck([]).to_columnar()) == []
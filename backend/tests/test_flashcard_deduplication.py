@@ -0,0 +1,34 @@
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.services.flashcard_service.flashcard_generator_service.flashcard_deduplication import deduplicate_flashcards
+
+
+def make_flashcards(*front_sides):
+    return [Flashcard(i, FlashcardType.DEFINITION, front_side, 'A') for i, front_side in enumerate(front_sides, start=1)]
+
+
+def test_near_duplicates_from_neighboring_batches_are_dropped():
+    batch_flashcards = [
+        make_flashcards("Was versteht man unter Apoptose?", "Welche Phasen hat die Meiose?"),
+        make_flashcards("Was versteht man unter der Apoptose?", "Was ist ein Onkogen?"),
+    ]
+
+    deduplicated, dropped = deduplicate_flashcards(batch_flashcards, similarity_threshold=0.8)
+
+    assert dropped == 1
+    assert [[flashcard.front_side for flashcard in flashcards] for flashcards in deduplicated] == [
+        ["Was versteht man unter Apoptose?", "Welche Phasen hat die Meiose?"],
+        ["Was ist ein Onkogen?"],
+    ]
+
+
+def test_exact_duplicates_are_dropped_regardless_of_case_and_punctuation():
+    deduplicated, dropped = deduplicate_flashcards([make_flashcards("What is DNA?", "what is dna", "What is RNA?")], 0.8)
+    assert dropped == 1
+    assert [flashcard.front_side for flashcard in deduplicated[0]] == ["What is DNA?", "What is RNA?"]
+
+
+def test_similar_questions_about_different_terms_are_kept():
+    front_sides = [f"Was versteht man unter dem Begriff Begriff{i}?" for i in range(200)]
+    deduplicated, dropped = deduplicate_flashcards([make_flashcards(*front_sides)], 0.8)
+    assert dropped == 0
+    assert len(deduplicated[0]) == 200
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import sqlite3
+import zipfile
+
+import genanki
+import pytest
+from flask import Flask
+from flask_restful import Api
+
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.entities.flashcard_deck.flashcard_deck import FlashcardDeck
+from src.rest.resources.flashcard_exporter_resource import FlashcardExporterResource
+from src.services.flashcard_service.flashcard_export import CHUNK_FLASHCARDS, export_as_apkg, iter_csv, iter_csv_zip, iter_ndjson
+from src.services.flashcard_service.flashcard_service import FlashcardService
+
+FLASHCARDS = [
+    Flashcard(1, FlashcardType.DEFINITION, "Mitose", "Zellteilung"),
+    Flashcard(2, FlashcardType.OPEN_ENDED, 'Warum "teilen" sich Zellen?', "Wachstum;\nRegeneration"),
+]
+DECK = FlashcardDeck(FLASHCARDS * CHUNK_FLASHCARDS)
+
+
+def test_csv_is_streamed_in_chunks():
+    chunks = list(iter_csv(DECK))
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert rows == [[flashcard.front_side, flashcard.back_side] for flashcard in DECK]
+
+
+@pytest.mark.parametrize('compress, compress_type', [(True, zipfile.ZIP_DEFLATED), (False, zipfile.ZIP_STORED)])
+def test_zip_contains_csv(compress, compress_type):
+    data = b''.join(iter_csv_zip(DECK, compress))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        assert zip_file.infolist()[0].compress_type == compress_type
+        assert zip_file.read('flashcards.csv') == b''.join(iter_csv(DECK))
+
+
+def test_ndjson_has_one_flashcard_per_line():
+    lines = b''.join(iter_ndjson(FlashcardDeck(FLASHCARDS))).decode('utf-8').splitlines()
+
+    assert [json.loads(line) for line in lines] == [flashcard.to_dict() for flashcard in FLASHCARDS]
+
+
+def test_apkg_contains_one_note_and_card_per_flashcard():
+    with zipfile.ZipFile(io.BytesIO(export_as_apkg(FlashcardDeck(FLASHCARDS)))) as zip_file:
+        collection = sqlite3.connect(':memory:')
+        collection.deserialize(zip_file.read('collection.anki2'))
+        assert zip_file.read('media') == b'{}'
+
+    models = json.loads(collection.execute('SELECT models FROM col').fetchone()[0])
+    notes = collection.execute('SELECT id, guid, mid, flds, sfld FROM notes ORDER BY id').fetchall()
+    cards = collection.execute('SELECT nid, did, ord, due FROM cards ORDER BY id').fetchall()
+    (model_id, model), = models.items()
+    decks = json.loads(collection.execute('SELECT decks FROM col').fetchone()[0])
+
+    assert [(flds, sfld) for _, _, _, flds, sfld in notes] == [
+        (f'{flashcard.front_side}\x1f{flashcard.back_side}', flashcard.front_side) for flashcard in FLASHCARDS]
+    assert [guid for _, guid, _, _, _ in notes] == [genanki.Note(fields=[flashcard.front_side, flashcard.back_side]).guid
+                                                      for flashcard in FLASHCARDS]
+    assert {mid for _, _, mid, _, _ in notes} == {int(model_id)}
+    assert cards == [(note[0], model['did'], 0, due) for due, note in enumerate(notes)]
+    assert decks[str(model['did'])]['name'] == 'flashcards'
+
+
+def test_apkg_note_type_matches_genanki():
+    genanki_model = genanki.Model(1, 'Simple Model', fields=[{'name': 'Front'}, {'name': 'Back'}], templates=[
+        {'name': 'Card 1', 'qfmt': '{{Front}}', 'afmt': '{{FrontSide}}<hr id="answer">{{Back}}'}])
+    with zipfile.ZipFile(io.BytesIO(export_as_apkg(FlashcardDeck(FLASHCARDS)))) as zip_file:
+        collection = sqlite3.connect(':memory:')
+        collection.deserialize(zip_file.read('collection.anki2'))
+    model, = json.loads(collection.execute('SELECT models FROM col').fetchone()[0]).values()
+
+    assert {**model, 'id': '1', 'mod': 0} == genanki_model.to_json(0, model['did'])
+
+
+def test_export_is_streamed_without_export_cache(mocker):
+    task_service = mocker.MagicMock()
+    task_service.get_task_result.return_value = DECK
+    flask_app = Flask(__name__)
+    Api(flask_app).add_resource(FlashcardExporterResource, '/exporter/<token>', resource_class_kwargs={
+        'task_service': task_service, 'flashcard_service': FlashcardService(flashcard_generator=None)})
+    client = flask_app.test_client()
+
+    response = client.get('/exporter/task?format=zip&compress=false')
+
+    assert response.is_streamed
+    assert response.headers['Content-Disposition'] == 'attachment; filename=flashcards.zip'
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zip_file:
+        assert zip_file.read('flashcards.csv') == b''.join(iter_csv(DECK))
@@ -0,0 +1,262 @@
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+from openai import OpenAI
+from openai.types.chat import ChatCompletionChunk
+
+from src.dtos.generator_task import FlashcardGeneratorTaskDto
+from src.entities.completion_messages.completion_messages import Messages
+from src.entities.flashcard.flashcard import FlashcardType
+from src.services.checkpoint_service.local_checkpoint_store import LocalCheckpointStore
+from src.services.flashcard_service.flashcard_generator_service import flashcard_generator, model_profiles
+from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import FlashcardGenerator, number_flashcards, \
+    assemble_streamed_completion, compute_fragment_size
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import ModelProfile, get_model_profile
+from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+from src.services.flashcard_service.flashcard_generator_service.retry_policy import RetryPolicies, RetryPolicy
+
+
+def make_completion(content: str):
+    """Create a minimal stand-in for an OpenAI ChatCompletion."""
+    return SimpleNamespace(
+        created=time.time(),
+        usage=SimpleNamespace(completion_tokens=10, total_tokens=100),
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+
+
+def make_chunks(pieces):
+    """Create the chunks of a streamed completion, ending with a usage-only chunk as sent with include_usage."""
+    chunks = [
+        ChatCompletionChunk(id='chatcmpl-1', object='chat.completion.chunk', created=int(time.time()), model='gpt-3.5-turbo',
+                            choices=[{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}])
+        for piece in pieces
+    ]
+    chunks.append(ChatCompletionChunk(id='chatcmpl-1', object='chat.completion.chunk', created=int(time.time()), model='gpt-3.5-turbo',
+                                      choices=[], usage={'prompt_tokens': 90, 'completion_tokens': 10, 'total_tokens': 100}))
+    return chunks
+
+
+class TestGenerateBatches:
+
+    @pytest.fixture
+    def generator(self, mocker):
+        mock_client = mocker.MagicMock(spec=OpenAI)
+
+        def create(**kwargs):
+            fragment = kwargs['messages'][-1]['content']
+            # Later fragments complete first to make sure results are ordered by fragment, not by completion
+            time.sleep(0.01 * (5 - int(fragment)))
+            return make_completion(f"[Term] Q{fragment}a; A\n[Concept] Q{fragment}b; A")
+
+        mock_client.chat.completions.create.side_effect = create
+        generator = FlashcardGenerator(client=mock_client, rate_limiter=None, completion_cache=None)
+        generator.generation_config = {'max_concurrent_requests': 3, 'stream_completions': False}
+        return generator
+
+    @pytest.fixture
+    def fragment_messages(self):
+        return [Messages('system', 'example user', 'example assistant', str(fragment)) for fragment in range(5)]
+
+    def test_flashcards_are_ordered_by_fragment(self, generator, fragment_messages):
+        batch_flashcards = generator.generate_batches(fragment_messages, max_tokens=100)
+        flashcards = number_flashcards(batch_flashcards)
+
+        assert [card.id for card in flashcards] == list(range(1, 11))
+        assert [card.front_side for card in flashcards] == [f"Q{fragment}{suffix}" for fragment in range(5) for suffix in 'ab']
+        assert flashcards[0].type == FlashcardType.DEFINITION
+
+    def test_progress_reports_completed_batches(self, generator, fragment_messages, mocker):
+        fn_update_progress = mocker.MagicMock()
+        generator.generate_batches(fragment_messages, max_tokens=100, fn_update_progress=fn_update_progress)
+
+        assert [c.args for c in fn_update_progress.call_args_list] == [(completed, 5) for completed in range(6)]
+
+    def test_streamed_flashcards_are_reported_while_in_flight(self, generator, mocker):
+        release = threading.Event()
+
+        def create(**kwargs):
+            assert kwargs['stream'] and kwargs['stream_options'] == {'include_usage': True}
+            fragment = kwargs['messages'][-1]['content']
+            yield from make_chunks([f"[Term] Q{fragment}a", "; A\n[Con", "cept] Q"])
+            # The second fragment is held back until the first cards were reported
+            if fragment == '1':
+                release.wait(5)
+            yield from make_chunks([f"{fragment}b; A"])
+
+        generator.client.chat.completions.create.side_effect = create
+        generator.generation_config['stream_completions'] = True
+        partial_results = []
+
+        def fn_partial_result(flashcards):
+            partial_results.append([card.front_side for card in flashcards])
+            # Fragment 0 may complete before fragment 1 sent its first card, then Q1a is reported with the next report
+            if 'Q1a' in partial_results[-1]:
+                release.set()
+
+        fragment_messages = [Messages('system', 'example user', 'example assistant', str(fragment)) for fragment in range(2)]
+        batch_flashcards = generator.generate_batches(fragment_messages, max_tokens=100, fn_partial_result=fn_partial_result)
+
+        assert [card.front_side for card in number_flashcards(batch_flashcards)] == ['Q0a', 'Q0b', 'Q1a', 'Q1b']
+        assert partial_results and 'Q1b' not in partial_results[0] and 'Q1a' in partial_results[-1]
+
+    def test_restarted_generation_skips_checkpointed_batches(self, generator, fragment_messages, mocker):
+        generator.checkpoint_store = LocalCheckpointStore(ttl_sec=60)
+        create = generator.client.chat.completions.create.side_effect
+
+        def fail_fragment_3(**kwargs):
+            if kwargs['messages'][-1]['content'] == '3':
+                raise RuntimeError("Worker lost")
+            return create(**kwargs)
+
+        generator.client.chat.completions.create.side_effect = fail_fragment_3
+        with pytest.raises(RuntimeError):
+            generator.generate_batches(fragment_messages, max_tokens=100, checkpoint_id='task-1')
+
+        generator.client.chat.completions.create.side_effect = create
+        generator.client.chat.completions.create.reset_mock()
+        fn_update_progress = mocker.MagicMock()
+        batch_flashcards = generator.generate_batches(fragment_messages, max_tokens=100, fn_update_progress=fn_update_progress,
+                                                      checkpoint_id='task-1')
+
+        sent_fragments = [c.kwargs['messages'][-1]['content'] for c in generator.client.chat.completions.create.call_args_list]
+        assert '3' in sent_fragments and len(sent_fragments) < 5
+        assert fn_update_progress.call_args_list[0].args == (5 - len(sent_fragments), 5)
+        assert [card.front_side for card in number_flashcards(batch_flashcards)] == \
+               [f"Q{fragment}{suffix}" for fragment in range(5) for suffix in 'ab']
+
+    def test_failed_batch_fails_generation(self, generator, fragment_messages):
+        generator.client.chat.completions.create.side_effect = RuntimeError("Connection lost")
+        with pytest.raises(RuntimeError):
+            generator.generate_batches(fragment_messages, max_tokens=100)
+
+
+class TestGenerateFlashcardDeck:
+
+    @pytest.fixture
+    def encoding(self, mocker, word_encoding):
+        mocker.patch.object(model_profiles.tiktoken, 'get_encoding', return_value=word_encoding)
+        return word_encoding
+
+    @pytest.fixture
+    def generator(self, mocker):
+        mock_client = mocker.MagicMock(spec=OpenAI)
+        # Distinct flashcards per request, so none of them is dropped as a duplicate
+        flashcard_ids = itertools.count()
+        mock_client.chat.completions.create.side_effect = lambda **kwargs: make_completion(f"[Term] Q{next(flashcard_ids)}; A")
+        prompt_registry = PromptRegistry({'example_prompt': 'ex1_genetics_of_cancer', 'additional_prompt': 'ad1_top_instr'})
+        generator = FlashcardGenerator(client=mock_client, rate_limiter=None, completion_cache=None, prompt_registry=prompt_registry)
+        generator.token_limits = {'prompt_limit': 2000, 'completion_limit': 800, 'safety_margin': 256, 'max_fragment_tokens': 1000}
+        generator.text_splitting_config = {'splitter': 'fixed', 'overlap_type': 'absolute', 'overlap': 100}
+        generator.generation_config = {'max_concurrent_requests': 4, 'stream_completions': False}
+        return generator
+
+    def make_task(self, input_text):
+        return FlashcardGeneratorTaskDto(lang='en', mode='PRACTICE', export_format='csv', input_text=input_text)
+
+    def test_short_text_is_generated_in_single_batch(self, generator, encoding):
+        flashcard_deck = generator.generate_flashcard_deck(self.make_task("A short text."), None)
+
+        assert len(flashcard_deck.flashcards) == 1
+        input_message = generator.client.chat.completions.create.call_args.kwargs['messages'][-1]['content']
+        assert input_message.endswith("A short text.")
+
+    def test_long_text_is_split_without_reencoding(self, generator, encoding):
+        input_text = ' '.join(f'word{i}' for i in range(5000))
+        flashcard_deck = generator.generate_flashcard_deck(self.make_task(input_text), None)
+
+        sent_fragments = [c.kwargs['messages'][-1]['content'] for c in generator.client.chat.completions.create.call_args_list]
+        assert len(sent_fragments) > 1
+        assert len(flashcard_deck.flashcards) == len(sent_fragments)
+        # Each fragment contains the additional prompt exactly once
+        additional_prompt = generator.prompt_registry.get_prompts('PRACTICE', 'en').additional
+        assert all(fragment.count(additional_prompt) == 1 for fragment in sent_fragments)
+        # Only the input text and the role of the input message are encoded per task, the prompts are counted by the registry
+        encode_calls = encoding.encode_calls
+        generator.generate_flashcard_deck(self.make_task(input_text), None)
+        assert encoding.encode_calls - encode_calls == 2
+
+
+def test_assemble_streamed_completion():
+    completion = assemble_streamed_completion(make_chunks(["[Term] Q", "; A"]))
+    assert completion.choices[0].message.content == "[Term] Q; A"
+    assert completion.choices[0].finish_reason == 'stop'
+    assert completion.usage.total_tokens == 100
+
+
+def test_fragment_size_fills_context_window():
+    profile = ModelProfile('test', context_window=8000, max_output_tokens=1000, encoding_name='words')
+    token_limits = {'completion_limit': 800, 'safety_margin': 200, 'max_fragment_tokens': None}
+    assert compute_fragment_size(profile, token_limits, message_overhead_tokens=1000) == 6000
+    assert compute_fragment_size(profile, {**token_limits, 'max_fragment_tokens': 4000}, message_overhead_tokens=1000) == 4000
+
+
+def test_model_profile_resolves_snapshots():
+    assert get_model_profile('gpt-4o-mini-2024-07-18').name == 'gpt-4o-mini'
+    assert get_model_profile('gpt-4o-2024-08-06').name == 'gpt-4o'
+    assert get_model_profile('gpt-4-0613').context_window == 8192
+
+
+class TestRetries:
+
+    @pytest.fixture
+    def generator(self, mocker):
+        mocker.patch.object(flashcard_generator.time, 'sleep')
+        generator = FlashcardGenerator(client=mocker.MagicMock(spec=OpenAI), rate_limiter=None, completion_cache=None)
+        generator.generation_config = {'max_concurrent_requests': 1, 'stream_completions': False}
+        generator.retry_policies = RetryPolicies({'rate_limit': RetryPolicy(max_attempts=3, base_delay_sec=1.0, max_delay_sec=5.0,
+                                                                             max_retry_after_sec=10.0)})
+        return generator
+
+    @staticmethod
+    def make_error(error_type, status_code, headers=None):
+        response = SimpleNamespace(request=None, status_code=status_code, headers=headers or {})
+        return error_type("error", response=response, body=None)
+
+    def test_transient_error_is_retried_after_retry_after(self, generator):
+        generator.client.chat.completions.create.side_effect = [
+            self.make_error(openai.RateLimitError, 429, {'retry-after': '7'}),
+            make_completion("[Term] Q; A")
+        ]
+        flashcards = generator.generate_batch(Messages('system', 'example user', 'example assistant', 'input'), max_tokens=100)
+
+        assert [card.front_side for card in flashcards] == ['Q']
+        flashcard_generator.time.sleep.assert_called_once_with(7.0)
+
+    def test_retry_after_beyond_the_cap_is_not_retried(self, generator):
+        generator.client.chat.completions.create.side_effect = self.make_error(openai.RateLimitError, 429, {'retry-after': '3600'})
+        with pytest.raises(openai.RateLimitError):
+            generator.generate_batch(Messages('system', 'example user', 'example assistant', 'input'), max_tokens=100)
+        assert generator.client.chat.completions.create.call_count == 1
+        flashcard_generator.time.sleep.assert_not_called()
+
+    def test_retries_are_limited(self, generator):
+        generator.client.chat.completions.create.side_effect = self.make_error(openai.RateLimitError, 429)
+        with pytest.raises(openai.RateLimitError):
+            generator.generate_batch(Messages('system', 'example user', 'example assistant', 'input'), max_tokens=100)
+        assert generator.client.chat.completions.create.call_count == 3
+
+    def test_non_transient_error_is_not_retried(self, generator):
+        generator.client.chat.completions.create.side_effect = self.make_error(openai.BadRequestError, 400)
+        with pytest.raises(openai.BadRequestError):
+            generator.generate_batch(Messages('system', 'example user', 'example assistant', 'input'), max_tokens=100)
+        assert generator.client.chat.completions.create.call_count == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=10, base_delay_sec=1.0, max_delay_sec=5.0)
+    delays = [policy.compute_delay(attempt) for attempt in range(1, 10) for _ in range(20)]
+    assert all(0 <= delay <= 5.0 for delay in delays) and len(set(delays)) > 1
+    assert policy.compute_delay(1, retry_after=5.0) == 5.0
+    # A Retry-After beyond the cap is not honored, the request is not retried
+    assert policy.compute_delay(1, retry_after=30.0) is None
+
+
+def test_retry_after_is_capped_separately():
+    policy = RetryPolicy(max_attempts=10, base_delay_sec=1.0, max_delay_sec=5.0, max_retry_after_sec=60.0)
+    assert policy.compute_delay(1, retry_after=30.0) == 30.0
+    assert policy.compute_delay(1, retry_after=3600.0) is None
@@ -0,0 +1,58 @@
+from src.entities.flashcard.flashcard import FlashcardType
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import FlashcardStreamParser, parse_flashcards, \
+    parse_completion, ParseDiagnostic, MISSING_SEPARATOR, MISSING_PREFIX, UNKNOWN_PREFIX
+
+CONTENT = "[Term] Mitose; Zellteilung\n\n[Concept] Warum teilen sich Zellen?; Wachstum\nkein Trennzeichen\n[Term] Gen; DNA-Abschnitt"
+
+
+def test_stream_parser_emits_cards_when_line_is_complete():
+    parser = FlashcardStreamParser()
+    assert parser.feed("[Term] Mitose; Zell") == []
+    flashcards = parser.feed("teilung\n[Concept] Warum")
+    assert [(card.id, card.front_side, card.back_side) for card in flashcards] == [(1, "Mitose", " Zellteilung")]
+    assert parser.feed("?; Wachstum") == []
+    assert [card.front_side for card in parser.close()] == ["Warum?"]
+
+
+def test_stream_parser_matches_parse_flashcards():
+    parser = FlashcardStreamParser()
+    streamed = [card for i in range(0, len(CONTENT), 7) for card in parser.feed(CONTENT[i:i + 7])] + parser.close()
+    parsed = parse_flashcards(CONTENT)
+
+    assert [card.front_side for card in streamed] == [card.front_side for card in parsed] == ["Mitose", "Warum teilen sich Zellen?", "Gen"]
+    assert [card.type for card in parsed] == [FlashcardType.DEFINITION, FlashcardType.OPEN_ENDED, FlashcardType.DEFINITION]
+
+
+def test_semicolons_in_answer_stay_on_back_side():
+    flashcards = parse_flashcards("[Concept] Phasen der Mitose?; Prophase; Metaphase; Anaphase; Telophase")
+
+    assert flashcards[0].front_side == "Phasen der Mitose?"
+    assert flashcards[0].back_side == " Prophase; Metaphase; Anaphase; Telophase"
+
+
+def test_prefixes_are_mapped_to_types():
+    content = "[Term] A; a\n[Concept] B; b\n[Critical Thinking] C; c\n[CriticalThinking] D; d\n[Quiz] E; e"
+
+    assert [card.type for card in parse_completion(content).flashcards] == [
+        FlashcardType.DEFINITION, FlashcardType.OPEN_ENDED, FlashcardType.OPEN_ENDED, FlashcardType.OPEN_ENDED, FlashcardType.UNKNOWN
+    ]
+
+
+def test_malformed_lines_are_reported_as_diagnostics():
+    result = parse_completion(CONTENT + "\nOhne Präfix; Antwort\n[Quiz] Frage; Antwort")
+
+    assert [card.id for card in result.flashcards] == [1, 2, 3, 4, 5]
+    assert result.diagnostics == [
+        ParseDiagnostic(4, MISSING_SEPARATOR, "kein Trennzeichen"),
+        ParseDiagnostic(6, MISSING_PREFIX, "Ohne Präfix; Antwort"),
+        ParseDiagnostic(7, UNKNOWN_PREFIX, "[Quiz] Frage; Antwort"),
+    ]
+
+
+def test_stream_parser_reports_diagnostics_with_line_numbers():
+    parser = FlashcardStreamParser()
+    for i in range(0, len(CONTENT), 5):
+        parser.feed(CONTENT[i:i + 5])
+    parser.close()
+
+    assert parser.diagnostics == [ParseDiagnostic(4, MISSING_SEPARATOR, "kein Trennzeichen")]
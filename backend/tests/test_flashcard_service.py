@@ -59,7 +59,7 @@ class TestFlashcardDeck:
         # Convert to JSON and back, then compare
         json_data = flashcard_deck.to_json()
         data = json.loads(json_data)
-        assert data == {"flashcards": [vars(card) for card in flashcard_deck.flashcards]}
+        assert data == {"flashcards": [card.to_dict() for card in flashcard_deck.flashcards], "dropped_duplicates": 0}
 
     def test_to_dict_list(self, flashcard_deck):
         dict_list = flashcard_deck.to_dict_list()
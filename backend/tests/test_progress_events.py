@@ -0,0 +1,204 @@
+import json
+
+import pytest
+from flask import Flask
+from flask_restful import Api
+
+from src.celery.tasks import TaskProgress
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.enums.task_states import TaskState
+from src.rest.resources.flashcard_generator_events_resource import FlashcardGeneratorEventsResource
+from src.services.partial_result_service.local_partial_result_store import LocalPartialResultStore
+from src.services.partial_result_service.redis_partial_result_store import RedisPartialResultStore
+from src.services.progress_service.local_progress_broker import LocalProgressBroker
+from src.services.progress_service.redis_progress_broker import RedisProgressBroker
+from src.services.task_service.task_service_interface import TaskStatus
+
+
+@pytest.fixture(params=['local', 'redis'])
+def progress_broker(request):
+    if request.param == 'local':
+        return LocalProgressBroker()
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisProgressBroker(fakeredis.FakeRedis())
+
+
+def test_events_reach_the_subscribers_of_the_task(progress_broker):
+    subscription = progress_broker.subscribe('task-1')
+    other_subscription = progress_broker.subscribe('task-2')
+    progress_broker.publish('task-1', {'task_state': 'IN_PROGRESS', 'current_batch': 1})
+
+    assert subscription.get(timeout_sec=1) == {'task_state': 'IN_PROGRESS', 'current_batch': 1}
+    assert other_subscription.get(timeout_sec=0.1) is None
+
+    subscription.close()
+    progress_broker.publish('task-1', {'task_state': 'SUCCESS'})
+    assert subscription.get(timeout_sec=0.1) is None
+
+
+@pytest.mark.parametrize('backend', ['local', 'redis'])
+def test_partial_flashcards_are_appended(backend):
+    if backend == 'local':
+        partial_result_store = LocalPartialResultStore(ttl_sec=60)
+    else:
+        fakeredis = pytest.importorskip('fakeredis')
+        partial_result_store = RedisPartialResultStore(fakeredis.FakeRedis(), ttl_sec=60)
+
+    partial_result_store.append('task', [{'id': 1, 'front_side': 'Mitose'}])
+    partial_result_store.append('task', [])
+    partial_result_store.append('task', [{'id': 2, 'front_side': 'Meiose'}])
+
+    assert partial_result_store.load('task') == [{'id': 1, 'front_side': 'Mitose'}, {'id': 2, 'front_side': 'Meiose'}]
+    assert partial_result_store.load('other-task') == []
+
+
+def test_subscription_drops_queued_events_on_overflow():
+    progress_broker = LocalProgressBroker(max_queued_events=2)
+    subscription = progress_broker.subscribe('task')
+    for current_batch in range(3):
+        progress_broker.publish('task', {'task_state': 'IN_PROGRESS', 'current_batch': current_batch})
+
+    assert subscription.get(timeout_sec=0) == {'task_state': 'IN_PROGRESS', 'current_batch': 2}
+    assert subscription.get(timeout_sec=0) is None
+    assert subscription.take_missed()
+    assert not subscription.take_missed()
+
+
+def test_task_progress_is_published(mocker):
+    progress_broker = LocalProgressBroker()
+    subscription = progress_broker.subscribe('task')
+    task = mocker.MagicMock()
+    task.request.id = 'task'
+    partial_result_store = LocalPartialResultStore(ttl_sec=60)
+    progress = TaskProgress(task, progress_broker, partial_result_store)
+    mitose = Flashcard(1, FlashcardType.DEFINITION, 'Mitose', 'Zellteilung')
+    meiose = Flashcard(1, FlashcardType.DEFINITION, 'Meiose', 'Reifeteilung')
+
+    progress.update_progress(1, 2)
+    progress.update_partial_result([mitose])
+    # An earlier batch adds a flashcard in front of the published one, only the new flashcard is published
+    progress.update_partial_result([meiose, mitose])
+    progress.update_partial_result([meiose, mitose])
+
+    assert subscription.get(timeout_sec=0) == {'task_state': 'IN_PROGRESS', 'current_batch': 1, 'total_batches': 2,
+                                               'partial_flashcards_count': 0, 'new_flashcards': []}
+    assert subscription.get(timeout_sec=0)['new_flashcards'] == [
+        {'id': 1, 'type': 'DEFINITION', 'front_side': 'Mitose', 'back_side': 'Zellteilung'}]
+    event = subscription.get(timeout_sec=0)
+    assert event['partial_flashcards_count'] == 2
+    assert event['new_flashcards'] == [{'id': 2, 'type': 'DEFINITION', 'front_side': 'Meiose', 'back_side': 'Reifeteilung'}]
+    assert subscription.get(timeout_sec=0) is None
+    assert task.update_state.call_count == 3
+    assert task.update_state.call_args.kwargs['meta'] == {'current_batch': 1, 'total_batches': 2, 'partial_flashcards_count': 2}
+    assert [flashcard['front_side'] for flashcard in partial_result_store.load('task')] == ['Mitose', 'Meiose']
+
+    # A redelivered task continues the stored partial flashcards
+    progress = TaskProgress(task, progress_broker, partial_result_store)
+    progress.update_partial_result([meiose, mitose, Flashcard(3, FlashcardType.DEFINITION, 'Zygote', 'Befruchtete Eizelle')])
+    assert [flashcard['id'] for flashcard in partial_result_store.load('task')] == [1, 2, 3]
+
+
+@pytest.fixture
+def task_service(mocker):
+    task_service = mocker.MagicMock()
+    task_service.get_task_status.return_value = TaskStatus(TaskState.in_progress, {'current_batch': 0, 'total_batches': 2})
+    task_service.generate_retrieval_token.return_value = 'token'
+    return task_service
+
+
+def create_client(task_service, progress_broker, partial_result_store=None):
+    flask_app = Flask(__name__)
+    Api(flask_app).add_resource(FlashcardGeneratorEventsResource, '/generator/<task_id>/events', resource_class_kwargs={
+        'task_service': task_service, 'progress_broker': progress_broker, 'heartbeat_sec': 0.01,
+        'partial_result_store': partial_result_store})
+    return flask_app.test_client()
+
+
+def parse_events(data: bytes):
+    events = []
+    for message in data.decode().split('\n\n'):
+        if message.startswith('event: '):
+            event_line, data_line = message.split('\n')
+            events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+    return events
+
+
+def test_progress_is_streamed_until_success(task_service):
+    progress_broker = LocalProgressBroker()
+    client = create_client(task_service, progress_broker)
+
+    response = client.get('/generator/task/events', buffered=False)
+    progress_broker.publish('task', {'task_state': 'IN_PROGRESS', 'current_batch': 1, 'total_batches': 2,
+                                     'partial_flashcards_count': 1, 'new_flashcards': [{'front_side': 'Mitose'}]})
+    progress_broker.publish('task', {'task_state': 'SUCCESS'})
+    data = response.get_data()
+
+    assert response.mimetype == 'text/event-stream'
+    assert parse_events(data) == [
+        ('progress', {'taskState': 'IN_PROGRESS', 'currentBatch': 0, 'totalBatches': 2, 'retrievalToken': None,
+                      'partialFlashcardsCount': None, 'partialFlashcards': None}),
+        ('progress', {'taskState': 'IN_PROGRESS', 'currentBatch': 1, 'totalBatches': 2, 'partialFlashcardsCount': 1,
+                      'newFlashcards': [{'frontSide': 'Mitose'}]}),
+        ('success', {'taskState': 'SUCCESS', 'retrievalToken': 'token'}),
+    ]
+    assert task_service.get_task_status.call_count == 1
+    assert progress_broker._subscriptions == {}
+
+
+def test_flashcards_of_the_task_info_are_not_streamed_again(task_service):
+    task_service.get_task_status.return_value = TaskStatus(TaskState.in_progress, {
+        'current_batch': 0, 'total_batches': 2, 'partial_flashcards_count': 1})
+    progress_broker = LocalProgressBroker()
+    partial_result_store = LocalPartialResultStore(ttl_sec=60)
+    partial_result_store.append('task', [{'front_side': 'Mitose'}])
+
+    response = create_client(task_service, progress_broker, partial_result_store).get('/generator/task/events', buffered=False)
+    progress_broker.publish('task', {'task_state': 'IN_PROGRESS', 'current_batch': 0, 'total_batches': 2,
+                                     'partial_flashcards_count': 2,
+                                     'new_flashcards': [{'front_side': 'Mitose'}, {'front_side': 'Meiose'}]})
+    progress_broker.publish('task', {'task_state': 'SUCCESS'})
+
+    events = parse_events(response.get_data())
+    assert events[0][1]['partialFlashcards'] == [{'frontSide': 'Mitose'}]
+    assert [data.get('newFlashcards') for _, data in events] == [None, [{'frontSide': 'Meiose'}], None]
+
+
+def test_task_info_is_resent_after_dropped_events(task_service):
+    progress_broker = LocalProgressBroker(max_queued_events=2)
+    client = create_client(task_service, progress_broker)
+
+    response = client.get('/generator/task/events', buffered=False)
+    for current_batch in range(3):
+        progress_broker.publish('task', {'task_state': 'IN_PROGRESS', 'current_batch': current_batch, 'total_batches': 2,
+                                         'partial_flashcards_count': 0, 'new_flashcards': []})
+    task_service.get_task_status.return_value = TaskStatus(TaskState.in_progress, {'current_batch': 2, 'total_batches': 2})
+    progress_broker.publish('task', {'task_state': 'SUCCESS'})
+    events = parse_events(response.get_data())
+
+    assert [(event_type, data['currentBatch']) for event_type, data in events[:2]] == [('progress', 0), ('progress', 2)]
+    assert events[1][1]['partialFlashcards'] is None
+    assert events[2] == ('success', {'taskState': 'SUCCESS', 'retrievalToken': 'token'})
+
+
+def test_stream_of_finished_task_only_has_the_result(task_service):
+    task_service.get_task_status.return_value = TaskStatus(TaskState.success, {'current_batch': 1, 'total_batches': 1})
+    progress_broker = LocalProgressBroker()
+
+    events = parse_events(create_client(task_service, progress_broker).get('/generator/task/events').get_data())
+
+    assert [(event_type, data['retrievalToken']) for event_type, data in events] == [('success', 'token')]
+    assert progress_broker._subscriptions == {}
+
+
+def test_pending_task_has_no_progress(task_service):
+    task_service.get_task_status.return_value = TaskStatus(TaskState.pending, {})
+    progress_broker = LocalProgressBroker()
+
+    response = create_client(task_service, progress_broker).get('/generator/task/events', buffered=False)
+    progress_broker.publish('task', {'task_state': 'FAILURE', 'error': 'Rate limit exceeded', 'exc_type': 'RateLimitError'})
+
+    assert parse_events(response.get_data()) == [
+        ('progress', {'taskState': 'PENDING', 'currentBatch': None, 'totalBatches': None, 'retrievalToken': None,
+                      'partialFlashcardsCount': None, 'partialFlashcards': None}),
+        ('failure', {'taskState': 'FAILURE', 'error': 'Rate limit exceeded', 'excType': 'RateLimitError'}),
+    ]
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from src.enums.generatorOptions import GeneratorMode, SupportedLanguage
+from src.services.flashcard_service.flashcard_generator_service import prompt_registry, model_profiles
+from src.services.flashcard_service.flashcard_generator_service.model_profiles import ModelProfile
+from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+
+
+class CharacterEncoding:
+    """Stand-in for a tiktoken encoding with one token per character."""
+    name = 'characters'
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, text):
+        self.encode_calls += 1
+        return list(text)
+
+
+@pytest.fixture
+def encoding(mocker):
+    encoding = CharacterEncoding()
+    mocker.patch.object(model_profiles.tiktoken, 'get_encoding', return_value=encoding)
+    return encoding
+
+
+PROFILE = ModelProfile('test', context_window=8000, max_output_tokens=1000, encoding_name='characters')
+
+
+@pytest.fixture
+def prompt_files(tmp_path, mocker):
+    for name, content in [('system', 'system'), ('user', 'user'), ('assistant', 'assistant'), ('additional', 'add')]:
+        (tmp_path / f'{name}.txt').write_text(content, encoding='utf-8')
+    mocker.patch.object(prompt_registry, 'get_system_prompt_path', lambda mode, lang: tmp_path / 'system.txt')
+    mocker.patch.object(prompt_registry, 'get_example_prompt_path', lambda name, example_type, lang: tmp_path / f'{example_type}.txt')
+    mocker.patch.object(prompt_registry, 'get_additional_prompt_path', lambda name, lang: tmp_path / 'additional.txt')
+    return tmp_path
+
+
+def test_loads_prompts_of_supported_languages():
+    registry = PromptRegistry({'example_prompt': 'ex1_genetics_of_cancer', 'additional_prompt': 'ad1_top_instr'})
+    for lang in SupportedLanguage:
+        prompts = registry.get_prompts(GeneratorMode.practice, lang)
+        assert prompts.system and prompts.example_user and prompts.example_assistant and prompts.additional
+
+
+def test_token_counts_are_computed_once(prompt_files, encoding):
+    registry = PromptRegistry({'example_prompt': 'example', 'additional_prompt': 'additional'})
+
+    assert registry.get_prompt_tokens(GeneratorMode.practice, SupportedLanguage.english, PROFILE) == len('systemuserassistantadd')
+    # Three messages of 3 tokens overhead each plus 3 tokens of reply priming
+    assert registry.get_message_prompt_tokens(GeneratorMode.practice, SupportedLanguage.english, PROFILE) == \
+           3 * 3 + 3 + len('systemsystem') + len('useruser') + len('assistantassistant')
+    encode_calls = encoding.encode_calls
+    registry.get_prompt_tokens(GeneratorMode.practice, SupportedLanguage.english, PROFILE)
+    assert encoding.encode_calls == encode_calls
+
+
+def test_changed_prompt_file_is_reloaded(prompt_files, encoding):
+    registry = PromptRegistry({'example_prompt': 'example', 'additional_prompt': 'additional'})
+    registry.get_prompt_tokens(GeneratorMode.practice, SupportedLanguage.english, PROFILE)
+
+    system_file = prompt_files / 'system.txt'
+    system_file.write_text('new system prompt', encoding='utf-8')
+    os.utime(system_file, (0, 0))
+
+    assert registry.get_prompts(GeneratorMode.practice, SupportedLanguage.english).system == 'new system prompt'
+    assert registry.get_prompt_tokens(GeneratorMode.practice, SupportedLanguage.english, PROFILE) == len('new system promptuserassistantadd')
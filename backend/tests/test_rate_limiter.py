@@ -0,0 +1,71 @@
+import pytest
+
+from src.custom_exceptions.internal_exceptions import RateLimitTimeoutError
+from src.services.rate_limit_service.in_memory_rate_limiter import InMemoryRateLimiter
+from src.services.rate_limit_service.rate_limiter_interface import estimate_request_tokens
+from src.services.rate_limit_service.redis_rate_limiter import RedisRateLimiter
+
+
+class TestInMemoryRateLimiter:
+
+    def test_charges_requests_and_tokens(self):
+        rate_limiter = InMemoryRateLimiter(requests_per_minute=2, tokens_per_minute=1000, max_wait_sec=0)
+        assert rate_limiter.try_acquire(400) == 0
+        assert rate_limiter.try_acquire(400) == 0
+        # The request bucket is empty now
+        assert rate_limiter.try_acquire(1) > 0
+
+    def test_rejected_request_is_not_charged(self):
+        rate_limiter = InMemoryRateLimiter(requests_per_minute=10, tokens_per_minute=1000, max_wait_sec=0)
+        assert rate_limiter.try_acquire(800) == 0
+        assert rate_limiter.try_acquire(800) == pytest.approx(600 * 60 / 1000, rel=0.01)
+        assert rate_limiter.try_acquire(200) == 0
+
+    def test_acquire_waits_for_refill(self):
+        # 6000 tokens per minute refill 100 tokens per second
+        rate_limiter = InMemoryRateLimiter(requests_per_minute=100, tokens_per_minute=6000, max_wait_sec=1)
+        rate_limiter.acquire(6000)
+        waited_sec = rate_limiter.acquire(10)
+        assert 0.05 < waited_sec < 0.5
+
+    def test_acquire_times_out(self):
+        rate_limiter = InMemoryRateLimiter(requests_per_minute=1, tokens_per_minute=1000, max_wait_sec=0.1)
+        rate_limiter.acquire(1)
+        with pytest.raises(RateLimitTimeoutError):
+            rate_limiter.acquire(1)
+
+
+class TestRedisRateLimiter:
+
+    @pytest.fixture
+    def redis_client(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        # fakeredis runs the token bucket script with lupa
+        pytest.importorskip('lupa')
+        return fakeredis.FakeRedis()
+
+    def test_charges_requests_until_the_budget_is_used(self, redis_client):
+        rate_limiter = RedisRateLimiter(redis_client, requests_per_minute=2, tokens_per_minute=1000, max_wait_sec=0)
+        assert rate_limiter.try_acquire(400) == 0
+        assert rate_limiter.try_acquire(400) == 0
+        # 2 requests per minute refill one request every 30 seconds
+        assert rate_limiter.try_acquire(1) == pytest.approx(30, abs=0.5)
+
+    def test_workers_share_the_budget(self, redis_client):
+        rate_limiter = RedisRateLimiter(redis_client, requests_per_minute=10, tokens_per_minute=1000, max_wait_sec=0)
+        other_rate_limiter = RedisRateLimiter(redis_client, requests_per_minute=10, tokens_per_minute=1000, max_wait_sec=0)
+        assert rate_limiter.try_acquire(800) == 0
+        assert other_rate_limiter.try_acquire(800) == pytest.approx(600 * 60 / 1000, rel=0.01)
+        assert other_rate_limiter.try_acquire(200) == 0
+
+    def test_acquire_times_out(self, redis_client):
+        rate_limiter = RedisRateLimiter(redis_client, requests_per_minute=2, tokens_per_minute=1000, max_wait_sec=1)
+        rate_limiter.acquire(1)
+        rate_limiter.acquire(1)
+        with pytest.raises(RateLimitTimeoutError):
+            rate_limiter.acquire(1)
+
+
+def test_estimate_request_tokens():
+    message_list = [{'role': 'system', 'content': 'a' * 394}, {'role': 'user', 'content': 'b' * 396}]
+    assert estimate_request_tokens(message_list, max_tokens=800) == 1000
@@ -0,0 +1,68 @@
+import pytest
+from celery import Celery
+
+from src.celery.serialization import SERIALIZER_NAME, MessageSerializer, NO_COMPRESSION, ZLIB, ZSTD, register_serializer
+from src.custom_exceptions.internal_exceptions import BatchJobError, SerializationError
+from src.dtos.generator_task import FlashcardGeneratorTaskDto
+from src.entities.flashcard.flashcard import Flashcard, FlashcardType
+from src.entities.flashcard_deck.flashcard_deck import ColumnarFlashcardDeck, FlashcardDeck
+from src.enums.generatorOptions import SupportedLanguage
+from src.enums.task_states import TaskState
+
+FLASHCARDS = [
+    Flashcard(1, FlashcardType.DEFINITION, "Mitose", " Zellteilung"),
+    Flashcard(2, FlashcardType.OPEN_ENDED, "Warum teilen sich Zellen?", "Wachstum; Regeneration"),
+    Flashcard(3, FlashcardType.UNKNOWN, "", "Ω – keine Frage"),
+]
+TASK = FlashcardGeneratorTaskDto(lang='de', mode='PRACTICE', export_format='csv', input_text='Die Mitose ist eine Kernteilung.')
+
+
+@pytest.mark.parametrize('compression, code', [('none', NO_COMPRESSION), ('zlib', ZLIB), ('zstd', ZSTD)])
+def test_deck_is_decoded_as_columnar_deck(compression, code):
+    serializer = MessageSerializer(compression, compression_threshold_bytes=0)
+    data = serializer.dumps({'result': FlashcardDeck(FLASHCARDS * 100, dropped_duplicates=2)})
+    deck = serializer.loads(data)['result']
+
+    assert data[:2] == bytes((1, code))
+    assert isinstance(deck, ColumnarFlashcardDeck)
+    assert list(deck) == FLASHCARDS * 100
+    assert deck.dropped_duplicates == 2
+
+
+def test_small_payloads_are_not_compressed():
+    serializer = MessageSerializer('zlib', compression_threshold_bytes=1024)
+
+    assert serializer.dumps(FLASHCARDS[0])[1] == NO_COMPRESSION
+    assert serializer.dumps([FLASHCARDS[0]] * 100)[1] == ZLIB
+    assert serializer.loads(serializer.dumps(FLASHCARDS)) == FLASHCARDS
+
+
+def test_task_parameters_and_states_are_encoded_by_value():
+    serializer = MessageSerializer()
+    args, kwargs = serializer.loads(serializer.dumps(((TASK, {'task-id': TASK}), {'state': TaskState.in_progress})))
+
+    assert args == [TASK, {'task-id': TASK}]
+    assert args[0].lang == SupportedLanguage.german
+    assert kwargs == {'state': 'IN_PROGRESS'}
+
+
+def test_unknown_payloads_are_rejected():
+    serializer = MessageSerializer()
+
+    with pytest.raises(SerializationError):
+        serializer.loads(b'\x80\x04K\x01.')
+    with pytest.raises(TypeError):
+        serializer.dumps(object())
+
+
+def test_result_backend_stores_decks_and_exceptions():
+    register_serializer({'compression': 'zstd', 'compression_threshold_bytes': 1024, 'compression_level': 3})
+    celery_app = Celery('test', backend='cache+memory://')
+    celery_app.conf.update(result_serializer=SERIALIZER_NAME, result_accept_content=[SERIALIZER_NAME])
+
+    celery_app.backend.store_result('deck', FlashcardDeck(FLASHCARDS).to_columnar(), TaskState.success.value)
+    celery_app.backend.store_result('error', BatchJobError('Batch expired'), TaskState.failure.value)
+
+    assert list(celery_app.backend.get_task_meta('deck')['result']) == FLASHCARDS
+    error = celery_app.backend.get_task_meta('error')['result']
+    assert isinstance(error, BatchJobError) and str(error) == 'Batch expired'
@@ -0,0 +1,86 @@
+import json
+import time
+from types import SimpleNamespace
+
+from openai import OpenAI
+
+from src.entities.completion_messages.completion_messages import Messages
+from src.entities.flashcard.flashcard import FlashcardType
+from src.services.flashcard_service.flashcard_generator_service.flashcard_generator import FlashcardGenerator
+from src.services.flashcard_service.flashcard_generator_service.flashcard_parsing import UNKNOWN_PREFIX, parse_flashcards
+from src.services.flashcard_service.flashcard_generator_service.prompt_registry import PromptRegistry
+from src.services.flashcard_service.flashcard_generator_service.structured_output import INVALID_FLASHCARD, INVALID_JSON, \
+    JSON_SCHEMA, FLASHCARD_RESPONSE_FORMAT, StructuredFlashcardStreamParser, convert_example_to_structured_output, \
+    parse_structured_completion
+
+CONTENT = json.dumps({'flashcards': [
+    {'prefix': 'Term', 'front': 'Mitose', 'back': 'Zellteilung; Kernteilung'},
+    {'prefix': 'Critical Thinking', 'front': 'Warum teilen sich Zellen?', 'back': 'Wachstum'},
+    {'prefix': 'Quiz', 'front': 'Gen', 'back': 'DNA-Abschnitt'},
+]}, ensure_ascii=False)
+
+
+def test_structured_completion_is_decoded_into_flashcards():
+    result = parse_structured_completion(CONTENT)
+
+    assert [(card.id, card.type, card.front_side, card.back_side) for card in result.flashcards] == [
+        (1, FlashcardType.DEFINITION, 'Mitose', 'Zellteilung; Kernteilung'),
+        (2, FlashcardType.OPEN_ENDED, 'Warum teilen sich Zellen?', 'Wachstum'),
+        (3, FlashcardType.UNKNOWN, 'Gen', 'DNA-Abschnitt'),
+    ]
+    assert [(diagnostic.line_number, diagnostic.code) for diagnostic in result.diagnostics] == [(3, UNKNOWN_PREFIX)]
+
+
+def test_truncated_completion_keeps_complete_flashcards():
+    result = parse_structured_completion(CONTENT[:CONTENT.index('Wachstum')])
+
+    assert [card.front_side for card in result.flashcards] == ['Mitose']
+    assert [(diagnostic.line_number, diagnostic.code) for diagnostic in result.diagnostics] == [(2, INVALID_JSON)]
+
+
+def test_invalid_items_are_skipped():
+    content = json.dumps({'flashcards': [{'prefix': 'Term', 'front': '', 'back': 'A'}, {'prefix': 'Term', 'front': 'Q', 'back': 'A'}]})
+    result = parse_structured_completion(content)
+
+    assert [card.front_side for card in result.flashcards] == ['Q']
+    assert [(diagnostic.line_number, diagnostic.code) for diagnostic in result.diagnostics] == [(1, INVALID_FLASHCARD)]
+
+
+def test_stream_parser_emits_flashcards_when_object_is_complete():
+    parser = StructuredFlashcardStreamParser()
+    streamed = [[card.front_side for card in parser.feed(CONTENT[i:i + 5])] for i in range(0, len(CONTENT), 5)]
+    parser.close()
+
+    assert [front_sides for front_sides in streamed if front_sides] == [['Mitose'], ['Warum teilen sich Zellen?'], ['Gen']]
+    assert parser.diagnostics == parse_structured_completion(CONTENT).diagnostics
+
+
+def test_example_is_converted_to_structured_output():
+    example = "[Concept] Was ist Krebs?; Unkontrollierte Zellteilung; Apoptose\n[Term] Onkogen; Ein mutiertes Gen"
+    content = convert_example_to_structured_output(example)
+
+    assert [(card.front_side, card.back_side) for card in parse_structured_completion(content).flashcards] == \
+           [(card.front_side, card.back_side.strip()) for card in parse_flashcards(example)]
+
+
+def test_generator_requests_structured_output(mocker):
+    mock_client = mocker.MagicMock(spec=OpenAI)
+    mock_client.chat.completions.create.return_value = SimpleNamespace(
+        created=time.time(), usage=SimpleNamespace(completion_tokens=10, total_tokens=100),
+        choices=[SimpleNamespace(message=SimpleNamespace(content=CONTENT))]
+    )
+    generator = FlashcardGenerator(client=mock_client, rate_limiter=None, completion_cache=None)
+    generator.generation_config = {'max_concurrent_requests': 1, 'stream_completions': False, 'output_format': JSON_SCHEMA}
+
+    flashcards = generator.generate_batch(Messages('system', 'example user', 'example assistant', 'text'), max_tokens=100)
+
+    assert mock_client.chat.completions.create.call_args.kwargs['response_format'] == FLASHCARD_RESPONSE_FORMAT
+    assert [card.front_side for card in flashcards] == ['Mitose', 'Warum teilen sich Zellen?', 'Gen']
+
+
+def test_prompt_registry_converts_example_for_structured_output():
+    prompt_config = {'example_prompt': 'ex1_genetics_of_cancer', 'additional_prompt': 'ad1_top_instr'}
+    lines_example = PromptRegistry(prompt_config).get_prompts('PRACTICE', 'en').example_assistant
+    structured_example = PromptRegistry(prompt_config, JSON_SCHEMA).get_prompts('PRACTICE', 'en').example_assistant
+
+    assert len(parse_structured_completion(structured_example).flashcards) == len(parse_flashcards(lines_example)) > 0
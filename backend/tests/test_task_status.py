@@ -0,0 +1,130 @@
+import time
+
+import pytest
+from celery import Celery
+from flask import Flask
+from flask_restful import Api
+
+from src.enums.task_states import TaskState
+from src.rest.custom_json_provider import CustomJSONProvider
+from src.rest.resources.flashcard_generator_resource import FlashcardGeneratorResource
+from src.rest.resources.flashcard_generator_status_resource import FlashcardGeneratorStatusResource
+from src.services.task_service.flashcard_generator_task_service import FlashcardGeneratorTaskService
+from src.services.task_service.task_service_interface import TaskStatus
+from src.services.task_service.task_status_cache import TaskStatusCache
+
+PROGRESS_META = {'status': 'IN_PROGRESS', 'result': {'current_batch': 1, 'total_batches': 2, 'partial_flashcards_count': 0}}
+
+
+@pytest.fixture
+def get_task_meta(mocker):
+    task = mocker.patch('src.services.task_service.flashcard_generator_task_service.flashcard_generator_task')
+    return task.backend.get_task_meta
+
+
+def test_status_is_read_once_per_poll(get_task_meta):
+    get_task_meta.return_value = PROGRESS_META
+    task_service = FlashcardGeneratorTaskService(celery_app=None, status_cache=TaskStatusCache(ttl_sec=60, max_entries=10))
+
+    assert task_service.get_task_status('task') == TaskStatus(TaskState.in_progress, PROGRESS_META['result'])
+    assert task_service.get_task_status('task').state == TaskState.in_progress
+    assert get_task_meta.call_count == 2
+
+
+def test_pending_task_has_no_info(get_task_meta):
+    get_task_meta.return_value = {'status': 'PENDING', 'result': None}
+
+    assert FlashcardGeneratorTaskService(celery_app=None).get_task_status('task') == TaskStatus(TaskState.pending, {})
+
+
+def test_terminal_status_is_cached(get_task_meta):
+    get_task_meta.return_value = {'status': 'SUCCESS', 'result': object()}
+    task_service = FlashcardGeneratorTaskService(celery_app=None, status_cache=TaskStatusCache(ttl_sec=60, max_entries=10))
+
+    for _ in range(3):
+        assert task_service.get_task_status('task') == TaskStatus(TaskState.success, {'current_batch': 1, 'total_batches': 1})
+    assert get_task_meta.call_count == 1
+
+
+def test_cached_failure_is_raised(get_task_meta):
+    get_task_meta.return_value = {'status': 'FAILURE', 'result': ValueError('Invalid input')}
+    task_service = FlashcardGeneratorTaskService(celery_app=None, status_cache=TaskStatusCache(ttl_sec=60, max_entries=10))
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match='Invalid input'):
+            task_service.get_task_status('task')
+    assert get_task_meta.call_count == 1
+
+
+def test_status_cache_evicts_and_expires(mocker):
+    cache = TaskStatusCache(ttl_sec=60, max_entries=2)
+    for task_id in ['a', 'b', 'c']:
+        cache.set(task_id, TaskStatus(TaskState.success, {}))
+    assert cache.get('a') is None and cache.get('c') is not None
+
+    mocker.patch('time.monotonic', return_value=time.monotonic() + 61)
+    assert cache.get('c') is None
+
+
+def test_unchanged_progress_is_not_modified(mocker):
+    task_service = mocker.MagicMock()
+    task_service.get_task_status.return_value = TaskStatus(TaskState.in_progress, PROGRESS_META['result'])
+    flask_app = Flask(__name__)
+    flask_app.json = CustomJSONProvider(flask_app)
+    Api(flask_app).add_resource(FlashcardGeneratorResource, '/generator/<task_id>',
+                                resource_class_kwargs={'task_service': task_service})
+    client = flask_app.test_client()
+
+    response = client.get('/generator/task')
+    not_modified = client.get('/generator/task', headers={'If-None-Match': response.headers['ETag']})
+    task_service.get_task_status.return_value = TaskStatus(TaskState.in_progress, {**PROGRESS_META['result'], 'current_batch': 2})
+    modified = client.get('/generator/task', headers={'If-None-Match': response.headers['ETag']})
+
+    assert response.status_code == 202 and response.json['currentBatch'] == 1
+    assert not_modified.status_code == 304 and not_modified.data == b''
+    assert modified.status_code == 202 and modified.json['currentBatch'] == 2
+
+
+@pytest.fixture
+def result_backend(mocker):
+    fakeredis = pytest.importorskip('fakeredis')
+    backend = Celery(backend='redis://localhost:6379/0').backend
+    backend.client = fakeredis.FakeRedis()
+    task = mocker.patch('src.services.task_service.flashcard_generator_task_service.flashcard_generator_task')
+    task.backend = backend
+    return backend
+
+
+def test_statuses_are_read_with_one_mget(result_backend, mocker):
+    result_backend.store_result('running', PROGRESS_META['result'], 'IN_PROGRESS')
+    result_backend.store_result('failed', ValueError('Invalid input'), 'FAILURE')
+    mget = mocker.spy(result_backend.client, 'mget')
+    task_service = FlashcardGeneratorTaskService(celery_app=None, status_cache=TaskStatusCache(ttl_sec=60, max_entries=10))
+
+    task_statuses = task_service.get_task_statuses(['running', 'failed', 'unknown', 'running'])
+    task_service.get_task_statuses(['failed'])
+
+    assert list(task_statuses) == ['running', 'failed', 'unknown']
+    assert task_statuses['running'] == TaskStatus(TaskState.in_progress, PROGRESS_META['result'])
+    assert task_statuses['failed'].state == TaskState.failure and str(task_statuses['failed'].error) == 'Invalid input'
+    assert task_statuses['unknown'] == TaskStatus(TaskState.pending, {})
+    assert mget.call_count == 1
+
+
+def test_bulk_status_is_compact(result_backend):
+    result_backend.store_result('3f2a-running', PROGRESS_META['result'], 'IN_PROGRESS')
+    result_backend.store_result('failed', ValueError('Invalid input'), 'FAILURE')
+    task_service = FlashcardGeneratorTaskService(celery_app=None)
+    flask_app = Flask(__name__)
+    api = Api(flask_app)
+    api.add_resource(FlashcardGeneratorResource, '/generator/<task_id>', resource_class_kwargs={'task_service': task_service})
+    api.add_resource(FlashcardGeneratorStatusResource, '/generator/status', resource_class_kwargs={'task_service': task_service})
+
+    response = flask_app.test_client().post('/generator/status', json={'taskIds': ['3f2a-running', 'failed', 'pending']})
+
+    assert response.status_code == 200
+    assert response.json == {'tasks': [
+        {'taskId': '3f2a-running', 'taskState': 'IN_PROGRESS', 'currentBatch': 1, 'totalBatches': 2},
+        {'taskId': 'failed', 'taskState': 'FAILURE', 'error': 'Invalid input'},
+        {'taskId': 'pending', 'taskState': 'PENDING'},
+    ]}
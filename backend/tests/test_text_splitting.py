@@ -0,0 +1,72 @@
+import pytest
+
+from src.custom_exceptions.internal_exceptions import ConfigInvalidValueError
+from src.services.flashcard_service.flashcard_generator_service.text_splitting import TokenizedText, split_text, \
+    split_text_by_structure
+
+
+def test_tokenized_text_slices_original_text(word_encoding):
+    tokenized_text = TokenizedText("Zellen teilen sich. Gene mutieren.", word_encoding)
+    assert len(tokenized_text) == 5
+    assert tokenized_text.slice(0, 2) == "Zellen teilen"
+    assert tokenized_text.slice(3, 5) == " Gene mutieren."
+    assert tokenized_text.slice(3, 10) == " Gene mutieren."
+
+
+def test_split_text_encodes_once(word_encoding):
+    text = ' '.join(f'w{i}' for i in range(10))
+    fragments = split_text(TokenizedText(text, word_encoding), fragment_size=4, overlap_type='absolute', overlap=1)
+
+    assert word_encoding.encode_calls == 1
+    assert [fragment.text for fragment in fragments] == ['w0 w1 w2 w3', ' w3 w4 w5 w6', ' w6 w7 w8 w9', ' w9']
+    assert [fragment.token_count for fragment in fragments] == [4, 4, 4, 1]
+
+
+def test_split_text_relative_overlap(word_encoding):
+    text = ' '.join(f'w{i}' for i in range(8))
+    fragments = split_text(TokenizedText(text, word_encoding), fragment_size=4, overlap_type='relative', overlap=0.5)
+    assert [fragment.token_count for fragment in fragments] == [4, 4, 4, 2]
+
+
+def test_split_text_invalid_overlap_type(word_encoding):
+    with pytest.raises(ConfigInvalidValueError):
+        split_text(TokenizedText('text', word_encoding), fragment_size=4, overlap_type='percent', overlap=1)
+
+
+STRUCTURED_TEXT = (
+    "Kapitel 1 Zellbiologie\n"
+    "Zellen teilen sich durch Mitose. Dabei entstehen zwei Tochterzellen.\n"
+    "\n"
+    "- Prophase\n"
+    "- Metaphase\n"
+    "- Anaphase\n"
+    "Kapitel 2 Genetik\n"
+    "Gene liegen auf Chromosomen. Mutationen verändern Gene."
+)
+
+
+def test_split_text_by_structure_keeps_blocks_together(word_encoding):
+    fragments = split_text_by_structure(TokenizedText(STRUCTURED_TEXT, word_encoding), fragment_size=12)
+
+    assert ''.join(fragment.text for fragment in fragments) == STRUCTURED_TEXT
+    assert [fragment.text.strip().split('\n')[0] for fragment in fragments] == [
+        "Kapitel 1 Zellbiologie",
+        "- Prophase",
+        "Kapitel 2 Genetik"
+    ]
+    assert all(fragment.token_count <= 12 for fragment in fragments)
+
+
+def test_split_text_by_structure_falls_back_to_sentences(word_encoding):
+    text = "Eins zwei drei vier. Fünf sechs sieben acht. Neun zehn elf zwölf."
+    fragments = split_text_by_structure(TokenizedText(text, word_encoding), fragment_size=9)
+    assert [fragment.text for fragment in fragments] == [
+        "Eins zwei drei vier. Fünf sechs sieben acht.",
+        " Neun zehn elf zwölf."
+    ]
+
+
+def test_split_text_by_structure_cuts_oversized_sentences(word_encoding):
+    text = ' '.join(f'w{i}' for i in range(10))
+    fragments = split_text_by_structure(TokenizedText(text, word_encoding), fragment_size=4)
+    assert [fragment.token_count for fragment in fragments] == [4, 4, 2]